@@ -0,0 +1,375 @@
+"""
+PMOVES.AI Announcement Aggregator
+
+Folds the service announcement stream into one authoritative catalog and
+publishes low-rate digests, so consumers no longer subscribe to every
+service's heartbeat.
+
+This module provides:
+- CatalogAggregator: Subscribes to announcements and publishes snapshots and
+  versioned deltas of the catalog
+- CatalogDigestConsumer: Keeps a local catalog from the digest subjects
+- encode_snapshot() / decode_snapshot(): zlib-compressed snapshot payloads
+
+Digest Subjects:
+- services.catalog.v1.snapshot: Full catalog, zlib-compressed JSON,
+  published every `snapshot_interval` seconds
+- services.catalog.v1.delta: Changes since the previous version (JSON),
+  published at most every `delta_interval` seconds and only when something
+  changed. Heartbeats that only refresh the timestamp and sequence number
+  produce no delta; redelivered or out-of-order announcements (see
+  ServiceAnnouncement.supersedes) are dropped.
+- services.catalog.v1.get: Request/reply; answers with the current snapshot
+  so new consumers do not wait for the next periodic one
+
+Delta Format:
+    {"epoch": "3f9c0a1b2c4d", "version": 42, "base": 41,
+     "upserts": [<announcement>, ...], "removals": ["slug", ...]}
+
+Versions count from 0 again whenever the aggregator restarts, so snapshots
+and deltas carry the aggregator's `epoch`, a random id chosen at startup.
+Versions are compared only within one epoch. A consumer applies a delta
+only if its epoch matches and `base` equals its current version; otherwise
+it requests a fresh snapshot, which it accepts from a new epoch
+unconditionally.
+
+Usage:
+    # Run the aggregator
+    python -m pmoves_aggregator serve --nats-url nats://127.0.0.1:4222
+
+    # Watch the digest from another shell
+    python -m pmoves_aggregator watch --nats-url nats://127.0.0.1:4222
+
+    # Or embed a digest consumer
+    consumer = CatalogDigestConsumer("nats://nats:4222")
+    await consumer.start()
+    announcement = consumer.catalog.get("hirag-v2")
+"""
+
+import asyncio
+import json
+import os
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pmoves_announcer import ServiceAnnouncement, announcement_subjects
+
+SNAPSHOT_SUBJECT = "services.catalog.v1.snapshot"
+DELTA_SUBJECT = "services.catalog.v1.delta"
+GET_SUBJECT = "services.catalog.v1.get"
+
+# Announcement fields that change on every heartbeat and are not catalog changes
+_VOLATILE_FIELDS = ("timestamp", "seq")
+
+
+def encode_snapshot(version: int, services: List[Dict[str, Any]], epoch: str = "") -> bytes:
+    """Encode a catalog snapshot as zlib-compressed JSON."""
+    body = json.dumps({"epoch": epoch, "version": version, "services": services}, separators=(",", ":"))
+    return zlib.compress(body.encode(), 6)
+
+
+def decode_snapshot(payload: bytes) -> Tuple[str, int, List[Dict[str, Any]]]:
+    """Decode a snapshot payload into (epoch, version, announcement dicts)."""
+    data = json.loads(zlib.decompress(payload))
+    return data.get("epoch", ""), data["version"], data["services"]
+
+
+def _stable(announcement: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in announcement.items() if k not in _VOLATILE_FIELDS}
+
+
+class CatalogAggregator:
+    """
+    Builds the authoritative service catalog from announcements.
+
+    Example:
+        aggregator = CatalogAggregator("nats://nats:4222")
+        await aggregator.start()
+        ...
+        await aggregator.stop()
+    """
+
+    def __init__(
+        self,
+        nats_url: Optional[str] = None,
+        snapshot_interval: float = 30.0,
+        delta_interval: float = 1.0,
+        expiry: float = 180.0,
+        legacy_subject: bool = False,
+    ):
+        """
+        Args:
+            nats_url: NATS server URL (defaults to NATS_URL env var)
+            snapshot_interval: Seconds between full snapshots
+            delta_interval: Minimum seconds between deltas
+            expiry: Drop services not heard from for this many seconds
+            legacy_subject: Subscribe to services.announce.v1 instead of the
+                tier-sharded subjects (for publishers not yet sharding)
+        """
+        self.nats_url = nats_url or os.getenv("NATS_URL", "nats://nats:4222")
+        self.snapshot_interval = snapshot_interval
+        self.delta_interval = delta_interval
+        self.expiry = expiry
+        self.legacy_subject = legacy_subject
+
+        # Versions restart at 0 with every process; the epoch tells runs apart
+        self.epoch = os.urandom(6).hex()
+        self.version = 0
+        self.catalog: Dict[str, ServiceAnnouncement] = {}
+        self.messages = 0
+        self.decode_errors = 0
+        self.stale = 0
+        self.snapshots_published = 0
+        self.deltas_published = 0
+        self._last_seen: Dict[str, float] = {}
+        self._upserts: Dict[str, Dict[str, Any]] = {}
+        self._removals: Set[str] = set()
+        self._nc = None
+        self._tasks: List[asyncio.Task] = []
+
+    # -- state ---------------------------------------------------------------
+
+    def ingest(self, payload: bytes | str | dict, now: Optional[float] = None) -> bool:
+        """
+        Fold one announcement into the catalog.
+
+        Returns:
+            True if the catalog changed (new service or changed fields)
+        """
+        announcement = ServiceAnnouncement.from_json(
+            payload.decode() if isinstance(payload, bytes) else payload
+        )
+        slug = announcement.slug
+        current = self.catalog.get(slug)
+        if current is not None and not announcement.supersedes(current):
+            self.stale += 1
+            return False
+
+        data = announcement.to_dict()
+        self._last_seen[slug] = time.monotonic() if now is None else now
+        self.catalog[slug] = announcement
+        if current is not None and _stable(current.to_dict()) == _stable(data):
+            return False
+        self._upserts[slug] = data
+        self._removals.discard(slug)
+        return True
+
+    def expire(self, now: Optional[float] = None) -> List[str]:
+        """Remove services not heard from within `expiry` seconds."""
+        cutoff = (time.monotonic() if now is None else now) - self.expiry
+        stale = [slug for slug, seen in self._last_seen.items() if seen < cutoff]
+        for slug in stale:
+            del self._last_seen[slug]
+            self.catalog.pop(slug, None)
+            self._upserts.pop(slug, None)
+            self._removals.add(slug)
+        return stale
+
+    def take_delta(self) -> Optional[Dict[str, Any]]:
+        """Bump the version and return pending changes, or None if unchanged."""
+        if not self._upserts and not self._removals:
+            return None
+        self.version += 1
+        delta = {
+            "epoch": self.epoch,
+            "version": self.version,
+            "base": self.version - 1,
+            "upserts": list(self._upserts.values()),
+            "removals": sorted(self._removals),
+        }
+        self._upserts.clear()
+        self._removals.clear()
+        return delta
+
+    def snapshot(self) -> bytes:
+        """
+        Encode the current catalog.
+
+        The catalog may already contain changes of the next, unpublished
+        delta; applying that delta on top is idempotent.
+        """
+        return encode_snapshot(self.version, [a.to_dict() for a in self.catalog.values()], self.epoch)
+
+    # -- NATS ----------------------------------------------------------------
+
+    async def _on_announcement(self, msg) -> None:
+        self.messages += 1
+        try:
+            self.ingest(msg.data)
+        except Exception:
+            self.decode_errors += 1
+
+    async def _on_get(self, msg) -> None:
+        if msg.reply:
+            await self._nc.publish(msg.reply, self.snapshot())
+
+    async def publish_delta(self) -> bool:
+        """Expire stale services and publish pending changes."""
+        self.expire()
+        delta = self.take_delta()
+        if delta is None:
+            return False
+        await self._nc.publish(DELTA_SUBJECT, json.dumps(delta, separators=(",", ":")).encode())
+        self.deltas_published += 1
+        return True
+
+    async def publish_snapshot(self) -> None:
+        """Publish a full snapshot."""
+        self.expire()
+        # Announce pending changes as a delta first so delta consumers stay in sequence
+        await self.publish_delta()
+        await self._nc.publish(SNAPSHOT_SUBJECT, self.snapshot())
+        self.snapshots_published += 1
+
+    async def _delta_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.delta_interval)
+            try:
+                await self.publish_delta()
+            except Exception as e:
+                # Keep publishing; the next delta or snapshot catches consumers up
+                print(f"Failed to publish catalog delta: {e}")
+
+    async def _snapshot_loop(self) -> None:
+        while True:
+            try:
+                await self.publish_snapshot()
+            except Exception as e:
+                print(f"Failed to publish catalog snapshot: {e}")
+            await asyncio.sleep(self.snapshot_interval)
+
+    async def start(self) -> None:
+        """Connect, subscribe to announcements and start publishing digests."""
+        from nats.aio.client import Client as NATS
+
+        self._nc = NATS()
+        await self._nc.connect(self.nats_url, connect_timeout=5)
+        subjects = [ServiceAnnouncement.SUBJECT] if self.legacy_subject else announcement_subjects()
+        for subject in subjects:
+            await self._nc.subscribe(subject, cb=self._on_announcement)
+        await self._nc.subscribe(GET_SUBJECT, cb=self._on_get)
+        await self._nc.flush()
+        self._tasks = [
+            asyncio.create_task(self._delta_loop()),
+            asyncio.create_task(self._snapshot_loop()),
+        ]
+
+    async def stop(self) -> None:
+        """Stop publishing and close the connection."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._nc:
+            await self._nc.close()
+            self._nc = None
+
+
+class CatalogDigestConsumer:
+    """
+    Local service catalog kept up to date from the aggregator's digests.
+
+    Applies deltas in version order and falls back to requesting a snapshot
+    whenever a delta does not follow the current version.
+    """
+
+    def __init__(self, nats_url: Optional[str] = None, request_timeout: float = 2.0):
+        """
+        Args:
+            nats_url: NATS server URL (defaults to NATS_URL env var)
+            request_timeout: Timeout for snapshot requests in seconds
+        """
+        self.nats_url = nats_url or os.getenv("NATS_URL", "nats://nats:4222")
+        self.request_timeout = request_timeout
+        self.epoch: Optional[str] = None
+        self.version = 0
+        self.catalog: Dict[str, ServiceAnnouncement] = {}
+        self.snapshots = 0
+        self.deltas = 0
+        self.resyncs = 0
+        self._synced = False
+        self._nc = None
+        self._resync: Optional[asyncio.Task] = None
+
+    def apply_snapshot(self, payload: bytes) -> None:
+        """Replace the catalog with a snapshot (any version from a new epoch)."""
+        epoch, version, services = decode_snapshot(payload)
+        if self._synced and epoch == self.epoch and version < self.version:
+            return
+        self.catalog = {s["slug"]: ServiceAnnouncement.from_json(s) for s in services}
+        self.epoch = epoch
+        self.version = version
+        self._synced = True
+        self.snapshots += 1
+
+    def apply_delta(self, delta: Dict[str, Any]) -> bool:
+        """
+        Apply a delta if it follows the current version.
+
+        Returns:
+            False if the delta is out of sequence or from another epoch
+            (an aggregator restart) and a snapshot is needed
+        """
+        if not self._synced or delta.get("epoch", "") != self.epoch:
+            return False
+        if delta["version"] <= self.version:
+            return True  # Already covered by a newer snapshot
+        if delta["base"] != self.version:
+            return False
+        for data in delta["upserts"]:
+            self.catalog[data["slug"]] = ServiceAnnouncement.from_json(data)
+        for slug in delta["removals"]:
+            self.catalog.pop(slug, None)
+        self.version = delta["version"]
+        self.deltas += 1
+        return True
+
+    async def _on_snapshot(self, msg) -> None:
+        self.apply_snapshot(msg.data)
+
+    async def _on_delta(self, msg) -> None:
+        if not self.apply_delta(json.loads(msg.data)) and self._resync is None:
+            self.resyncs += 1
+            self._resync = asyncio.create_task(self._request_snapshot())
+
+    async def _request_snapshot(self) -> bool:
+        try:
+            msg = await self._nc.request(GET_SUBJECT, b"", timeout=self.request_timeout)
+        except Exception:
+            return False  # Aggregator not running yet; wait for the periodic snapshot
+        else:
+            self.apply_snapshot(msg.data)
+            return True
+        finally:
+            self._resync = None
+
+    async def start(self) -> None:
+        """Connect, subscribe to the digests and load the current snapshot."""
+        from nats.aio.client import Client as NATS
+
+        self._nc = NATS()
+        await self._nc.connect(self.nats_url, connect_timeout=5)
+        await self._nc.subscribe(SNAPSHOT_SUBJECT, cb=self._on_snapshot)
+        await self._nc.subscribe(DELTA_SUBJECT, cb=self._on_delta)
+        await self._nc.flush()
+        await self._request_snapshot()
+
+    async def stop(self) -> None:
+        """Close the connection."""
+        if self._resync:
+            self._resync.cancel()
+        if self._nc:
+            await self._nc.close()
+            self._nc = None
+
+
+__all__ = [
+    "CatalogAggregator",
+    "CatalogDigestConsumer",
+    "DELTA_SUBJECT",
+    "GET_SUBJECT",
+    "SNAPSHOT_SUBJECT",
+    "decode_snapshot",
+    "encode_snapshot",
+]
@@ -0,0 +1,89 @@
+"""Command-line entry point: python -m pmoves_aggregator"""
+
+import argparse
+import asyncio
+
+from pmoves_aggregator import CatalogAggregator, CatalogDigestConsumer
+
+
+async def serve(args: argparse.Namespace) -> None:
+    server = None
+    nats_url = args.nats_url
+    if args.embedded:
+        from pmoves_loadtest.embedded_nats import EmbeddedNATSServer
+
+        server = EmbeddedNATSServer(port=args.embedded_port)
+        await server.start()
+        nats_url = server.url
+        print(f"embedded NATS listening on {nats_url}")
+
+    aggregator = CatalogAggregator(
+        nats_url,
+        snapshot_interval=args.snapshot_interval,
+        delta_interval=args.delta_interval,
+        expiry=args.expiry,
+        legacy_subject=args.legacy_subject,
+    )
+    await aggregator.start()
+    print(f"aggregating announcements on {aggregator.nats_url}")
+    try:
+        while True:
+            await asyncio.sleep(args.report_interval)
+            print(
+                f"version={aggregator.version} services={len(aggregator.catalog)} "
+                f"messages={aggregator.messages} stale={aggregator.stale} deltas={aggregator.deltas_published} "
+                f"snapshots={aggregator.snapshots_published}"
+            )
+    finally:
+        await aggregator.stop()
+        if server:
+            await server.stop()
+
+
+async def watch(args: argparse.Namespace) -> None:
+    consumer = CatalogDigestConsumer(args.nats_url)
+    await consumer.start()
+    try:
+        while True:
+            print(
+                f"epoch={consumer.epoch} version={consumer.version} services={len(consumer.catalog)} "
+                f"snapshots={consumer.snapshots} deltas={consumer.deltas} resyncs={consumer.resyncs}"
+            )
+            await asyncio.sleep(args.report_interval)
+    finally:
+        await consumer.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m pmoves_aggregator",
+        description="Aggregate PMOVES service announcements into catalog digests.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = sub.add_parser("serve", help="run the aggregator")
+    serve_parser.add_argument("--nats-url", default=None)
+    serve_parser.add_argument("--snapshot-interval", type=float, default=30.0)
+    serve_parser.add_argument("--delta-interval", type=float, default=1.0)
+    serve_parser.add_argument("--expiry", type=float, default=180.0,
+                              help="drop services not heard from for this many seconds")
+    serve_parser.add_argument("--legacy-subject", action="store_true",
+                              help="subscribe to services.announce.v1 instead of sharded subjects")
+    serve_parser.add_argument("--embedded", action="store_true",
+                              help="start an embedded NATS server for local testing")
+    serve_parser.add_argument("--embedded-port", type=int, default=4222)
+    serve_parser.add_argument("--report-interval", type=float, default=10.0)
+
+    watch_parser = sub.add_parser("watch", help="print the catalog seen through the digests")
+    watch_parser.add_argument("--nats-url", default=None)
+    watch_parser.add_argument("--report-interval", type=float, default=5.0)
+
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args) if args.command == "serve" else watch(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
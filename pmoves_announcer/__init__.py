@@ -2,13 +2,19 @@
 PMOVES.AI Service Announcer Template
 
 NATS service discovery announcer for all PMOVES services.
-Publishes service announcements to the services.announce.v1 subject.
+Publishes service announcements on tier-sharded subjects
+(services.announce.v1.<tier>.<slug>) and, for compatibility, on the legacy
+services.announce.v1 subject.
 
 This module provides:
 - ServiceAnnouncer: Main class for announcing service availability
 - ServiceAnnouncement: Data class for announcement messages
 - BackgroundAnnouncer: Periodic re-announcement for long-running services
 - announce_service(): Convenience function for one-time announcements
+- announcement_subjects(): Subscription subjects for a set of tiers
+- AnnouncementIndex: Copy-on-write catalog of the latest announcement per service
+- AnnouncementIngest: Micro-batching consumer pipeline feeding an AnnouncementIndex
+- SharedAnnouncementConsumer: One subscription shared by a service's worker processes
 
 Usage:
     from pmoves_announcer import ServiceAnnouncer, announce_service
@@ -34,41 +40,68 @@ Usage:
         tier="api"
     )
 
-NATS Subject: services.announce.v1
-Message Format: JSON with slug, name, url, health_check, tier, port, timestamp, metadata
+NATS Subjects:
+- services.announce.v1.<tier>.<slug>: Sharded; subscribe per tier with
+  `services.announce.v1.<tier>.*` (see announcement_subjects())
+- services.announce.v1: Legacy subject carrying every announcement; disable
+  publishing with ANNOUNCE_LEGACY_SUBJECT=false once consumers have moved
+Message Format: JSON with slug, name, url, health_check, tier, port, timestamp,
+metadata, instance and seq
+
+Ordering:
+Every ServiceAnnouncer has a random `instance` id and numbers its
+announcements with a monotonic `seq`. Consumers keep the announcement with
+the highest seq per instance, so redelivered or reordered messages are
+dropped; across instances (a restart) the newer timestamp wins. Messages
+from publishers without a sequence (instance "") are ordered by timestamp.
 """
 
 import asyncio
+import itertools
 import json
 import os
-from dataclasses import dataclass, field, asdict
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, ClassVar, Dict, Iterable, List, Optional
 
+from pmoves_common import ServiceTier
 
-# Import ServiceTier from shared types if available, otherwise define locally
-try:
-    from pmoves_common import ServiceTier
-except ImportError:
-    from enum import Enum
+def _subject_token(value: str) -> str:
+    """Make a slug safe to use as a single NATS subject token."""
+    for char in ".*> \t":
+        value = value.replace(char, "_")
+    return value
 
-    class ServiceTier(str, Enum):
-        """PMOVES service tiers (6-tier architecture)."""
-        DATA = "data"
-        API = "api"
-        LLM = "llm"
-        MEDIA = "media"
-        AGENT = "agent"
-        WORKER = "worker"
 
+def announcement_subjects(tiers: Optional[List[ServiceTier | str]] = None) -> List[str]:
+    """
+    Subjects to subscribe to for announcements of the given tiers.
+
+    Args:
+        tiers: Tiers of interest (None for every tier)
 
-@dataclass
+    Returns:
+        Wildcard subjects, e.g. ["services.announce.v1.media.*"]
+    """
+    subject = ServiceAnnouncement.SUBJECT
+    if tiers is None:
+        return [f"{subject}.*.*"]
+    return [f"{subject}.{ServiceTier.parse(tier).value}.*" for tier in tiers]
+
+
+@dataclass(slots=True)
 class ServiceAnnouncement:
     """
     Service announcement message format for NATS.
 
     Services publish announcements on the `services.announce.v1` subject
     to notify other services of their availability and configuration.
+    Instances are slotted; decoded slugs and URLs are interned so repeated
+    announcements from the same service share their strings.
     """
 
     slug: str
@@ -79,13 +112,35 @@ class ServiceAnnouncement:
     port: int
     timestamp: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     metadata: Dict[str, Any] = field(default_factory=dict)
+    instance: str = ""
+    seq: int = 0
+
+    # Legacy NATS subject for announcements; also the sharded subject prefix
+    SUBJECT: ClassVar[str] = "services.announce.v1"
+
+    @property
+    def subject(self) -> str:
+        """Tier-sharded subject: services.announce.v1.<tier>.<slug>."""
+        return f"{self.SUBJECT}.{ServiceTier.parse(self.tier).value}.{_subject_token(self.slug)}"
 
-    # NATS subject for announcements
-    SUBJECT: str = "services.announce.v1"
+    def supersedes(self, other: "ServiceAnnouncement") -> bool:
+        """
+        Whether this announcement replaces `other` for the same service.
+
+        Within one publisher instance the higher seq wins, so duplicates and
+        late redeliveries are rejected. Otherwise the newer timestamp wins.
+        """
+        if self.instance and self.instance == other.instance:
+            return self.seq > other.seq
+        return self.timestamp >= other.timestamp
 
     def to_json(self) -> str:
         """Convert to JSON for NATS publishing."""
-        data = {
+        return json.dumps(self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the JSON-compatible message dict."""
+        return {
             "slug": self.slug,
             "name": self.name,
             "url": self.url,
@@ -94,23 +149,29 @@ class ServiceAnnouncement:
             "port": self.port,
             "timestamp": self.timestamp,
             "metadata": self.metadata,
+            "instance": self.instance,
+            "seq": self.seq,
         }
-        return json.dumps(data)
 
     @classmethod
     def from_json(cls, data: str | dict) -> "ServiceAnnouncement":
         """Parse from JSON message."""
         if isinstance(data, str):
             data = json.loads(data)
+        timestamp = data.get("timestamp")
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc).isoformat()
         return cls(
-            slug=data["slug"],
+            slug=sys.intern(data["slug"]),
             name=data["name"],
-            url=data["url"],
-            health_check=data["health_check"],
-            tier=ServiceTier(data["tier"]),
+            url=sys.intern(data["url"]),
+            health_check=sys.intern(data["health_check"]),
+            tier=ServiceTier.parse(data["tier"]),
             port=data["port"],
-            timestamp=data.get("timestamp", datetime.now(timezone.utc).isoformat()),
+            timestamp=timestamp,
             metadata=data.get("metadata", {}),
+            instance=sys.intern(data.get("instance", "")),
+            seq=data.get("seq", 0),
         )
 
 
@@ -131,6 +192,7 @@ class ServiceAnnouncer:
         health_check: str = None,
         nats_url: str = None,
         metadata: Dict[str, Any] = None,
+        publish_legacy: Optional[bool] = None,
     ):
         """
         Initialize the service announcer.
@@ -144,22 +206,28 @@ class ServiceAnnouncer:
             health_check: Health check URL (defaults to url + /healthz)
             nats_url: NATS server URL (defaults to NATS_URL env var)
             metadata: Additional service metadata
+            publish_legacy: Also publish on the legacy services.announce.v1
+                subject (defaults to ANNOUNCE_LEGACY_SUBJECT env var, true)
         """
         self.slug = slug
         self.name = name
         self.url = url
         self.port = port
 
-        if isinstance(tier, str):
-            tier = ServiceTier(tier.lower())
-        self.tier = tier
+        self.tier = ServiceTier.parse(tier)
 
         self.health_check = health_check or f"{url.rstrip('/')}/healthz"
         self.nats_url = nats_url or os.getenv("NATS_URL", "nats://nats:4222")
         self.metadata = metadata or {}
+        if publish_legacy is None:
+            publish_legacy = os.getenv("ANNOUNCE_LEGACY_SUBJECT", "true").lower() not in ("0", "false", "no")
+        self.publish_legacy = publish_legacy
+        # Identifies this announcer's sequence; a restart starts a new one
+        self.instance = os.urandom(6).hex()
+        self._seq = itertools.count(1)
 
     def create_announcement(self) -> ServiceAnnouncement:
-        """Create a service announcement object."""
+        """Create a service announcement object with the next sequence number."""
         return ServiceAnnouncement(
             slug=self.slug,
             name=self.name,
@@ -169,6 +237,8 @@ class ServiceAnnouncer:
             port=self.port,
             timestamp=datetime.now(timezone.utc).isoformat(),
             metadata=self.metadata,
+            instance=self.instance,
+            seq=next(self._seq),
         )
 
     async def announce(self) -> bool:
@@ -183,11 +253,13 @@ class ServiceAnnouncer:
 
             announcement = self.create_announcement()
 
-            nc = await NATS.connect(self.nats_url, connect_timeout=5)
-            await nc.publish(
-                ServiceAnnouncement.SUBJECT,
-                announcement.to_json().encode(),
-            )
+            payload = announcement.to_json().encode()
+
+            nc = NATS()
+            await nc.connect(self.nats_url, connect_timeout=5)
+            await nc.publish(announcement.subject, payload)
+            if self.publish_legacy:
+                await nc.publish(ServiceAnnouncement.SUBJECT, payload)
             await nc.flush()
             await nc.close()
 
@@ -316,6 +388,353 @@ class BackgroundAnnouncer:
                     pass
 
 
+class AnnouncementIndex:
+    """
+    Latest announcement per service, updated in bulk by copy-on-write.
+
+    Writers build a new mapping per batch and swap it in, so readers never
+    take a lock: `services` is a complete, consistent catalog that is not
+    modified after it has been published. Hold on to one `services` value
+    for several lookups that must agree with each other.
+    """
+
+    def __init__(self):
+        self.services: Dict[str, ServiceAnnouncement] = {}
+        self.last_seen: Dict[str, float] = {}
+        self.version = 0
+        self.stale = 0
+        self._lock = threading.Lock()
+
+    def get(self, slug: str) -> Optional[ServiceAnnouncement]:
+        """Latest announcement for a service, or None."""
+        return self.services.get(slug)
+
+    def by_tier(self, tier: ServiceTier | str) -> List[ServiceAnnouncement]:
+        """Announcements of one tier."""
+        tier = ServiceTier.parse(tier)
+        return [a for a in self.services.values() if a.tier is tier]
+
+    def __len__(self) -> int:
+        return len(self.services)
+
+    def __contains__(self, slug: str) -> bool:
+        return slug in self.services
+
+    def apply(self, announcements: Iterable[ServiceAnnouncement], now: Optional[float] = None) -> int:
+        """
+        Apply a batch of announcements in one swap.
+
+        Announcements that do not supersede the indexed one are counted in
+        `stale` and ignored.
+
+        Returns:
+            Number of announcements applied
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            services = dict(self.services)
+            last_seen = dict(self.last_seen)
+            applied = 0
+            for announcement in announcements:
+                current = services.get(announcement.slug)
+                if current is not None and not announcement.supersedes(current):
+                    self.stale += 1
+                    continue
+                services[announcement.slug] = announcement
+                last_seen[announcement.slug] = now
+                applied += 1
+            if applied:
+                self.last_seen = last_seen
+                self.services = services
+                self.version += 1
+        return applied
+
+    def replace(self, announcements: Iterable[ServiceAnnouncement], now: Optional[float] = None) -> None:
+        """Swap in a complete catalog, e.g. one published by another process."""
+        now = time.monotonic() if now is None else now
+        services = {announcement.slug: announcement for announcement in announcements}
+        with self._lock:
+            self.last_seen = dict.fromkeys(services, now)
+            self.services = services
+            self.version += 1
+
+    def expire(self, max_age: float, now: Optional[float] = None) -> List[str]:
+        """Remove services not announced within `max_age` seconds."""
+        cutoff = (time.monotonic() if now is None else now) - max_age
+        with self._lock:
+            expired = [slug for slug, seen in self.last_seen.items() if seen < cutoff]
+            if expired:
+                services = dict(self.services)
+                last_seen = dict(self.last_seen)
+                for slug in expired:
+                    del services[slug]
+                    del last_seen[slug]
+                self.last_seen = last_seen
+                self.services = services
+                self.version += 1
+        return expired
+
+
+class AnnouncementIngest:
+    """
+    Micro-batching announcement consumer feeding an AnnouncementIndex.
+
+    Raw messages are queued by the subscription callback and applied in
+    batches of up to `max_batch`, waiting at most `max_delay` seconds for a
+    batch to fill. Within a batch only the newest announcement per service
+    is decoded into the index; older ones are counted as `superseded`.
+
+    Example:
+        index = AnnouncementIndex()
+        ingest = AnnouncementIngest(index)
+        await ingest.start()
+        await nc.subscribe("services.announce.v1.*.*", cb=ingest.handle)
+        ...
+        info = index.get("hirag-v2")
+    """
+
+    def __init__(
+        self,
+        index: Optional[AnnouncementIndex] = None,
+        max_batch: int = 256,
+        max_delay: float = 0.01,
+        max_pending: int = 10000,
+    ):
+        """
+        Args:
+            index: Index to update (a new one by default)
+            max_batch: Maximum messages applied per batch
+            max_delay: Seconds to wait for a batch to fill
+            max_pending: Queued messages kept before the oldest are dropped
+        """
+        self.index = index if index is not None else AnnouncementIndex()
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.received = 0
+        self.decode_errors = 0
+        self.superseded = 0
+        self.dropped = 0
+        self.batches = 0
+        self._pending: deque = deque(maxlen=max_pending)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def submit(self, payload: bytes | str) -> None:
+        """Queue one raw announcement message."""
+        self.received += 1
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append(payload)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def handle(self, msg) -> None:
+        """NATS subscription callback."""
+        self.submit(msg.data)
+
+    def process(self, payloads: Iterable[bytes | str], now: Optional[float] = None) -> int:
+        """
+        Decode a batch and apply it to the index.
+
+        Returns:
+            Number of announcements applied
+        """
+        latest: Dict[str, ServiceAnnouncement] = {}
+        for payload in payloads:
+            try:
+                announcement = ServiceAnnouncement.from_json(
+                    payload.decode() if isinstance(payload, bytes) else payload
+                )
+            except Exception:
+                self.decode_errors += 1
+                continue
+            current = latest.get(announcement.slug)
+            if current is None or announcement.supersedes(current):
+                latest[announcement.slug] = announcement
+            if current is not None:
+                self.superseded += 1
+        self.batches += 1
+        return self.index.apply(latest.values(), now)
+
+    def flush(self) -> int:
+        """Apply every queued message now."""
+        applied = 0
+        while self._pending:
+            applied += self.process(self._take())
+        return applied
+
+    def _take(self) -> List[bytes | str]:
+        pending = self._pending
+        return [pending.popleft() for _ in range(min(self.max_batch, len(pending)))]
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            if len(self._pending) < self.max_batch and self.max_delay > 0:
+                await asyncio.sleep(self.max_delay)
+            self._wakeup.clear()
+            while self._pending:
+                self.process(self._take())
+                await asyncio.sleep(0)  # Let lookups run between batches
+
+    async def start(self) -> None:
+        """Start applying queued messages in the background."""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            if self._pending:
+                self._wakeup.set()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and apply what is still queued."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wakeup = None
+        self.flush()
+
+
+class SharedAnnouncementConsumer:
+    """
+    Announcement subscription shared by the worker processes of a service.
+
+    One worker (the leader, elected through pmoves_shared.LeaderLock)
+    subscribes to announcements and publishes the catalog into a shared mmap
+    region whenever it changes. The other workers load it into their own
+    `index` without connecting to NATS, so every worker answers lookups from
+    the same catalog. A follower that takes over from an exited leader
+    starts from the last published catalog.
+
+    Example:
+        consumer = SharedAnnouncementConsumer("my-service", tiers=["api"])
+        await consumer.start()
+        url = consumer.index.get("hirag-v2").url
+    """
+
+    def __init__(
+        self,
+        name: str,
+        nats_url: Optional[str] = None,
+        tiers: Optional[List[ServiceTier | str]] = None,
+        expiry: float = 180.0,
+        poll_interval: float = 0.1,
+        region_size: Optional[int] = None,
+    ):
+        """
+        Args:
+            name: Name shared by the workers (e.g. the service slug)
+            nats_url: NATS server URL (defaults to NATS_URL env var)
+            tiers: Tiers to subscribe to (None for every tier)
+            expiry: Drop services not heard from for this many seconds
+            poll_interval: Seconds between region checks and leadership retries
+            region_size: Catalog region capacity in bytes (defaults to
+                pmoves_shared.SHARED_REGION_SIZE); must match across workers
+        """
+        self.name = name
+        self.nats_url = nats_url or os.getenv("NATS_URL", "nats://nats:4222")
+        self.tiers = tiers
+        self.expiry = expiry
+        self.poll_interval = poll_interval
+        self.region_size = region_size
+        self.index = AnnouncementIndex()
+        self.ingest = AnnouncementIngest(self.index)
+        self._leader = None
+        self._region = None
+        self._nc = None
+        self._published = -1
+        self._loaded = -1
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_leader(self) -> bool:
+        """True if this worker holds the subscription."""
+        return self._leader is not None and self._leader.is_leader
+
+    async def start(self) -> None:
+        """Take part in leader election and load or subscribe to the catalog."""
+        from pmoves_shared import SHARED_REGION_SIZE, LeaderLock, SharedRegion
+
+        if self._task is None:
+            self._leader = LeaderLock(f"{self.name}-catalog")
+            self._region = SharedRegion(f"{self.name}-catalog", size=self.region_size or SHARED_REGION_SIZE)
+            try:
+                await self._step()
+            except Exception:
+                self._leader.release()  # Let another worker try to subscribe
+                raise
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop, close the subscription and give up leadership."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._nc is not None:
+            await self._nc.close()
+            self._nc = None
+        await self.ingest.stop()
+        if self._leader is not None:
+            self._leader.release()
+            self._region.close()
+            self._leader = self._region = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self._step()
+            except Exception:
+                pass  # NATS unreachable: retry on the next interval
+
+    async def _step(self) -> None:
+        if not self._leader.try_acquire():
+            self._load()
+            return
+        if self._nc is None:
+            await self._lead()
+        self.index.expire(self.expiry)
+        if self.index.version != self._published:
+            payload = json.dumps([a.to_dict() for a in self.index.services.values()], separators=(",", ":"))
+            try:
+                self._region.write(payload.encode())
+            except ValueError as e:
+                # Reported once per catalog version; followers keep the last catalog that fit
+                print(f"Failed to share the {self.name} catalog with other workers: {e} (raise region_size)")
+            self._published = self.index.version
+
+    async def _lead(self) -> None:
+        from nats.aio.client import Client as NATS
+
+        self._load()  # Continue from the previous leader's catalog
+        nc = NATS()
+        await nc.connect(self.nats_url, connect_timeout=5)
+        await self.ingest.start()
+        for subject in announcement_subjects(self.tiers):
+            await nc.subscribe(subject, cb=self.ingest.handle)
+        await nc.flush()
+        self._nc = nc
+
+    def _load(self) -> None:
+        """Replace the index with the published catalog if it changed."""
+        if self._region.version == self._loaded:
+            return
+        try:
+            version, payload = self._region.read_versioned()
+        except RuntimeError:
+            return
+        announcements = [ServiceAnnouncement.from_json(data) for data in json.loads(payload)] if payload else []
+        self.index.replace(announcements)
+        self._loaded = version
+
+
 # Example usage and testing
 if __name__ == "__main__":
     async def main():
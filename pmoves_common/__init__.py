@@ -11,6 +11,9 @@ Usage:
     tier = ServiceTier.API
     if tier == ServiceTier.AGENT:
         print("Agent tier service")
+
+    tier = ServiceTier.parse("agent")       # O(1), returns the shared member
+    ServiceTier.from_code(tier.code)        # compact integer wire code
 """
 
 from enum import Enum
@@ -41,12 +44,70 @@ class ServiceTier(str, Enum):
     @classmethod
     def is_valid(cls, value: str) -> bool:
         """Check if a string value is a valid tier."""
-        return value in (t.value for t in cls)
+        return isinstance(value, str) and value in _TIER_BY_VALUE
+
+    @classmethod
+    def parse(cls, value: "ServiceTier | str | int") -> "ServiceTier":
+        """
+        Resolve a tier from its value, its integer wire code or a member.
+
+        Uses a precomputed lookup table instead of Enum construction, and
+        always returns the shared member so decoded tiers are interned.
+        Values are matched case-insensitively.
+
+        Raises:
+            ValueError: If the value is not a known tier
+        """
+        if isinstance(value, str):
+            tier = _TIER_BY_VALUE.get(value) or _TIER_BY_VALUE.get(value.lower())
+        elif isinstance(value, int) and not isinstance(value, bool):
+            tier = _TIER_BY_CODE.get(value)
+        else:
+            tier = None
+        if tier is not None:
+            return tier
+        raise ValueError(f"{value!r} is not a valid {cls.__name__}")
+
+    @classmethod
+    def from_code(cls, code: int) -> "ServiceTier":
+        """
+        Resolve a tier from its compact integer wire code.
+
+        Raises:
+            ValueError: If the code is not a known tier code
+        """
+        tier = _TIER_BY_CODE.get(code) if isinstance(code, int) else None
+        if tier is None:
+            raise ValueError(f"{code!r} is not a valid {cls.__name__} code")
+        return tier
+
+    @property
+    def code(self) -> int:
+        """Compact integer code for wire formats (stable across releases)."""
+        return _TIER_CODES[self]
 
     def __str__(self) -> str:
         return self.value
 
 
+# Wire codes are part of the announcement format: never renumber, only append
+_TIER_CODES = {
+    ServiceTier.DATA: 1,
+    ServiceTier.API: 2,
+    ServiceTier.LLM: 3,
+    ServiceTier.WORKER: 4,
+    ServiceTier.MEDIA: 5,
+    ServiceTier.AGENT: 6,
+}
+_TIER_BY_CODE = {code: tier for tier, code in _TIER_CODES.items()}
+# Keyed by value and by member: Enum hashes members by name, so a member
+# does not find its value's entry.
+_TIER_BY_VALUE = {
+    **{tier.value: tier for tier in ServiceTier},
+    **{tier: tier for tier in ServiceTier},
+}
+
+
 class HealthStatus(str, Enum):
     """Health status constants for service health checks."""
     HEALTHY = "healthy"
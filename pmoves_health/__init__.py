@@ -6,16 +6,69 @@ Follows PMOVES.AI conventions for service health monitoring.
 
 This module provides:
 - HealthChecker: Class for managing multiple dependency health checks
+- HealthResult: Check outcome with its pre-rendered JSON response
 - DependencyCheck: Base class for creating custom health checks
 - DatabaseCheck, HTTPCheck, NATSCheck: Pre-built check implementations
+- ProbeRegistry: Process-wide de-duplication of probes to the same upstream
+- CheckExecutor: Bounded thread pool for blocking checks, with queue metrics
+- CheckHistory: Fixed-memory ring buffer of check results for SLO summaries
+- HealthPublisher / publish_health(): Push results to services.health.v1.<service>
+- MeshHealthTable: Live mesh-wide health table built from the pushed results
 - health_check(): Decorator for registering checks
+- get_health_checker(): The process-wide checker used by the module helpers
 - create_health_app(): Factory for creating standalone health apps
 - health_check_router: FastAPI router for adding to existing apps
+  (/healthz, /livez, /readyz, /startupz)
 
 Health Endpoint Behavior:
 - Returns HTTP 200 when status is "healthy" or "degraded"
 - Returns HTTP 503 when status is "unhealthy"
 - Includes timestamp, service name, and individual check results
+- Results are cached for HEALTH_CACHE_TTL seconds and served as pre-rendered
+  bytes; the body is only re-encoded when a check outcome changes, so the
+  timestamp is the time the current outcome was first observed
+- Checks probing the same target (e.g. one NATS URL) share a single probe
+  across every HealthChecker in the process (see ProbeRegistry)
+- Checks can declare dependency edges (`add_dependency`); when an upstream
+  is down its dependents are reported false and degraded without probing
+
+Blocking Checks:
+- Sync custom checks are treated as blocking and run on a bounded
+  CheckExecutor (HEALTH_EXECUTOR_WORKERS threads) instead of the event loop;
+  declare cheap sync checks with `add_custom_check(..., blocking=False)`
+- Every check is bounded by HEALTH_CHECK_TIMEOUT; a timed-out check reports
+  false and its request is never held up by the stuck call
+
+Probe Endpoints:
+- /livez: In-process liveness checks only (`add_liveness_check`); never
+  touches dependencies, so it stays constant time when they are slow
+- /readyz: Cached dependency state (same checks as /healthz), 503 until
+  startup has completed
+- /startupz: 503 until every registered startup task (cache prefetch,
+  registry snapshot load, ...) has completed; latched once it succeeds
+- /healthz/slo: Per-check availability, p50/p95/p99 latency and flap
+  counts over rolling windows (`?window=300&window=3600`, in seconds),
+  computed from the last HEALTH_HISTORY_SIZE results of each check
+
+Push-Based Health:
+- `await publish_health()` publishes the checker's cached result body on
+  services.health.v1.<service> when its outcome changes, and at least every
+  HEALTH_PUBLISH_HEARTBEAT seconds
+- MeshHealthTable subscribes to services.health.v1.* and keeps the latest
+  result per service, so watching the whole mesh is one subscription
+  instead of an HTTP poll per service
+
+Multiple Workers:
+- `await checker.share_across_workers()` in every worker's startup makes
+  one worker (the leader, elected through pmoves_shared.LeaderLock) run
+  the checks every HEALTH_CACHE_TTL seconds and publish the rendered result
+  into a shared mmap region; the other workers serve it without probing.
+  If the leader exits, another worker takes over within one interval.
+  A new leader clears the region before its first check, and followers
+  ignore results older than 3 * HEALTH_CACHE_TTL + the check timeout, so
+  a restarted service never serves the previous run's result.
+- The leader also shares its check history, so /healthz/slo gives the
+  same answer on every worker; liveness and startup state stay per process
 
 Usage:
     from pmoves_health import create_health_app, HealthChecker, NATSCheck
@@ -38,30 +91,339 @@ Health Status Values:
 - unhealthy: One or more required checks failing
 """
 
+from array import array
 from datetime import datetime, timezone
 from functools import wraps
-from typing import Any, Callable, Dict, List
-import os
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
 import asyncio
+import json
+import math
+import os
+import struct
+import threading
+import time
+
+from pmoves_common import HealthStatus
+
+# FastAPI is imported on first use, so importing this module
+# stays cheap for CLI tools and workers that never serve /healthz.
+# `health_check_router` is built lazily through module __getattr__.
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
 
-try:
-    from fastapi import APIRouter, HTTPException
-    from fastapi.responses import JSONResponse
-    FASTAPI_AVAILABLE = True
-except ImportError:
-    FASTAPI_AVAILABLE = False
+    from fastapi import APIRouter, FastAPI
+
+    from pmoves_shared import LeaderLock, SharedRegion
+
+FASTAPI_AVAILABLE = find_spec("fastapi") is not None
 
 
 # Health check configuration
 HEALTH_CHECK_PATH = "/healthz"
+LIVENESS_PATH = "/livez"
+READINESS_PATH = "/readyz"
+STARTUP_PATH = "/startupz"
+SLO_PATH = "/healthz/slo"
 HEALTH_CHECK_TIMEOUT = 5.0
+HEALTH_CACHE_TTL = 1.0
+PROBE_SHARE_TTL = 1.0
+HEALTH_EXECUTOR_WORKERS = 4
+HEALTH_HISTORY_SIZE = 3600
+HEALTH_SLO_WINDOWS = (300, 3600)
+HEALTH_SHARED_REGION_SIZE = 64 * 1024
+# Check histories of every check, shared with followers for /healthz/slo
+HEALTH_SHARED_HISTORY_SIZE = 4 * 1024 * 1024
+# Shared results are prefixed with their publish time (epoch seconds)
+_SHARED_PUBLISHED = struct.Struct("<d")
+# Shared histories: (key length, state length) per check, then key and state
+_HISTORY_FRAME = struct.Struct("<HI")
+_HISTORY_STATE = struct.Struct("<III")
+HEALTH_SUBJECT = "services.health.v1"
+HEALTH_PUBLISH_INTERVAL = 5.0
+HEALTH_PUBLISH_HEARTBEAT = 30.0
+
+
+class HealthResult:
+    """
+    Outcome of one health check run.
+
+    The JSON response body is encoded once when the result is created, so
+    serving it is a bytes write instead of a dict serialization per probe.
+    """
+
+    __slots__ = ("status", "service", "timestamp", "checks", "status_code", "body")
+
+    def __init__(self, status: HealthStatus, service: str, timestamp: str, checks: Dict[str, bool]):
+        self.status = status
+        self.service = service
+        self.timestamp = timestamp
+        self.checks = checks
+        self.status_code = 503 if status is HealthStatus.UNHEALTHY else 200
+        self.body = json.dumps(self.to_dict(), separators=(",", ":")).encode()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the health payload: status, service, timestamp and check results."""
+        return {
+            "status": self.status.value,
+            "service": self.service,
+            "timestamp": self.timestamp,
+            **self.checks,
+        }
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "HealthResult":
+        """Rebuild a result from its encoded body, keeping the bytes as-is."""
+        data = json.loads(body)
+        result = cls.__new__(cls)
+        result.status = HealthStatus(data.pop("status"))
+        result.service = data.pop("service")
+        result.timestamp = data.pop("timestamp")
+        result.checks = data
+        result.status_code = 503 if result.status is HealthStatus.UNHEALTHY else 200
+        result.body = body
+        return result
+
+    def same_outcome(self, other: "HealthResult") -> bool:
+        """True if both results have the same status and check values."""
+        return self.status is other.status and self.checks == other.checks
+
+
+def _render(
+    previous: Optional[HealthResult],
+    status: HealthStatus,
+    service: str,
+    checks: Dict[str, bool],
+) -> HealthResult:
+    """Reuse `previous` (and its encoded body) unless the outcome changed."""
+    if previous is not None and previous.status is status and previous.checks == checks:
+        return previous
+    return HealthResult(status, service, datetime.now(timezone.utc).isoformat(), checks)
+
+
+def _nearest_rank(ordered: List[float], p: float) -> float:
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+def _dump_histories(histories: Dict[str, "CheckHistory"]) -> bytes:
+    parts = []
+    for key, history in histories.items():
+        name = key.encode()
+        state = history.dump()
+        parts.append(_HISTORY_FRAME.pack(len(name), len(state)) + name + state)
+    return b"".join(parts)
+
+
+def _load_histories(payload: bytes) -> Dict[str, "CheckHistory"]:
+    histories = {}
+    offset = 0
+    while offset < len(payload):
+        name_length, state_length = _HISTORY_FRAME.unpack_from(payload, offset)
+        offset += _HISTORY_FRAME.size
+        key = payload[offset:offset + name_length].decode()
+        offset += name_length
+        histories[key] = CheckHistory.load(payload[offset:offset + state_length])
+        offset += state_length
+    return histories
+
+
+class CheckHistory:
+    """
+    Fixed-memory ring buffer of one check's results.
+
+    Timestamps, latencies and outcomes live in parallel typed arrays
+    (17 bytes per sample), so memory is bounded by `capacity` regardless of
+    uptime. Latency is NaN for results that were not probed (skipped
+    dependents) and is then excluded from percentiles.
+    """
+
+    __slots__ = ("capacity", "_timestamps", "_latencies", "_ok", "_next", "_count")
+
+    def __init__(self, capacity: int = HEALTH_HISTORY_SIZE):
+        self.capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._latencies = array("d", bytes(8 * capacity))
+        self._ok = array("b", bytes(capacity))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def dump(self) -> bytes:
+        """Encode the buffer (see load())."""
+        return (
+            _HISTORY_STATE.pack(self.capacity, self._next, self._count)
+            + self._timestamps.tobytes() + self._latencies.tobytes() + self._ok.tobytes()
+        )
+
+    @classmethod
+    def load(cls, data: bytes) -> "CheckHistory":
+        """Rebuild a buffer encoded by dump()."""
+        capacity, next_index, count = _HISTORY_STATE.unpack_from(data)
+        history = cls.__new__(cls)
+        history.capacity = capacity
+        offset = _HISTORY_STATE.size
+        history._timestamps = array("d", data[offset:offset + 8 * capacity])
+        offset += 8 * capacity
+        history._latencies = array("d", data[offset:offset + 8 * capacity])
+        offset += 8 * capacity
+        history._ok = array("b", data[offset:offset + capacity])
+        history._next = next_index
+        history._count = count
+        return history
+
+    def record(self, ok: bool, latency_ms: float, timestamp: float = None) -> None:
+        """Append a result, overwriting the oldest once full."""
+        i = self._next
+        self._timestamps[i] = time.time() if timestamp is None else timestamp
+        self._latencies[i] = latency_ms
+        self._ok[i] = 1 if ok else 0
+        self._next = (i + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def _indices_since(self, since: float) -> Iterable[int]:
+        """Indices of samples at or after `since`, oldest first."""
+        start = (self._next - self._count) % self.capacity
+        for offset in range(self._count):
+            i = (start + offset) % self.capacity
+            if self._timestamps[i] >= since:
+                yield i
+
+    def summary(self, window: float, now: float = None) -> Dict[str, Any]:
+        """
+        Roll up the samples of the last `window` seconds.
+
+        Returns:
+            samples, availability (fraction of passing results), p50/p95/p99
+            latency in ms, flaps (pass/fail transitions) and last_failure
+            (epoch seconds or None)
+        """
+        now = time.time() if now is None else now
+        samples = failures = flaps = 0
+        previous = None
+        last_failure = None
+        latencies: List[float] = []
+        for i in self._indices_since(now - window):
+            ok = self._ok[i]
+            samples += 1
+            if not ok:
+                failures += 1
+                last_failure = self._timestamps[i]
+            if previous is not None and ok != previous:
+                flaps += 1
+            previous = ok
+            latency = self._latencies[i]
+            if not math.isnan(latency):
+                latencies.append(latency)
+        latencies.sort()
+        return {
+            "samples": samples,
+            "availability": (samples - failures) / samples if samples else None,
+            "p50_ms": _nearest_rank(latencies, 50) if latencies else None,
+            "p95_ms": _nearest_rank(latencies, 95) if latencies else None,
+            "p99_ms": _nearest_rank(latencies, 99) if latencies else None,
+            "flaps": flaps,
+            "last_failure": last_failure,
+        }
+
+
+class CheckExecutor:
+    """
+    Bounded thread pool for blocking health checks.
+
+    Unlike `asyncio.to_thread` on the default executor, the pool size and
+    backlog are capped: once `max_queue` calls are waiting, new calls fail
+    fast (reported unhealthy) instead of piling up behind stuck probes.
+    Timed-out calls that have not started are dropped from the queue;
+    calls already running finish in the background.
+    """
 
+    def __init__(self, max_workers: int = None, max_queue: int = None):
+        """
+        Args:
+            max_workers: Threads (defaults to HEALTH_EXECUTOR_WORKERS env var)
+            max_queue: Calls allowed to wait for a thread (defaults to 4 per worker)
+        """
+        if max_workers is None:
+            max_workers = int(os.getenv("HEALTH_EXECUTOR_WORKERS", HEALTH_EXECUTOR_WORKERS))
+        self.max_workers = max_workers
+        self.max_queue = max_queue if max_queue is not None else 4 * max_workers
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.max_queue_depth = 0
+        self._lock = threading.Lock()
+        self._pool: Optional["ThreadPoolExecutor"] = None
+
+    def _call(self, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            return fn()
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
 
-class HealthStatus:
-    """Health status constants."""
-    HEALTHY = "healthy"
-    DEGRADED = "degraded"
-    UNHEALTHY = "unhealthy"
+    def _dequeue_cancelled(self, future: Any) -> None:
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    async def run(self, fn: Callable[[], Any], timeout: float = HEALTH_CHECK_TIMEOUT) -> Any:
+        """
+        Run a blocking callable on the pool.
+
+        Raises:
+            asyncio.TimeoutError: If the call does not finish within `timeout`
+            RuntimeError: If the backlog is full
+        """
+        if self._pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix="pmoves-health")
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise RuntimeError("Health check executor backlog is full")
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+        future = self._pool.submit(self._call, fn)
+        future.add_done_callback(self._dequeue_cancelled)
+        try:
+            # Cancelling the wrapped future cancels the call if still queued
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+
+    def stats(self) -> Dict[str, int]:
+        """Pool size, queue depth and call counters."""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "max_queue_depth": self.max_queue_depth,
+            }
+
+
+# Process-wide executor for blocking checks, created on first use
+_check_executor: Optional[CheckExecutor] = None
+
+
+def get_check_executor() -> CheckExecutor:
+    """Return the process-wide blocking-check executor, creating it on first use."""
+    global _check_executor
+    if _check_executor is None:
+        _check_executor = CheckExecutor()
+    return _check_executor
 
 
 class DependencyCheck:
@@ -79,6 +441,14 @@ class DependencyCheck:
         """Return the status key for this check."""
         return f"{self.name.lower().replace(' ', '_')}_connected"
 
+    def target(self) -> Optional[Hashable]:
+        """
+        Identity of the probed upstream, or None if the probe is not shareable.
+
+        Checks with equal targets share one probe through ProbeRegistry.
+        """
+        return None
+
 
 class DatabaseCheck(DependencyCheck):
     """Health check for database connections."""
@@ -87,9 +457,12 @@ class DatabaseCheck(DependencyCheck):
         super().__init__("database", kwargs.get("required", True))
         self.connect_fn = connect_fn
 
+    def target(self) -> Optional[Hashable]:
+        return ("database", self.connect_fn)
+
     async def check(self) -> bool:
         try:
-            return await asyncio.to_thread(self.connect_fn)
+            return await get_check_executor().run(self.connect_fn)
         except Exception:
             return False
 
@@ -102,6 +475,9 @@ class HTTPCheck(DependencyCheck):
         super().__init__(name, kwargs.get("required", True))
         self.url = url
 
+    def target(self) -> Optional[Hashable]:
+        return ("http", self.url)
+
     async def check(self) -> bool:
         try:
             import httpx
@@ -119,11 +495,15 @@ class NATSCheck(DependencyCheck):
         super().__init__("nats", kwargs.get("required", True))
         self.nats_url = nats_url
 
+    def target(self) -> Optional[Hashable]:
+        return ("nats", self.nats_url)
+
     async def check(self) -> bool:
         nc = None
         try:
             from nats.aio.client import Client as NATS
-            nc = await NATS.connect(self.nats_url, connect_timeout=2)
+            nc = NATS()
+            await nc.connect(self.nats_url, connect_timeout=2)
             return True
         except Exception:
             return False
@@ -135,21 +515,296 @@ class NATSCheck(DependencyCheck):
                     pass
 
 
+class ProbeRegistry:
+    """
+    Process-wide de-duplication of dependency probes.
+
+    Checks reporting the same `target()` (e.g. every NATSCheck for one URL)
+    share a single in-flight probe, and its result is reused for `ttl`
+    seconds, so one NATS probe serves every HealthChecker in the process.
+    Expired results are dropped, so targets that are no longer probed do
+    not accumulate.
+    """
+
+    def __init__(self, ttl: float = PROBE_SHARE_TTL, timeout: float = HEALTH_CHECK_TIMEOUT):
+        self.ttl = ttl
+        self.timeout = timeout
+        self.probes = 0
+        self.shared = 0
+        self._results: Dict[Hashable, Tuple[float, bool, float]] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._pruned_at = time.monotonic()
+
+    async def probe(self, check: DependencyCheck, timeout: Optional[float] = None) -> bool:
+        """Run a check, or share the result of an identical recent/in-flight probe."""
+        healthy, _ = await self.probe_timed(check, timeout)
+        return healthy
+
+    async def probe_timed(self, check: DependencyCheck, timeout: Optional[float] = None) -> Tuple[bool, float]:
+        """
+        Like probe(), also returning the probe latency in milliseconds.
+
+        Args:
+            check: Check to run
+            timeout: Seconds before the probe counts as failed (defaults to
+                the registry's); a shared probe uses its first caller's
+        """
+        timeout = self.timeout if timeout is None else timeout
+        key = check.target()
+        if key is None:
+            self.probes += 1
+            return await self._run(check, timeout)
+
+        cached = self._results.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self.ttl:
+            self.shared += 1
+            return cached[1], cached[2]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight.get_loop() is asyncio.get_running_loop():
+            self.shared += 1
+            return await asyncio.shield(inflight)
+
+        self.probes += 1
+        future = self._inflight[key] = asyncio.ensure_future(self._run_shared(key, check, timeout))
+        return await asyncio.shield(future)
+
+    async def _run_shared(self, key: Hashable, check: DependencyCheck, timeout: float) -> Tuple[bool, float]:
+        try:
+            healthy, latency_ms = await self._run(check, timeout)
+            now = time.monotonic()
+            self._results[key] = (now, healthy, latency_ms)
+            if now - self._pruned_at >= self.ttl:
+                self._prune(now)
+            return healthy, latency_ms
+        finally:
+            self._inflight.pop(key, None)
+
+    def _prune(self, now: float) -> None:
+        """Drop results older than ttl (checked at most once per ttl)."""
+        self._pruned_at = now
+        expired = [key for key, (stored_at, _, _) in self._results.items() if now - stored_at >= self.ttl]
+        for key in expired:
+            del self._results[key]
+
+    async def _run(self, check: DependencyCheck, timeout: float) -> Tuple[bool, float]:
+        started = time.perf_counter()
+        try:
+            healthy = bool(await asyncio.wait_for(check.check(), timeout))
+        except Exception:
+            healthy = False
+        return healthy, (time.perf_counter() - started) * 1000
+
+    def clear(self) -> None:
+        """Forget all shared results."""
+        self._results.clear()
+
+
+# Process-wide probe registry, created on first use
+_probe_registry: Optional[ProbeRegistry] = None
+
+
+def get_probe_registry() -> ProbeRegistry:
+    """Return the process-wide probe registry, creating it on first use."""
+    global _probe_registry
+    if _probe_registry is None:
+        _probe_registry = ProbeRegistry()
+    return _probe_registry
+
+
 class HealthChecker:
     """Health checker with multiple dependency checks."""
 
-    def __init__(self, service_name: str = None):
+    def __init__(
+        self,
+        service_name: str = None,
+        cache_ttl: float = None,
+        probes: Optional[ProbeRegistry] = None,
+        executor: Optional[CheckExecutor] = None,
+        check_timeout: float = HEALTH_CHECK_TIMEOUT,
+        history_size: int = None,
+    ):
+        """
+        Args:
+            service_name: Service name in the payload (defaults to SERVICE_NAME env var)
+            cache_ttl: Seconds a result is served by get_result() before the
+                checks run again (defaults to HEALTH_CACHE_TTL env var)
+            probes: Probe registry shared with other checkers (defaults to
+                the process-wide registry)
+            executor: Pool for blocking custom checks (defaults to the
+                process-wide CheckExecutor)
+            check_timeout: Seconds before a custom check is reported failing
+            history_size: Results kept per check for SLO summaries
+                (defaults to HEALTH_HISTORY_SIZE env var)
+        """
         self.service_name = service_name or os.getenv("SERVICE_NAME", "unknown")
         self.checks: List[DependencyCheck] = []
         self.custom_checks: Dict[str, Callable] = {}
+        self.blocking_checks: set = set()
+        self.executor = executor
+        self.check_timeout = check_timeout
+        if history_size is None:
+            history_size = int(os.getenv("HEALTH_HISTORY_SIZE", HEALTH_HISTORY_SIZE))
+        self.history_size = history_size
+        self.history: Dict[str, CheckHistory] = {}
+        self.dependencies: Dict[str, List[str]] = {}
+        self.probes = probes
+        self.liveness_checks: Dict[str, Callable[[], bool]] = {}
+        self.startup_tasks: Dict[str, bool] = {}
+        self._started = False
+        self._live: Optional[HealthResult] = None
+        self._startup: Optional[HealthResult] = None
+        if cache_ttl is None:
+            cache_ttl = float(os.getenv("HEALTH_CACHE_TTL", HEALTH_CACHE_TTL))
+        self.cache_ttl = cache_ttl
+        self._result: Optional[HealthResult] = None
+        self._checked_at = 0.0
+        self._refreshing: Optional[asyncio.Future] = None
+        self._leader: Optional["LeaderLock"] = None
+        self._region: Optional["SharedRegion"] = None
+        self._shared_version = -1
+        self._shared: Optional[HealthResult] = None
+        self._shared_at = 0.0
+        self._history_region: Optional["SharedRegion"] = None
+        self._oversized: Optional[HealthResult] = None
+        self._shared_history: Optional[Dict[str, CheckHistory]] = None
+        self._shared_history_version = -1
+        self._shared_task: Optional[asyncio.Task] = None
+
+    def add_check(self, check: DependencyCheck, depends_on: Optional[List[str]] = None) -> None:
+        """
+        Add a dependency check.
+
+        Args:
+            check: Check to run
+            depends_on: Names of checks this dependency relies on
 
-    def add_check(self, check: DependencyCheck) -> None:
-        """Add a dependency check."""
+        Raises:
+            ValueError: If another check already has this name and the name
+                takes part in a dependency (edges are keyed by name)
+        """
+        if (depends_on or check.name in self._dependency_names()) and self._named(check.name):
+            raise ValueError(f"Check name {check.name!r} is already used; dependencies need unique names")
         self.checks.append(check)
+        for upstream in depends_on or ():
+            self.add_dependency(check.name, upstream)
+
+    def add_dependency(self, dependent: str, upstream: str) -> None:
+        """
+        Declare that check `dependent` relies on check `upstream` (by name).
 
-    def add_custom_check(self, name: str, check_fn: Callable) -> None:
-        """Add a custom health check function."""
+        While an upstream (or any of its own upstreams) is down, dependents
+        are reported as failing and degrade the status without being probed.
+
+        Raises:
+            ValueError: If the edge would create a cycle, or a name belongs
+                to more than one check
+        """
+        for name in (dependent, upstream):
+            if self._named(name) > 1:
+                raise ValueError(f"Check name {name!r} is used by several checks; give them distinct names")
+        if dependent == upstream or dependent in self._upstreams(upstream):
+            raise ValueError(f"Dependency cycle: {dependent} -> {upstream}")
+        edges = self.dependencies.setdefault(dependent, [])
+        if upstream not in edges:
+            edges.append(upstream)
+
+    def _named(self, name: str) -> int:
+        """Number of checks called `name`."""
+        return sum(1 for check in self.checks if check.name == name)
+
+    def _dependency_names(self) -> set:
+        """Names appearing on either side of a dependency edge."""
+        return set(self.dependencies).union(*self.dependencies.values())
+
+    def _upstreams(self, name: str) -> set:
+        """All transitive upstream names of a check."""
+        seen: set = set()
+        stack = list(self.dependencies.get(name, ()))
+        while stack:
+            upstream = stack.pop()
+            if upstream not in seen:
+                seen.add(upstream)
+                stack.extend(self.dependencies.get(upstream, ()))
+        return seen
+
+    def add_custom_check(self, name: str, check_fn: Callable, blocking: Optional[bool] = None) -> None:
+        """
+        Add a custom health check function.
+
+        Args:
+            name: Result key
+            check_fn: Coroutine function or callable returning a truthy value
+            blocking: Run on the CheckExecutor instead of the event loop.
+                Defaults to True for sync callables and False for coroutines.
+        """
+        if blocking is None:
+            blocking = not asyncio.iscoroutinefunction(check_fn)
         self.custom_checks[name] = check_fn
+        if blocking:
+            self.blocking_checks.add(name)
+        else:
+            self.blocking_checks.discard(name)
+
+    def add_liveness_check(self, name: str, check_fn: Callable[[], bool]) -> None:
+        """
+        Add an in-process liveness check for /livez.
+
+        Liveness checks are called synchronously on every probe and must be
+        constant time (no I/O, no dependency calls).
+        """
+        self.liveness_checks[name] = check_fn
+
+    def add_startup_task(self, name: str) -> None:
+        """Register a warm-up task that must complete before startup succeeds."""
+        if not self._started:
+            self.startup_tasks.setdefault(name, False)
+
+    def complete_startup_task(self, name: str) -> None:
+        """Mark a startup task as completed."""
+        self.startup_tasks[name] = True
+
+    async def run_startup_task(self, name: str, task: Callable[[], Any]) -> Any:
+        """
+        Register and run a warm-up coroutine, completing the task on success.
+
+        A failing task stays pending, so /startupz keeps reporting 503.
+        """
+        self.add_startup_task(name)
+        result = await task()
+        self.complete_startup_task(name)
+        return result
+
+    @property
+    def started(self) -> bool:
+        """True once every startup task has completed (latched)."""
+        if not self._started and all(self.startup_tasks.values()):
+            self._started = True
+        return self._started
+
+    def liveness(self) -> HealthResult:
+        """Run the in-process liveness checks (constant time, no awaits)."""
+        checks: Dict[str, bool] = {}
+        for name, check_fn in self.liveness_checks.items():
+            try:
+                checks[name] = bool(check_fn())
+            except Exception:
+                checks[name] = False
+        status = HealthStatus.HEALTHY if all(checks.values()) else HealthStatus.UNHEALTHY
+        self._live = _render(self._live, status, self.service_name, checks)
+        return self._live
+
+    def startup(self) -> HealthResult:
+        """Startup state: unhealthy until every startup task has completed."""
+        status = HealthStatus.HEALTHY if self.started else HealthStatus.UNHEALTHY
+        self._startup = _render(self._startup, status, self.service_name, dict(self.startup_tasks))
+        return self._startup
+
+    async def readiness(self) -> HealthResult:
+        """Cached dependency state, or the startup state until startup completes."""
+        if not self.started:
+            return self.startup()
+        return await self.get_result()
 
     def database(self, connect_fn: Callable) -> None:
         """Add a database health check."""
@@ -165,55 +820,313 @@ class HealthChecker:
 
     async def check_all(self) -> Dict[str, Any]:
         """Run all health checks and return status."""
-        results = {
-            "status": HealthStatus.HEALTHY,
+        result = await self._run_checks()
+        self._store(result)
+        return result.to_dict()
+
+    async def get_result(self) -> HealthResult:
+        """
+        Return the cached result, re-running checks once it is older than cache_ttl.
+
+        Concurrent callers share a single check run. The returned object (and
+        its pre-rendered body) only changes when a check outcome changes.
+        """
+        if self._region is not None and not self._leader.is_leader:
+            shared = self._read_shared()
+            if shared is not None:
+                return shared
+            # Nothing published yet: check locally until the leader publishes
+        if self._result is not None and time.monotonic() - self._checked_at < self.cache_ttl:
+            return self._result
+        if self._refreshing is None:
+            self._refreshing = asyncio.ensure_future(self._refresh())
+        return await asyncio.shield(self._refreshing)
+
+    async def _refresh(self) -> HealthResult:
+        try:
+            self._store(await self._run_checks())
+            return self._result
+        finally:
+            self._refreshing = None
+
+    @property
+    def is_leader(self) -> bool:
+        """True unless results are shared and another worker produces them."""
+        return self._leader is None or self._leader.is_leader
+
+    async def share_across_workers(self, name: Optional[str] = None) -> bool:
+        """
+        Share check results with the other worker processes of this service.
+
+        Call once in every worker at startup. The leader runs the checks
+        every cache_ttl seconds and publishes the result; the other workers
+        serve the published result and retry for leadership each interval.
+        A worker that becomes leader clears the region first, and followers
+        ignore results older than shared_max_age, so nobody serves what a
+        previous run of the service left behind. The leader also shares its
+        check history, so /healthz/slo answers the same on every worker.
+
+        Args:
+            name: Name shared by the workers (defaults to the service name)
+
+        Returns:
+            True if this worker is the leader
+        """
+        from pmoves_shared import LeaderLock, SharedRegion
+
+        if self._shared_task is None:
+            name = f"{name or self.service_name}-health"
+            self._leader = LeaderLock(name)
+            self._region = SharedRegion(name, size=HEALTH_SHARED_REGION_SIZE)
+            self._history_region = SharedRegion(f"{name}-history", size=HEALTH_SHARED_HISTORY_SIZE)
+            self._leader.try_acquire()
+            self._shared_task = asyncio.create_task(self._shared_loop())
+        return self._leader.is_leader
+
+    async def stop_sharing(self) -> None:
+        """Stop the shared-results loop and give up leadership."""
+        if self._shared_task is not None:
+            self._shared_task.cancel()
+            try:
+                await self._shared_task
+            except asyncio.CancelledError:
+                pass
+            self._shared_task = None
+            self._leader.release()
+            self._region.close()
+            self._history_region.close()
+            self._leader = self._region = self._history_region = None
+            self._shared_version = self._shared_history_version = -1
+            self._shared = self._shared_history = None
+
+    @property
+    def shared_max_age(self) -> float:
+        """Seconds after which a follower stops trusting a published result."""
+        return 3 * self.cache_ttl + self.check_timeout
+
+    async def _shared_loop(self) -> None:
+        published: Optional[HealthResult] = None
+        leading = False
+        while True:
+            if self._leader.try_acquire():
+                if not leading:
+                    # Drop what a previous run (or leader) left in the regions
+                    self._region.clear()
+                    self._history_region.clear()
+                    leading = True
+                if self._refreshing is None:
+                    self._refreshing = asyncio.ensure_future(self._refresh())
+                try:
+                    published = await asyncio.shield(self._refreshing)
+                except Exception:
+                    pass  # Keep publishing the last result
+                # Republished every interval so followers can tell it is current
+                if published is not None:
+                    self._publish_shared(published)
+            await asyncio.sleep(self.cache_ttl)
+
+    def _publish_shared(self, result: HealthResult) -> None:
+        """Write a result and the check history into the shared regions."""
+        published_at = _SHARED_PUBLISHED.pack(time.time())
+        try:
+            self._region.write(published_at + result.body)
+        except ValueError:
+            # Too many checks for the region: share the status, not the details
+            status_only = _render(self._oversized, result.status, self.service_name, {})
+            self._oversized = status_only
+            self._region.write(published_at + status_only.body)
+        try:
+            self._history_region.write(_dump_histories(self.history))
+        except ValueError:
+            self._history_region.clear()  # Followers fall back to their own history
+
+    def _read_shared(self) -> Optional[HealthResult]:
+        """
+        The leader's latest result, or None if there is none or it is stale.
+
+        The body is decoded only when it changed, so an unchanged outcome
+        keeps the same HealthResult.
+        """
+        if self._region.version != self._shared_version:
+            try:
+                version, payload = self._region.read_versioned()
+            except RuntimeError:
+                return None
+            self._shared_version = version
+            if payload is None:
+                self._shared = None
+            else:
+                self._shared_at = _SHARED_PUBLISHED.unpack_from(payload)[0]
+                body = payload[_SHARED_PUBLISHED.size:]
+                if self._shared is None or self._shared.body != body:
+                    self._shared = HealthResult.from_body(body)
+        if self._shared is None or time.time() - self._shared_at > self.shared_max_age:
+            return None
+        return self._shared
+
+    def _read_shared_history(self) -> Optional[Dict[str, CheckHistory]]:
+        """The leader's check histories, decoded only when they changed."""
+        if self._history_region.version != self._shared_history_version:
+            try:
+                version, payload = self._history_region.read_versioned()
+            except RuntimeError:
+                return None
+            self._shared_history_version = version
+            self._shared_history = None if payload is None else _load_histories(payload)
+        return self._shared_history
+
+    def _store(self, result: HealthResult) -> None:
+        # Keep the previous result (and its encoded body) while nothing changed
+        if self._result is None or not self._result.same_outcome(result):
+            self._result = result
+        self._checked_at = time.monotonic()
+
+    async def _run_custom(self, name: str) -> Tuple[bool, float]:
+        """Run one custom check with a timeout; returns (ok, latency in ms)."""
+        started = time.perf_counter()
+        ok = await self._call_custom(name)
+        return ok, (time.perf_counter() - started) * 1000
+
+    async def _call_custom(self, name: str) -> bool:
+        """Run one custom check with a timeout; any failure reports False."""
+        import inspect
+
+        check_fn = self.custom_checks[name]
+        try:
+            if name in self.blocking_checks:
+                executor = self.executor or get_check_executor()
+                result = await executor.run(check_fn, self.check_timeout)
+            else:
+                result = check_fn()
+            if inspect.isawaitable(result):
+                result = await asyncio.wait_for(result, self.check_timeout)
+            return bool(result)
+        except Exception:
+            return False
+
+    def _record(self, key: str, ok: bool, latency_ms: float, timestamp: float) -> None:
+        history = self.history.get(key)
+        if history is None:
+            history = self.history[key] = CheckHistory(self.history_size)
+        history.record(ok, latency_ms, timestamp)
+
+    def slo_summary(self, windows: Iterable[float] = HEALTH_SLO_WINDOWS) -> Dict[str, Any]:
+        """
+        Availability, latency percentiles and flap counts per check.
+
+        Args:
+            windows: Rolling windows in seconds
+
+        Returns:
+            {"service": ..., "windows": {"<seconds>": {"<check>": summary}}}
+        """
+        histories = self.history
+        if self._history_region is not None and not self._leader.is_leader:
+            histories = self._read_shared_history() or histories
+        now = time.time()
+        return {
             "service": self.service_name,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "windows": {
+                str(int(window) if float(window).is_integer() else window): {
+                    key: history.summary(window, now) for key, history in histories.items()
+                }
+                for window in windows
+            },
         }
 
-        all_healthy = True
-        some_degraded = False
+    def _check_levels(self) -> List[List[DependencyCheck]]:
+        """Group checks so every check comes after the checks it depends on."""
+        names = {check.name for check in self.checks}
+        depth: Dict[str, int] = {}
+
+        def depth_of(name: str) -> int:
+            if name not in depth:
+                ups = [up for up in self.dependencies.get(name, ()) if up in names]
+                depth[name] = 1 + max(map(depth_of, ups)) if ups else 0
+            return depth[name]
 
-        # Run dependency checks
+        levels: List[List[DependencyCheck]] = []
         for check in self.checks:
-            try:
-                is_healthy = await check.check()
-                results[check.status_key()] = is_healthy
+            level = depth_of(check.name)
+            while len(levels) <= level:
+                levels.append([])
+            levels[level].append(check)
+        return levels
+
+    async def _run_checks(self) -> HealthResult:
+        """Run every dependency and custom check once."""
+        results: Dict[str, bool] = {}
+        all_healthy = True
+        some_degraded = False
 
+        # Run dependency checks, upstreams first; independent checks of one
+        # level run concurrently
+        probes = self.probes or get_probe_registry()
+        outcome: Dict[int, Tuple[bool, float]] = {}
+        skipped: set = set()
+        down: set = set()
+        for level in self._check_levels():
+            to_probe = []
+            for check in level:
+                if any(up in down for up in self.dependencies.get(check.name, ())):
+                    skipped.add(id(check))
+                    outcome[id(check)] = (False, math.nan)
+                    down.add(check.name)
+                else:
+                    to_probe.append(check)
+            timed = await asyncio.gather(*(probes.probe_timed(check, self.check_timeout) for check in to_probe))
+            for check, (is_healthy, latency_ms) in zip(to_probe, timed):
+                outcome[id(check)] = (is_healthy, latency_ms)
                 if not is_healthy:
-                    if check.required:
-                        all_healthy = False
-                    else:
-                        some_degraded = True
-            except Exception as e:
-                results[check.status_key()] = False
-                if check.required:
+                    down.add(check.name)
+
+        now = time.time()
+        for check in self.checks:
+            is_healthy, latency_ms = outcome[id(check)]
+            results[check.status_key()] = is_healthy
+            self._record(check.status_key(), is_healthy, latency_ms, now)
+            if not is_healthy:
+                # A dependent of a failed upstream only degrades the status;
+                # the upstream's own check decides if it is unhealthy
+                if check.required and id(check) not in skipped:
                     all_healthy = False
                 else:
                     some_degraded = True
 
-        # Run custom checks
-        for name, check_fn in self.custom_checks.items():
-            try:
-                result = await check_fn() if asyncio.iscoroutinefunction(check_fn) else check_fn()
-                results[name] = bool(result)
-                if not result:
-                    all_healthy = False
-            except Exception:
-                results[name] = False
+        # Run custom checks concurrently; blocking ones on the executor
+        names = list(self.custom_checks)
+        outcomes = await asyncio.gather(*(self._run_custom(name) for name in names))
+        for name, (ok, latency_ms) in zip(names, outcomes):
+            results[name] = ok
+            self._record(name, ok, latency_ms, now)
+            if not ok:
                 all_healthy = False
 
         # Determine overall status
+        status = HealthStatus.HEALTHY
         if not all_healthy:
-            results["status"] = HealthStatus.UNHEALTHY
+            status = HealthStatus.UNHEALTHY
         elif some_degraded:
-            results["status"] = HealthStatus.DEGRADED
+            status = HealthStatus.DEGRADED
+
+        return HealthResult(
+            status,
+            self.service_name,
+            datetime.now(timezone.utc).isoformat(),
+            results,
+        )
+
 
-        return results
+# Global health checker instance, created on first use
+_health_checker: Optional[HealthChecker] = None
 
 
-# Global health checker instance
-_health_checker = HealthChecker()
+def get_health_checker() -> HealthChecker:
+    """Return the process-wide health checker, creating it on first use."""
+    global _health_checker
+    if _health_checker is None:
+        _health_checker = HealthChecker()
+    return _health_checker
 
 
 def health_check(checks: List[DependencyCheck] = None):
@@ -235,7 +1148,7 @@ def health_check(checks: List[DependencyCheck] = None):
         # Register checks once when decorator is applied, not on each call
         if checks:
             for check in checks:
-                _health_checker.add_check(check)
+                get_health_checker().add_check(check)
 
         @wraps(func)
         async def wrapper(*args, **kwargs):
@@ -246,35 +1159,267 @@ def health_check(checks: List[DependencyCheck] = None):
 
 def add_database_check(connect_fn: Callable) -> None:
     """Add a database health check."""
-    _health_checker.database(connect_fn)
+    get_health_checker().database(connect_fn)
 
 
 def add_http_check(url: str, name: str = "service") -> None:
     """Add an HTTP endpoint health check."""
-    _health_checker.http(url, name)
+    get_health_checker().http(url, name)
 
 
 def add_nats_check(nats_url: str) -> None:
     """Add a NATS health check."""
-    _health_checker.nats(nats_url)
+    get_health_checker().nats(nats_url)
 
 
-def add_custom_check(name: str, check_fn: Callable) -> None:
+def add_custom_check(name: str, check_fn: Callable, blocking: Optional[bool] = None) -> None:
     """Add a custom health check function."""
-    _health_checker.add_custom_check(name, check_fn)
+    get_health_checker().add_custom_check(name, check_fn, blocking)
+
+
+def add_liveness_check(name: str, check_fn: Callable[[], bool]) -> None:
+    """Add an in-process liveness check."""
+    get_health_checker().add_liveness_check(name, check_fn)
+
+
+def add_startup_task(name: str) -> None:
+    """Register a warm-up task gating /startupz and /readyz."""
+    get_health_checker().add_startup_task(name)
+
+
+def complete_startup_task(name: str) -> None:
+    """Mark a warm-up task as completed."""
+    get_health_checker().complete_startup_task(name)
+
+
+def get_health_slo(windows: Iterable[float] = HEALTH_SLO_WINDOWS) -> Dict[str, Any]:
+    """Get SLO summaries of the process-wide health checker."""
+    return get_health_checker().slo_summary(windows)
 
 
 async def get_health_status() -> Dict[str, Any]:
     """Get current health status."""
-    return await _health_checker.check_all()
+    return await get_health_checker().check_all()
+
 
+def _subject_token(value: str) -> str:
+    """Make a service name safe to use as a single NATS subject token."""
+    for char in ".*> \t":
+        value = value.replace(char, "_")
+    return value
 
-if FASTAPI_AVAILABLE:
-    from fastapi import APIRouter
 
-    health_check_router = APIRouter()
+class HealthPublisher:
+    """
+    Pushes a checker's results to services.health.v1.<service>.
+
+    The cached result is looked at every `interval` seconds and published
+    when its outcome changed, and at least every `heartbeat` seconds so
+    consumers can tell a quiet service from a gone one. With workers
+    sharing results (`share_across_workers`), only the leader publishes.
+
+    Example:
+        publisher = HealthPublisher(get_health_checker(), "nats://nats:4222")
+        await publisher.start()
+    """
 
-    @health_check_router.get(HEALTH_CHECK_PATH)
+    def __init__(
+        self,
+        checker: HealthChecker,
+        nats_url: Optional[str] = None,
+        interval: float = None,
+        heartbeat: float = None,
+    ):
+        """
+        Args:
+            checker: Checker whose results are published
+            nats_url: NATS server URL (defaults to NATS_URL env var)
+            interval: Seconds between change checks (defaults to
+                HEALTH_PUBLISH_INTERVAL env var)
+            heartbeat: Maximum seconds between publications (defaults to
+                HEALTH_PUBLISH_HEARTBEAT env var)
+        """
+        self.checker = checker
+        self.nats_url = nats_url or os.getenv("NATS_URL", "nats://nats:4222")
+        if interval is None:
+            interval = float(os.getenv("HEALTH_PUBLISH_INTERVAL", HEALTH_PUBLISH_INTERVAL))
+        if heartbeat is None:
+            heartbeat = float(os.getenv("HEALTH_PUBLISH_HEARTBEAT", HEALTH_PUBLISH_HEARTBEAT))
+        self.interval = interval
+        self.heartbeat = heartbeat
+        self.subject = f"{HEALTH_SUBJECT}.{_subject_token(checker.service_name)}"
+        self.published = 0
+        self._last: Optional[HealthResult] = None
+        self._last_at = 0.0
+        self._nc = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def publish(self) -> bool:
+        """
+        Publish the current result if it changed or the heartbeat is due.
+
+        Returns:
+            True if a message was published
+        """
+        if not self.checker.is_leader:
+            self._last = None  # Publish right away if this worker takes over
+            return False
+        result = await self.checker.get_result()
+        now = time.monotonic()
+        if result is self._last and now - self._last_at < self.heartbeat:
+            return False
+        await self._nc.publish(self.subject, result.body)
+        self._last = result
+        self._last_at = now
+        self.published += 1
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.publish()
+            except Exception:
+                pass  # Disconnected: nats-py reconnects, try again next interval
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        """Connect and start publishing."""
+        from nats.aio.client import Client as NATS
+
+        if self._task is None:
+            self._nc = NATS()
+            await self._nc.connect(self.nats_url, connect_timeout=5)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop publishing and close the connection."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._nc is not None:
+            await self._nc.close()
+            self._nc = None
+
+
+class MeshHealthTable:
+    """
+    Live health of every publishing service, kept from services.health.v1.*.
+
+    Entries not refreshed within `expiry` seconds are dropped, so a service
+    that stopped publishing disappears instead of staying "healthy".
+
+    Example:
+        table = MeshHealthTable("nats://nats:4222")
+        await table.start()
+        table.status("hirag-v2")     # HealthStatus.HEALTHY
+        table.unhealthy()            # ["archon"]
+    """
+
+    def __init__(self, nats_url: Optional[str] = None, expiry: float = None):
+        """
+        Args:
+            nats_url: NATS server URL (defaults to NATS_URL env var)
+            expiry: Seconds before a silent service is dropped (defaults to
+                three heartbeats)
+        """
+        self.nats_url = nats_url or os.getenv("NATS_URL", "nats://nats:4222")
+        if expiry is None:
+            expiry = 3 * float(os.getenv("HEALTH_PUBLISH_HEARTBEAT", HEALTH_PUBLISH_HEARTBEAT))
+        self.expiry = expiry
+        self.results: Dict[str, HealthResult] = {}
+        self.messages = 0
+        self.decode_errors = 0
+        self._seen: Dict[str, float] = {}
+        self._nc = None
+
+    def ingest(self, payload: bytes, now: Optional[float] = None) -> HealthResult:
+        """Record one published result."""
+        result = HealthResult.from_body(payload)
+        self.results[result.service] = result
+        self._seen[result.service] = time.monotonic() if now is None else now
+        return result
+
+    def expire(self, now: Optional[float] = None) -> List[str]:
+        """Drop services not heard from within `expiry` seconds."""
+        cutoff = (time.monotonic() if now is None else now) - self.expiry
+        gone = [service for service, seen in self._seen.items() if seen < cutoff]
+        for service in gone:
+            del self._seen[service]
+            del self.results[service]
+        return gone
+
+    def status(self, service: str) -> Optional[HealthStatus]:
+        """Latest status of a service, None if it is not publishing."""
+        self.expire()
+        result = self.results.get(service)
+        return result.status if result is not None else None
+
+    def unhealthy(self) -> List[str]:
+        """Services currently reporting unhealthy."""
+        self.expire()
+        return sorted(s for s, r in self.results.items() if r.status is HealthStatus.UNHEALTHY)
+
+    def summary(self) -> Dict[str, Any]:
+        """Mesh-wide status counts and per-service results."""
+        self.expire()
+        counts = {status.value: 0 for status in HealthStatus}
+        for result in self.results.values():
+            counts[result.status.value] += 1
+        return {
+            "services": len(self.results),
+            **counts,
+            "results": {service: result.to_dict() for service, result in sorted(self.results.items())},
+        }
+
+    async def _on_message(self, msg) -> None:
+        self.messages += 1
+        try:
+            self.ingest(msg.data)
+        except Exception:
+            self.decode_errors += 1
+
+    async def start(self) -> None:
+        """Connect and subscribe to every service's health subject."""
+        from nats.aio.client import Client as NATS
+
+        self._nc = NATS()
+        await self._nc.connect(self.nats_url, connect_timeout=5)
+        await self._nc.subscribe(f"{HEALTH_SUBJECT}.*", cb=self._on_message)
+        await self._nc.flush()
+
+    async def stop(self) -> None:
+        """Close the connection."""
+        if self._nc is not None:
+            await self._nc.close()
+            self._nc = None
+
+
+async def publish_health(nats_url: Optional[str] = None, **kwargs: Any) -> HealthPublisher:
+    """Start publishing the process-wide checker's results over NATS."""
+    publisher = HealthPublisher(get_health_checker(), nats_url, **kwargs)
+    await publisher.start()
+    return publisher
+
+
+def _build_health_check_router() -> "APIRouter":
+    """Build the FastAPI router serving HEALTH_CHECK_PATH."""
+    from fastapi import APIRouter, Request
+    from fastapi.responses import JSONResponse, Response
+
+    router = APIRouter()
+
+    def respond(result: HealthResult) -> Response:
+        return Response(
+            content=result.body,
+            status_code=result.status_code,
+            media_type="application/json",
+        )
+
+    @router.get(HEALTH_CHECK_PATH)
     async def healthz():
         """
         Standard health check endpoint.
@@ -283,23 +1428,65 @@ if FASTAPI_AVAILABLE:
             - 200 with status "healthy" or "degraded"
             - 503 with status "unhealthy"
         """
-        status = await get_health_status()
-
-        # Return proper HTTP status codes
-        if status.get("status") == HealthStatus.UNHEALTHY:
-            return JSONResponse(content=status, status_code=503)
-        return status
-
-    def create_health_app(service_name: str = None) -> "FastAPI":
-        """Create a minimal FastAPI app with health check."""
-        from fastapi import FastAPI
-        app = FastAPI(title=service_name or "PMOVES Service")
-        app.include_router(health_check_router)
-        return app
-else:
-    def create_health_app(service_name: str = None):
-        """Raise error if FastAPI not available."""
+        return respond(await get_health_checker().get_result())
+
+    @router.get(SLO_PATH)
+    async def health_slo(request: Request):
+        """
+        Rolled-up check history.
+
+        Query:
+            window: Window in seconds, repeatable (defaults to 300 and 3600)
+        """
+        try:
+            windows = [float(w) for w in request.query_params.getlist("window")]
+        except ValueError:
+            return JSONResponse({"detail": "window must be a number of seconds"}, status_code=400)
+        return get_health_checker().slo_summary(windows or HEALTH_SLO_WINDOWS)
+
+    # async so FastAPI answers on the event loop instead of a worker thread
+    @router.get(LIVENESS_PATH)
+    async def livez():
+        """Liveness: in-process checks only, 503 if any fails."""
+        return respond(get_health_checker().liveness())
+
+    @router.get(READINESS_PATH)
+    async def readyz():
+        """Readiness: cached dependency state, 503 until startup completes."""
+        return respond(await get_health_checker().readiness())
+
+    @router.get(STARTUP_PATH)
+    async def startupz():
+        """Startup: 503 until every startup task has completed."""
+        return respond(get_health_checker().startup())
+
+    return router
+
+
+def _get_health_check_router() -> "APIRouter":
+    router = globals().get("health_check_router")
+    if router is None:
+        if not FASTAPI_AVAILABLE:
+            raise ImportError("FastAPI is required for health_check_router")
+        router = globals()["health_check_router"] = _build_health_check_router()
+    return router
+
+
+def __getattr__(name: str) -> Any:
+    """Construct `health_check_router` on first access (PEP 562)."""
+    if name == "health_check_router":
+        return _get_health_check_router()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def create_health_app(service_name: str = None) -> "FastAPI":
+    """Create a minimal FastAPI app with health check."""
+    if not FASTAPI_AVAILABLE:
         raise ImportError("FastAPI is required to create health app")
+    from fastapi import FastAPI
+    app = FastAPI(title=service_name or "PMOVES Service")
+    app.include_router(_get_health_check_router())
+    return app
 
 
 # Example usage
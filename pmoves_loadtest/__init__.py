@@ -0,0 +1,672 @@
+"""
+PMOVES.AI Service Mesh Load Test Harness
+
+Simulates a large PMOVES service mesh on one machine so discovery and health
+behaviour can be measured before it reaches production.
+
+Every simulated service uses the real `ServiceAnnouncer`/`BackgroundAnnouncer`
+from `pmoves_announcer` and a real `pmoves_health.HealthChecker` served on its
+own `/healthz` port. Registry consumers decode the announcement stream with
+`ServiceAnnouncement.from_json` and probers hit the announced health URLs.
+
+This module provides:
+- LoadTestConfig: Parameters for a load test run
+- LoadTestReport: Measured results of a run
+- SimulatedService: One announcing, health-serving fake service
+- RegistryConsumer: Announcement subscriber that tracks the live catalog
+- run_load_test(): Run a complete load test and return a report
+
+Measured:
+- Announcement fan-in rate per consumer (messages/s)
+- Time to converge on the full catalog at startup and after churn
+- /healthz probe latency percentiles
+- Memory per simulated service (RSS delta)
+- NATS message rate (from the embedded server or `/varz` monitoring)
+
+Usage:
+    python -m pmoves_loadtest --services 500 --processes 4 --interval 5
+
+    # Against a local nats-server instead of the embedded one
+    python -m pmoves_loadtest --nats-url nats://127.0.0.1:4222 \\
+        --nats-monitor-url http://127.0.0.1:8222
+
+Requires `nats-py` (the announcer's own dependency). FastAPI is not needed:
+health endpoints are served by a minimal asyncio HTTP server that writes the
+pre-rendered `HealthChecker.get_result()` body, exactly like `pmoves_health`.
+"""
+
+import asyncio
+import itertools
+import json
+import multiprocessing
+import random
+import time
+import urllib.request
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pmoves_announcer import (
+    AnnouncementIndex,
+    AnnouncementIngest,
+    BackgroundAnnouncer,
+    ServiceAnnouncement,
+    ServiceAnnouncer,
+    announcement_subjects,
+)
+from pmoves_common import ServiceTier
+from pmoves_health import HEALTH_CHECK_PATH, HealthChecker
+
+
+@dataclass
+class LoadTestConfig:
+    """
+    Parameters for a load test run.
+
+    Attributes:
+        services: Number of simulated services
+        processes: Number of processes hosting the simulated services
+        announce_interval: BackgroundAnnouncer interval in seconds
+        consumers: Number of registry consumers subscribed to announcements
+        probe_concurrency: Concurrent /healthz probers
+        duration: Length of the steady-state measurement window in seconds
+        churn_fraction: Fraction of services replaced during the churn phase
+        converge_timeout: Maximum time to wait for catalog convergence
+        startup_stagger: Delay between service starts in seconds
+        expiry_factor: Consumers expire services not heard from in
+            `expiry_factor * announce_interval` seconds
+        nats_url: External NATS server URL (None starts an embedded server)
+        nats_monitor_url: nats-server monitoring URL for message rates
+        seed: Random seed for churn selection
+        consumer_tiers: Tiers consumers subscribe to on the sharded
+            subjects (None subscribes to the legacy all-services subject)
+    """
+
+    services: int = 500
+    processes: int = 1
+    announce_interval: float = 5.0
+    consumers: int = 1
+    probe_concurrency: int = 16
+    duration: float = 30.0
+    churn_fraction: float = 0.1
+    converge_timeout: float = 120.0
+    startup_stagger: float = 0.002
+    expiry_factor: float = 3.0
+    nats_url: Optional[str] = None
+    nats_monitor_url: Optional[str] = None
+    seed: int = 0
+    consumer_tiers: Optional[List[str]] = None
+
+
+@dataclass
+class LoadTestReport:
+    """Measured results of a load test run."""
+
+    services: int
+    processes: int
+    consumers: int
+    startup_convergence_s: Optional[float] = None
+    churn_join_convergence_s: Optional[float] = None
+    churn_leave_convergence_s: Optional[float] = None
+    fan_in_rate: List[float] = field(default_factory=list)
+    probe_count: int = 0
+    probe_errors: int = 0
+    probe_latency_ms: Dict[str, float] = field(default_factory=dict)
+    memory_per_service_kb: Optional[float] = None
+    nats_in_msgs_per_s: Optional[float] = None
+    nats_out_msgs_per_s: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dict."""
+        return asdict(self)
+
+    def format(self) -> str:
+        """Render a human-readable summary."""
+
+        def fmt(value: Optional[float], unit: str) -> str:
+            return "n/a" if value is None else f"{value:.3f}{unit}"
+
+        fan_in = ", ".join(f"{r:.1f}" for r in self.fan_in_rate) or "n/a"
+        lat = self.probe_latency_ms
+        lines = [
+            f"services={self.services} processes={self.processes} consumers={self.consumers}",
+            f"startup convergence:      {fmt(self.startup_convergence_s, 's')}",
+            f"churn join convergence:   {fmt(self.churn_join_convergence_s, 's')}",
+            f"churn leave convergence:  {fmt(self.churn_leave_convergence_s, 's')}",
+            f"announcement fan-in:      {fan_in} msg/s per consumer",
+            f"probes:                   {self.probe_count} ({self.probe_errors} errors)",
+            "probe latency:            "
+            + (" ".join(f"{k}={v:.2f}ms" for k, v in lat.items()) if lat else "n/a"),
+            f"memory per service:       {fmt(self.memory_per_service_kb, ' KiB')}",
+            f"nats in/out rate:         {fmt(self.nats_in_msgs_per_s, '')}"
+            f" / {fmt(self.nats_out_msgs_per_s, '')} msg/s",
+        ]
+        return "\n".join(lines)
+
+
+def percentiles(samples: List[float], points=(50, 90, 95, 99)) -> Dict[str, float]:
+    """Nearest-rank percentiles of a sample list (plus max)."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    result = {}
+    for p in points:
+        rank = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered))) - 1))
+        result[f"p{p}"] = ordered[rank]
+    result["max"] = ordered[-1]
+    return result
+
+
+def _rss_kb() -> int:
+    """Current resident set size in KiB (Linux), falling back to peak RSS."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+# ---------------------------------------------------------------------------
+# Simulated services
+# ---------------------------------------------------------------------------
+
+
+async def _read_http_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, bool]]:
+    """Read one HTTP/1.1 request; return (path, keep_alive) or None on EOF."""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    parts = request_line.decode("latin-1").split()
+    path = parts[1] if len(parts) > 1 else "/"
+    keep_alive = len(parts) > 2 and parts[2] == "HTTP/1.1"
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "connection":
+            keep_alive = value.strip().lower() == "keep-alive" or (
+                keep_alive and value.strip().lower() != "close"
+            )
+    return path, keep_alive
+
+
+def _http_response(status: int, body: bytes, keep_alive: bool) -> bytes:
+    reason = {200: "OK", 404: "Not Found", 503: "Service Unavailable"}.get(status, "OK")
+    head = (
+        f"HTTP/1.1 {status} {reason}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+class SimulatedService:
+    """
+    A simulated PMOVES service: real announcer plus a /healthz endpoint.
+
+    The health endpoint serves `HealthChecker.get_result()` exactly like the
+    `pmoves_health` router: HTTP 503 when unhealthy, 200 otherwise.
+    """
+
+    def __init__(
+        self,
+        slug: str,
+        tier: ServiceTier,
+        nats_url: str,
+        announce_interval: float,
+        host: str = "127.0.0.1",
+    ):
+        self.slug = slug
+        self.tier = tier
+        self.nats_url = nats_url
+        self.announce_interval = announce_interval
+        self.host = host
+        self.checker = HealthChecker(slug)
+        self.checker.add_custom_check("simulated", lambda: True, blocking=False)
+        self.announcer: Optional[ServiceAnnouncer] = None
+        self._background: Optional[BackgroundAnnouncer] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await _read_http_request(reader)
+                if request is None:
+                    break
+                path, keep_alive = request
+                if path == HEALTH_CHECK_PATH:
+                    result = await self.checker.get_result()
+                    code, body = result.status_code, result.body
+                else:
+                    code, body = 404, b'{"detail":"Not Found"}'
+                writer.write(_http_response(code, body, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> None:
+        """Start serving /healthz and begin periodic announcements."""
+        self._server = await asyncio.start_server(self._handle, self.host, 0)
+        port = self._server.sockets[0].getsockname()[1]
+        self.announcer = ServiceAnnouncer(
+            slug=self.slug,
+            name=f"Simulated {self.slug}",
+            url=f"http://{self.host}:{port}",
+            port=port,
+            tier=self.tier,
+            nats_url=self.nats_url,
+            metadata={"simulated": True},
+        )
+        self._background = BackgroundAnnouncer(self.announcer, interval=self.announce_interval)
+        await self._background.start()
+
+    async def stop(self) -> None:
+        """Stop announcing and close the health endpoint."""
+        if self._background:
+            await self._background.stop()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+class _ServiceHost:
+    """Hosts a slice of the simulated services in the current event loop."""
+
+    def __init__(self, config: LoadTestConfig, nats_url: str, prefix: str):
+        self.config = config
+        self.nats_url = nats_url
+        self.prefix = prefix
+        self.services: Dict[str, SimulatedService] = {}
+        self._counter = itertools.count()
+        self._tiers = itertools.cycle(list(ServiceTier))
+        self._rng = random.Random(f"{config.seed}-{prefix}")
+
+    def _next_slug(self) -> str:
+        return f"sim-{self.prefix}-{next(self._counter):05d}"
+
+    async def _spawn(self, count: int) -> Dict[str, str]:
+        slugs = {}
+        for _ in range(count):
+            service = SimulatedService(
+                self._next_slug(),
+                next(self._tiers),
+                self.nats_url,
+                self.config.announce_interval,
+            )
+            await service.start()
+            self.services[service.slug] = service
+            slugs[service.slug] = service.tier.value
+            if self.config.startup_stagger:
+                await asyncio.sleep(self.config.startup_stagger)
+        return slugs
+
+    async def start(self, count: int) -> Dict[str, Any]:
+        rss_before = _rss_kb()
+        slugs = await self._spawn(count)
+        rss_after = _rss_kb()
+        return {"slugs": slugs, "rss_delta_kb": rss_after - rss_before}
+
+    async def churn(self, count: int) -> Dict[str, Any]:
+        victims = self._rng.sample(sorted(self.services), min(count, len(self.services)))
+        await asyncio.gather(*(self.services.pop(slug).stop() for slug in victims))
+        added = await self._spawn(len(victims))
+        return {"removed": victims, "added": added}
+
+    async def stop(self) -> None:
+        await asyncio.gather(*(s.stop() for s in self.services.values()))
+        self.services.clear()
+
+
+def _host_process_main(conn, config: LoadTestConfig, nats_url: str, prefix: str) -> None:
+    """Entry point for a child process hosting simulated services."""
+
+    async def serve():
+        host = _ServiceHost(config, nats_url, prefix)
+        loop = asyncio.get_running_loop()
+        while True:
+            op, arg = await loop.run_in_executor(None, conn.recv)
+            if op == "start":
+                conn.send(await host.start(arg))
+            elif op == "churn":
+                conn.send(await host.churn(arg))
+            elif op == "stop":
+                await host.stop()
+                conn.send(None)
+                return
+
+    asyncio.run(serve())
+
+
+class _ProcessHostProxy:
+    """Async proxy for a `_ServiceHost` running in a child process."""
+
+    def __init__(self, config: LoadTestConfig, nats_url: str, prefix: str):
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=_host_process_main,
+            args=(child_conn, config, nats_url, prefix),
+            daemon=True,
+        )
+        self._process.start()
+
+    async def _call(self, op: str, arg: Any = None) -> Any:
+        loop = asyncio.get_running_loop()
+        self._conn.send((op, arg))
+        return await loop.run_in_executor(None, self._conn.recv)
+
+    async def start(self, count: int) -> Dict[str, Any]:
+        return await self._call("start", count)
+
+    async def churn(self, count: int) -> Dict[str, Any]:
+        return await self._call("churn", count)
+
+    async def stop(self) -> None:
+        await self._call("stop")
+        self._process.join(timeout=10)
+
+
+# ---------------------------------------------------------------------------
+# Consumers and probers
+# ---------------------------------------------------------------------------
+
+
+class RegistryConsumer:
+    """
+    Subscribes to service announcements and keeps a live catalog.
+
+    Services not heard from within `expiry` seconds are dropped from the
+    catalog, the same way a TTL-based registry cache would age them out.
+    With `tiers` set, only those tiers' sharded subjects are subscribed, so
+    other tiers' announcements are never delivered or decoded. Messages go
+    through the batched AnnouncementIngest pipeline, so `catalog` is always
+    a consistent copy-on-write snapshot.
+    """
+
+    def __init__(self, nats_url: str, expiry: float, tiers: Optional[List[str]] = None):
+        self.nats_url = nats_url
+        self.expiry = expiry
+        self.tiers = tiers
+        self.index = AnnouncementIndex()
+        self.ingest = AnnouncementIngest(self.index)
+        self._nc = None
+        self._sweeper: Optional[asyncio.Task] = None
+
+    @property
+    def catalog(self) -> Dict[str, ServiceAnnouncement]:
+        return self.index.services
+
+    @property
+    def messages(self) -> int:
+        return self.ingest.received
+
+    @property
+    def decode_errors(self) -> int:
+        return self.ingest.decode_errors
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(min(0.1, self.expiry / 10))
+            self.index.expire(self.expiry)
+
+    async def start(self) -> None:
+        from nats.aio.client import Client as NATS
+
+        self._nc = NATS()
+        await self._nc.connect(self.nats_url, connect_timeout=5)
+        await self.ingest.start()
+        if self.tiers is None:
+            subjects = [ServiceAnnouncement.SUBJECT]
+        else:
+            subjects = announcement_subjects(self.tiers)
+        for subject in subjects:
+            await self._nc.subscribe(subject, cb=self.ingest.handle)
+        await self._nc.flush()
+        self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    async def stop(self) -> None:
+        if self._sweeper:
+            self._sweeper.cancel()
+        if self._nc:
+            await self._nc.close()
+        await self.ingest.stop()
+
+    def health_urls(self) -> List[str]:
+        return [a.health_check for a in self.catalog.values()]
+
+
+async def _wait_for(predicate, timeout: float, poll: float = 0.02) -> Optional[float]:
+    """Wait until predicate() is true; return elapsed seconds or None on timeout."""
+    start = time.monotonic()
+    while time.monotonic() - start < timeout:
+        if predicate():
+            return time.monotonic() - start
+        await asyncio.sleep(poll)
+    return None
+
+
+async def _probe_worker(
+    urls: List[str],
+    deadline: float,
+    latencies: List[float],
+    errors: List[int],
+) -> None:
+    """Probe random health URLs over keep-alive connections until deadline."""
+    connections: Dict[Tuple[str, int], Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = {}
+    try:
+        while time.monotonic() < deadline:
+            url = random.choice(urls)
+            hostport, _, path = url.split("://", 1)[1].partition("/")
+            host, _, port = hostport.partition(":")
+            key = (host, int(port or 80))
+            started = time.perf_counter()
+            try:
+                if key not in connections:
+                    connections[key] = await asyncio.open_connection(*key)
+                reader, writer = connections[key]
+                writer.write(
+                    f"GET /{path} HTTP/1.1\r\nHost: {hostport}\r\n"
+                    "Connection: keep-alive\r\n\r\n".encode()
+                )
+                await writer.drain()
+                status_line = await reader.readline()
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    if name.lower() == "content-length":
+                        length = int(value)
+                await reader.readexactly(length)
+                if b" 200 " not in status_line:
+                    errors[0] += 1
+                latencies.append((time.perf_counter() - started) * 1000)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                errors[0] += 1
+                stale = connections.pop(key, None)
+                if stale:
+                    stale[1].close()
+    finally:
+        for _, writer in connections.values():
+            writer.close()
+
+
+def _fetch_varz(monitor_url: str) -> Dict[str, Any]:
+    with urllib.request.urlopen(f"{monitor_url.rstrip('/')}/varz", timeout=5) as resp:
+        return json.loads(resp.read())
+
+
+async def _nats_counters(server, monitor_url: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Return (in_msgs, out_msgs) from the embedded server or nats-server /varz."""
+    if server is not None:
+        return server.stats.in_msgs, server.stats.out_msgs
+    if monitor_url:
+        try:
+            varz = await asyncio.to_thread(_fetch_varz, monitor_url)
+            return varz["in_msgs"], varz["out_msgs"]
+        except Exception as e:
+            print(f"Failed to read NATS monitoring endpoint: {e}")
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Orchestration
+# ---------------------------------------------------------------------------
+
+
+async def run_load_test(config: LoadTestConfig) -> LoadTestReport:
+    """
+    Run a complete load test.
+
+    Phases:
+        1. Start NATS (embedded unless `nats_url` is set) and the consumers
+        2. Start all simulated services and time catalog convergence
+        3. Probe /healthz for `duration` seconds while measuring fan-in and
+           NATS message rates
+        4. Replace `churn_fraction` of the services and time how long the
+           consumers take to see the joins and age out the departures
+
+    Args:
+        config: Load test parameters
+
+    Returns:
+        LoadTestReport with the measured values
+    """
+    report = LoadTestReport(
+        services=config.services,
+        processes=config.processes,
+        consumers=config.consumers,
+    )
+
+    server = None
+    nats_url = config.nats_url
+    if nats_url is None:
+        from pmoves_loadtest.embedded_nats import EmbeddedNATSServer
+
+        server = EmbeddedNATSServer()
+        await server.start()
+        nats_url = server.url
+
+    expiry = config.expiry_factor * config.announce_interval
+    consumers = [
+        RegistryConsumer(nats_url, expiry, config.consumer_tiers)
+        for _ in range(config.consumers)
+    ]
+    tiers = None
+    if config.consumer_tiers is not None:
+        tiers = {ServiceTier.parse(t).value for t in config.consumer_tiers}
+
+    def watched(slugs: Dict[str, str]) -> Set[str]:
+        return {slug for slug, tier in slugs.items() if tiers is None or tier in tiers}
+
+    hosts: List[Any] = []
+    try:
+        await asyncio.gather(*(c.start() for c in consumers))
+
+        # Split the services across hosts; process 0 is always a child when
+        # processes > 1 so the main loop only runs consumers and probers.
+        processes = max(1, config.processes)
+        shares = [config.services // processes] * processes
+        for i in range(config.services % processes):
+            shares[i] += 1
+        if processes == 1:
+            hosts = [_ServiceHost(config, nats_url, "p0")]
+        else:
+            hosts = [_ProcessHostProxy(config, nats_url, f"p{i}") for i in range(processes)]
+
+        # Phase 2: startup convergence
+        started = time.monotonic()
+        results = await asyncio.gather(*(h.start(n) for h, n in zip(hosts, shares)))
+        expected = watched({slug: tier for r in results for slug, tier in r["slugs"].items()})
+        rss_delta = sum(r["rss_delta_kb"] for r in results)
+        if config.services:
+            report.memory_per_service_kb = rss_delta / config.services
+
+        waited = await _wait_for(
+            lambda: all(expected <= c.catalog.keys() for c in consumers),
+            config.converge_timeout,
+        )
+        if waited is not None:
+            report.startup_convergence_s = time.monotonic() - started
+
+        # Phase 3: steady state probing
+        msgs_before = [c.messages for c in consumers]
+        nats_before = await _nats_counters(server, config.nats_monitor_url)
+        window_start = time.monotonic()
+
+        urls = consumers[0].health_urls()
+        latencies: List[float] = []
+        errors = [0]
+        if urls and config.duration > 0:
+            deadline = time.monotonic() + config.duration
+            await asyncio.gather(
+                *(
+                    _probe_worker(urls, deadline, latencies, errors)
+                    for _ in range(config.probe_concurrency)
+                )
+            )
+        else:
+            await asyncio.sleep(config.duration)
+
+        elapsed = max(time.monotonic() - window_start, 1e-9)
+        report.fan_in_rate = [
+            (c.messages - before) / elapsed for c, before in zip(consumers, msgs_before)
+        ]
+        nats_after = await _nats_counters(server, config.nats_monitor_url)
+        if nats_before and nats_after:
+            report.nats_in_msgs_per_s = (nats_after[0] - nats_before[0]) / elapsed
+            report.nats_out_msgs_per_s = (nats_after[1] - nats_before[1]) / elapsed
+        report.probe_count = len(latencies)
+        report.probe_errors = errors[0]
+        report.probe_latency_ms = percentiles(latencies)
+
+        # Phase 4: churn
+        churn_total = int(config.services * config.churn_fraction)
+        if churn_total:
+            churn_shares = [churn_total * n // config.services for n in shares]
+            churn_started = time.monotonic()
+            churned = await asyncio.gather(
+                *(h.churn(n) for h, n in zip(hosts, churn_shares) if n)
+            )
+            added = watched({slug: tier for r in churned for slug, tier in r["added"].items()})
+            removed = {slug for r in churned for slug in r["removed"]}
+
+            waited = await _wait_for(
+                lambda: all(added <= c.catalog.keys() for c in consumers),
+                config.converge_timeout,
+            )
+            if waited is not None:
+                report.churn_join_convergence_s = time.monotonic() - churn_started
+            waited = await _wait_for(
+                lambda: all(not (removed & c.catalog.keys()) for c in consumers),
+                config.converge_timeout,
+            )
+            if waited is not None:
+                report.churn_leave_convergence_s = time.monotonic() - churn_started
+    finally:
+        await asyncio.gather(*(h.stop() for h in hosts), return_exceptions=True)
+        await asyncio.gather(*(c.stop() for c in consumers), return_exceptions=True)
+        if server:
+            await server.stop()
+
+    return report
+
+
+__all__ = [
+    "LoadTestConfig",
+    "LoadTestReport",
+    "RegistryConsumer",
+    "SimulatedService",
+    "percentiles",
+    "run_load_test",
+]
@@ -0,0 +1,59 @@
+"""Command-line entry point: python -m pmoves_loadtest"""
+
+import argparse
+import asyncio
+import json
+
+from pmoves_loadtest import LoadTestConfig, run_load_test
+
+
+def main() -> None:
+    defaults = LoadTestConfig()
+    parser = argparse.ArgumentParser(
+        prog="python -m pmoves_loadtest",
+        description="Simulate a PMOVES service mesh and measure discovery/health behaviour.",
+    )
+    parser.add_argument("--services", type=int, default=defaults.services)
+    parser.add_argument("--processes", type=int, default=defaults.processes)
+    parser.add_argument("--interval", type=float, default=defaults.announce_interval,
+                        help="announcement interval in seconds")
+    parser.add_argument("--consumers", type=int, default=defaults.consumers)
+    parser.add_argument("--probe-concurrency", type=int, default=defaults.probe_concurrency)
+    parser.add_argument("--duration", type=float, default=defaults.duration,
+                        help="steady-state measurement window in seconds")
+    parser.add_argument("--churn", type=float, default=defaults.churn_fraction,
+                        help="fraction of services replaced in the churn phase")
+    parser.add_argument("--converge-timeout", type=float, default=defaults.converge_timeout)
+    parser.add_argument("--stagger", type=float, default=defaults.startup_stagger,
+                        help="delay between service starts in seconds")
+    parser.add_argument("--nats-url", default=None,
+                        help="use an external NATS server instead of the embedded one")
+    parser.add_argument("--nats-monitor-url", default=None,
+                        help="nats-server monitoring URL (e.g. http://127.0.0.1:8222)")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--consumer-tiers", default=None,
+                        help="comma-separated tiers consumers subscribe to on sharded subjects")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    config = LoadTestConfig(
+        services=args.services,
+        processes=args.processes,
+        announce_interval=args.interval,
+        consumers=args.consumers,
+        probe_concurrency=args.probe_concurrency,
+        duration=args.duration,
+        churn_fraction=args.churn,
+        converge_timeout=args.converge_timeout,
+        startup_stagger=args.stagger,
+        nats_url=args.nats_url,
+        nats_monitor_url=args.nats_monitor_url,
+        seed=args.seed,
+        consumer_tiers=args.consumer_tiers.split(",") if args.consumer_tiers else None,
+    )
+    report = asyncio.run(run_load_test(config))
+    print(json.dumps(report.to_dict(), indent=2) if args.json else report.format())
+
+
+if __name__ == "__main__":
+    main()
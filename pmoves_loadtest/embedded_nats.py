@@ -0,0 +1,276 @@
+"""
+Embedded NATS server for local PMOVES load tests.
+
+A small asyncio implementation of the NATS client protocol (INFO, CONNECT,
+PUB, HPUB, SUB, UNSUB, PING/PONG) that is good enough for the standard
+`nats-py` client to connect, publish, subscribe (including `*`/`>` wildcards
+and queue groups) and do request/reply through inboxes.
+
+It is intended for load tests and local development only: there is no
+authentication, clustering, JetStream or TLS. Use a real `nats-server` for
+anything else.
+
+Usage:
+    from pmoves_loadtest.embedded_nats import EmbeddedNATSServer
+
+    server = EmbeddedNATSServer(port=0)
+    await server.start()
+    print(server.url)  # nats://127.0.0.1:<port>
+    ...
+    await server.stop()
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+MAX_PAYLOAD = 1024 * 1024
+MAX_CONTROL_LINE = 4096
+
+
+def subject_matches(pattern: str, subject: str) -> bool:
+    """Return True if a NATS subject matches a (possibly wildcard) pattern."""
+    p_tokens = pattern.split(".")
+    s_tokens = subject.split(".")
+    for i, token in enumerate(p_tokens):
+        if token == ">":
+            return len(s_tokens) > i
+        if i >= len(s_tokens):
+            return False
+        if token != "*" and token != s_tokens[i]:
+            return False
+    return len(p_tokens) == len(s_tokens)
+
+
+@dataclass
+class ServerStats:
+    """Message counters for an embedded server."""
+
+    in_msgs: int = 0
+    out_msgs: int = 0
+    in_bytes: int = 0
+    out_bytes: int = 0
+    connections: int = 0
+    total_connections: int = 0
+
+    def snapshot(self) -> Dict[str, int]:
+        """Return the counters as a plain dict."""
+        return {
+            "in_msgs": self.in_msgs,
+            "out_msgs": self.out_msgs,
+            "in_bytes": self.in_bytes,
+            "out_bytes": self.out_bytes,
+            "connections": self.connections,
+            "total_connections": self.total_connections,
+        }
+
+
+@dataclass
+class _Subscription:
+    client: "_ClientConnection"
+    sid: str
+    subject: str
+    queue: Optional[str] = None
+    max_msgs: int = 0
+    delivered: int = 0
+
+
+@dataclass
+class _ClientConnection:
+    cid: int
+    writer: asyncio.StreamWriter
+    subs: Dict[str, _Subscription] = field(default_factory=dict)
+
+    def send(self, data: bytes) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(data)
+
+
+class EmbeddedNATSServer:
+    """In-process NATS server speaking the core client protocol."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.stats = ServerStats()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._clients: Dict[int, _ClientConnection] = {}
+        self._subs: List[_Subscription] = []
+        self._cid = itertools.count(1)
+        self._server_id = uuid.uuid4().hex
+
+    @property
+    def url(self) -> str:
+        """Client URL of the running server."""
+        return f"nats://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        """Start listening for client connections."""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Close all client connections and stop listening."""
+        if self._server:
+            self._server.close()
+            for client in list(self._clients.values()):
+                client.writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _info(self, cid: int) -> bytes:
+        info = {
+            "server_id": self._server_id,
+            "server_name": "pmoves-embedded",
+            "version": "2.10.0",
+            "proto": 1,
+            "host": self.host,
+            "port": self.port,
+            "headers": True,
+            "max_payload": MAX_PAYLOAD,
+            "client_id": cid,
+        }
+        return f"INFO {json.dumps(info)}\r\n".encode()
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        client = _ClientConnection(cid=next(self._cid), writer=writer)
+        self._clients[client.cid] = client
+        self.stats.connections += 1
+        self.stats.total_connections += 1
+        client.send(self._info(client.cid))
+        try:
+            await self._read_loop(client, reader)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # Loop shutdown; ending quietly keeps asyncio's stream callback
+            # from logging the cancellation as an unhandled error
+            pass
+        finally:
+            self._drop_client(client)
+            writer.close()
+
+    def _drop_client(self, client: _ClientConnection) -> None:
+        if self._clients.pop(client.cid, None) is not None:
+            self.stats.connections -= 1
+        if client.subs:
+            self._subs = [s for s in self._subs if s.client is not client]
+            client.subs.clear()
+
+    async def _read_loop(self, client: _ClientConnection, reader: asyncio.StreamReader) -> None:
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            if len(line) > MAX_CONTROL_LINE:
+                raise ValueError("control line too long")
+            parts = line.decode().split()
+            if not parts:
+                continue
+            op = parts[0].upper()
+
+            if op == "PUB":
+                subject, reply, size = self._parse_pub(parts[1:])
+                payload = await reader.readexactly(size + 2)
+                self._route(subject, reply, None, payload[:-2])
+            elif op == "HPUB":
+                subject, reply, hdr_size, total = self._parse_hpub(parts[1:])
+                data = await reader.readexactly(total + 2)
+                self._route(subject, reply, data[:hdr_size], data[hdr_size:-2])
+            elif op == "SUB":
+                self._subscribe(client, parts[1:])
+            elif op == "UNSUB":
+                self._unsubscribe(client, parts[1:])
+            elif op == "PING":
+                client.send(b"PONG\r\n")
+                await client.writer.drain()
+            elif op in ("PONG", "CONNECT"):
+                continue
+            else:
+                client.send(b"-ERR 'Unknown Protocol Operation'\r\n")
+
+    @staticmethod
+    def _parse_pub(args: List[str]) -> Tuple[str, Optional[str], int]:
+        if len(args) == 2:
+            return args[0], None, int(args[1])
+        return args[0], args[1], int(args[2])
+
+    @staticmethod
+    def _parse_hpub(args: List[str]) -> Tuple[str, Optional[str], int, int]:
+        if len(args) == 3:
+            return args[0], None, int(args[1]), int(args[2])
+        return args[0], args[1], int(args[2]), int(args[3])
+
+    def _subscribe(self, client: _ClientConnection, args: List[str]) -> None:
+        if len(args) == 2:
+            subject, sid, queue = args[0], args[1], None
+        else:
+            subject, queue, sid = args[0], args[1], args[2]
+        sub = _Subscription(client=client, sid=sid, subject=subject, queue=queue)
+        client.subs[sid] = sub
+        self._subs.append(sub)
+
+    def _unsubscribe(self, client: _ClientConnection, args: List[str]) -> None:
+        sid = args[0]
+        sub = client.subs.get(sid)
+        if sub is None:
+            return
+        if len(args) > 1:
+            sub.max_msgs = int(args[1])
+            if sub.delivered < sub.max_msgs:
+                return
+        self._remove_sub(sub)
+
+    def _remove_sub(self, sub: _Subscription) -> None:
+        sub.client.subs.pop(sub.sid, None)
+        try:
+            self._subs.remove(sub)
+        except ValueError:
+            pass
+
+    def _route(
+        self,
+        subject: str,
+        reply: Optional[str],
+        headers: Optional[bytes],
+        payload: bytes,
+    ) -> None:
+        self.stats.in_msgs += 1
+        self.stats.in_bytes += len(payload)
+
+        matched: List[_Subscription] = []
+        groups: Dict[str, List[_Subscription]] = {}
+        for sub in self._subs:
+            if not subject_matches(sub.subject, subject):
+                continue
+            if sub.queue:
+                groups.setdefault(sub.queue, []).append(sub)
+            else:
+                matched.append(sub)
+        for members in groups.values():
+            matched.append(random.choice(members))
+
+        reply_part = f" {reply}" if reply else ""
+        for sub in matched:
+            if headers is None:
+                head = f"MSG {subject} {sub.sid}{reply_part} {len(payload)}\r\n"
+                sub.client.send(head.encode() + payload + b"\r\n")
+            else:
+                total = len(headers) + len(payload)
+                head = f"HMSG {subject} {sub.sid}{reply_part} {len(headers)} {total}\r\n"
+                sub.client.send(head.encode() + headers + payload + b"\r\n")
+            self.stats.out_msgs += 1
+            self.stats.out_bytes += len(payload)
+            sub.delivered += 1
+            if sub.max_msgs and sub.delivered >= sub.max_msgs:
+                self._remove_sub(sub)
+
+
+__all__ = ["EmbeddedNATSServer", "ServerStats", "subject_matches"]
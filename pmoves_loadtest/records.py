@@ -0,0 +1,171 @@
+"""
+Micro-benchmark for registry and announcement records.
+
+Measures what a registry holding thousands of services pays per record:
+
+- ServiceInfo: retained bytes per entry, constructions/s, base_url reads/s
+- ServiceAnnouncement: retained bytes per decoded announcement and
+  from_json decodes/s, with announcements cycling through a fixed set of
+  services the way a registry consumer sees them
+
+Each metric has a target; the run exits non-zero if any target is missed.
+
+Usage:
+    python -m pmoves_loadtest.records
+    python -m pmoves_loadtest.records --entries 50000 --json
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List
+
+from pmoves_announcer import ServiceAnnouncement
+from pmoves_common import ServiceTier
+from pmoves_registry import ServiceInfo
+
+# Targets: "max" metrics must stay at or below, "min" metrics at or above.
+# Rates leave headroom for slower CI machines; memory targets are below what
+# non-slotted, non-interned records used (~340 and ~160 bytes).
+RECORD_TARGETS: Dict[str, Dict[str, float]] = {
+    "service_info_bytes_per_entry": {"max": 300.0},
+    "service_info_constructions_per_s": {"min": 100_000.0},
+    "service_info_base_url_reads_per_s": {"min": 3_000_000.0},
+    "announcement_bytes_per_entry": {"max": 150.0},
+    "announcement_decodes_per_s": {"min": 40_000.0},
+}
+
+
+@dataclass
+class RecordBenchmark:
+    """Measured record costs."""
+    entries: int
+    services: int
+    service_info_bytes_per_entry: float
+    service_info_constructions_per_s: float
+    service_info_base_url_reads_per_s: float
+    announcement_bytes_per_entry: float
+    announcement_decodes_per_s: float
+
+    def failures(self) -> List[str]:
+        """Describe every metric that misses its target."""
+        failed = []
+        for metric, target in RECORD_TARGETS.items():
+            value = getattr(self, metric)
+            if "max" in target and value > target["max"]:
+                failed.append(f"{metric}={value:,.1f} exceeds {target['max']:,.0f}")
+            if "min" in target and value < target["min"]:
+                failed.append(f"{metric}={value:,.1f} below {target['min']:,.0f}")
+        return failed
+
+    def format(self) -> str:
+        """Human readable report."""
+        lines = [f"entries={self.entries} services={self.services}"]
+        for metric, target in RECORD_TARGETS.items():
+            bound = f"<= {target['max']:,.0f}" if "max" in target else f">= {target['min']:,.0f}"
+            lines.append(f"{metric + ':':<36}{getattr(self, metric):>14,.1f}  (target {bound})")
+        return "\n".join(lines)
+
+
+def _retained_bytes(build: Callable[[], list]) -> float:
+    """Bytes per element retained by the list `build` returns."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        items = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - before) / max(1, len(items))
+
+
+def _rate(fn: Callable[[], object], count: int) -> float:
+    """Calls per second of `fn`."""
+    started = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return count / (time.perf_counter() - started)
+
+
+def _service_info(i: int, services: int) -> ServiceInfo:
+    slug = f"svc-{i % services}"
+    return ServiceInfo(
+        slug=slug,
+        name=slug,
+        description="",
+        health_check_url=f"http://{slug}:8080/healthz",
+        default_port=8080,
+        tier=ServiceTier.API,
+    )
+
+
+def _announcement_messages(services: int) -> List[str]:
+    tiers = list(ServiceTier)
+    return [
+        ServiceAnnouncement(
+            slug=f"svc-{i}",
+            name=f"Service {i}",
+            url=f"http://svc-{i}:8080",
+            health_check=f"http://svc-{i}:8080/healthz",
+            tier=tiers[i % len(tiers)],
+            port=8080,
+            timestamp="2026-01-01T00:00:00+00:00",
+        ).to_json()
+        for i in range(services)
+    ]
+
+
+def run_benchmark(entries: int = 20000, services: int = 500) -> RecordBenchmark:
+    """
+    Measure record memory and throughput.
+
+    Args:
+        entries: Records built per memory measurement
+        services: Distinct services the records cycle through
+    """
+    messages = _announcement_messages(services)
+    # Decoded payloads are measured separately from the records built from them
+    payloads = [json.loads(messages[i % services]) for i in range(entries)]
+
+    info_bytes = _retained_bytes(lambda: [_service_info(i, services) for i in range(entries)])
+    announcement_bytes = _retained_bytes(
+        lambda: [ServiceAnnouncement.from_json(payload) for payload in payloads]
+    )
+
+    info = _service_info(0, services)
+    counter = iter(range(sys.maxsize))
+    return RecordBenchmark(
+        entries=entries,
+        services=services,
+        service_info_bytes_per_entry=info_bytes,
+        service_info_constructions_per_s=_rate(lambda: _service_info(next(counter), services), entries),
+        service_info_base_url_reads_per_s=_rate(lambda: info.base_url, entries * 10),
+        announcement_bytes_per_entry=announcement_bytes,
+        announcement_decodes_per_s=_rate(
+            lambda: ServiceAnnouncement.from_json(messages[next(counter) % services]), entries
+        ),
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark PMOVES registry and announcement records")
+    parser.add_argument("--entries", type=int, default=20000, help="Records per measurement")
+    parser.add_argument("--services", type=int, default=500, help="Distinct services")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.entries, args.services)
+    print(json.dumps(asdict(result), indent=2) if args.json else result.format())
+    failures = result.failures()
+    for failure in failures:
+        print(f"target missed: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,6 +12,7 @@ This module provides:
 - ServiceInfo: Immutable data class for service metadata
 - get_service_url(): Resolve service URL with fallback chain
 - get_service_info(): Get full service metadata
+- DNSCache / get_dns_cache(): Async resolver cache for Docker-DNS fallback names
 
 Usage:
     from pmoves_registry import get_service_url, ServiceInfo, CommonServices
@@ -26,38 +27,52 @@ Usage:
     info = await get_service_info("hirag-v2")
     print(f"{info.name}: {info.health_check_url}")
 
+    # Fallback URLs with the hostname already resolved (cached, round-robin)
+    url = await get_service_url("hirag-v2", default_port=8086, resolve=True)
+
 Environment Variables:
     Services can be configured via environment variables in format:
     {SERVICE_SLUG}_URL (e.g., HIRAG_V2_URL=http://hirag-v2:8086)
+    DNS_CACHE_TTL: Cache time for fallback names resolved without a DNS TTL
+    DNS_NEGATIVE_TTL: Cache time for fallback names that do not resolve
 """
 
 import asyncio
 import os
+import socket
+import struct
+import sys
+import time
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pmoves_common import ServiceTier
+
+
+_HEALTH_SUFFIXES = ("/healthz", "/health", "/metrics", "/ping")
+
 
+def _strip_health_suffix(url: str) -> str:
+    # Every suffix is a single "/segment", so cut at the last slash
+    if url.endswith(_HEALTH_SUFFIXES):
+        url = url[: url.rindex("/")]
+    return url.rstrip("/")
 
-# Import ServiceTier from shared types if available, otherwise define locally
-try:
-    from pmoves_common import ServiceTier
-except ImportError:
-    from enum import Enum
 
-    class ServiceTier(str, Enum):
-        """PMOVES service tiers (6-tier architecture)."""
-        DATA = "data"
-        API = "api"
-        LLM = "llm"
-        MEDIA = "media"
-        AGENT = "agent"
-        WORKER = "worker"
+# Base URLs by interned health check URL, shared by every record of a service
+_BASE_URLS: Dict[str, str] = {}
+_BASE_URLS_MAX = 4096
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ServiceInfo:
     """
     Immutable service metadata from the service catalog.
 
+    Records are slotted (no per-instance __dict__), the slug and health URL
+    are interned, and `base_url` is derived once per health URL and cached
+    outside the record, so it is not a dataclass field.
+
     Attributes:
         slug: Unique service identifier (e.g., "hirag-v2", "agent-zero")
         name: Human-readable service name
@@ -77,15 +92,20 @@ class ServiceInfo:
     tier: ServiceTier
     metadata: dict[str, Any] = field(default_factory=dict)
 
+    def __post_init__(self) -> None:
+        # Frozen dataclass: assign interned values through object
+        object.__setattr__(self, "slug", sys.intern(self.slug))
+        object.__setattr__(self, "health_check_url", sys.intern(self.health_check_url))
+
     @property
     def base_url(self) -> str:
-        """Extract base URL from health_check_url."""
-        url = self.health_check_url
-        for suffix in ("/healthz", "/health", "/metrics", "/ping"):
-            if url.endswith(suffix):
-                url = url[: -len(suffix)]
-                break
-        return url.rstrip("/")
+        """Extract base URL from health_check_url (computed once)."""
+        url = _BASE_URLS.get(self.health_check_url)
+        if url is None:
+            if len(_BASE_URLS) >= _BASE_URLS_MAX:
+                _BASE_URLS.clear()
+            url = _BASE_URLS[self.health_check_url] = sys.intern(_strip_health_suffix(self.health_check_url))
+        return url
 
 
 class ServiceNotFoundError(Exception):
@@ -138,6 +158,279 @@ def _fallback_dns_url(slug: str, default_port: int) -> str:
     return f"http://{slug}:{default_port}"
 
 
+# Docker-DNS fallback resolution. Docker's embedded DNS answers with real
+# TTLs; the getaddrinfo fallback (hosts file, search domains) has none.
+DNS_CACHE_TTL = float(os.getenv("DNS_CACHE_TTL", "30"))
+DNS_NEGATIVE_TTL = float(os.getenv("DNS_NEGATIVE_TTL", "5"))
+DNS_MIN_TTL = 1.0
+DNS_QUERY_TIMEOUT = 2.0
+# Refresh entries in the background once this fraction of their TTL has passed
+DNS_REFRESH_AHEAD = 0.75
+
+_RESOLV_CONF = "/etc/resolv.conf"
+
+
+def _is_ip_address(host: str) -> bool:
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, host)
+            return True
+        except OSError:
+            pass
+    return False
+
+
+def _read_nameservers(path: str = _RESOLV_CONF) -> List[str]:
+    """IPv4 nameservers from resolv.conf (Docker: 127.0.0.11)."""
+    try:
+        with open(path) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+    servers = []
+    for line in lines:
+        parts = line.split()
+        if len(parts) >= 2 and parts[0] == "nameserver" and ":" not in parts[1]:
+            servers.append(parts[1])
+    return servers
+
+
+def _build_query(host: str, query_id: int) -> bytes:
+    """DNS query for the A records of `host` (recursion desired)."""
+    qname = b"".join(
+        bytes([len(label)]) + label for label in host.rstrip(".").encode("idna").split(b".")
+    )
+    return struct.pack("!HHHHHH", query_id, 0x0100, 1, 0, 0, 0) + qname + b"\0" + struct.pack("!HH", 1, 1)
+
+
+def _skip_name(data: bytes, offset: int) -> int:
+    while True:
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            return offset + 2
+        if length == 0:
+            return offset + 1
+        offset += 1 + length
+
+
+def _parse_response(data: bytes, query_id: int) -> Tuple[int, List[str], Optional[int]]:
+    """
+    Parse a DNS response.
+
+    Returns:
+        (rcode, IPv4 addresses, lowest answer TTL or None)
+    """
+    response_id, flags, questions, answers = struct.unpack("!HHHH", data[:8])
+    if response_id != query_id:
+        raise ValueError("DNS response id does not match the query")
+    offset = 12
+    for _ in range(questions):
+        offset = _skip_name(data, offset) + 4
+    addresses = []
+    ttl = None
+    for _ in range(answers):
+        offset = _skip_name(data, offset)
+        rtype, rclass, record_ttl, length = struct.unpack("!HHIH", data[offset:offset + 10])
+        offset += 10
+        # CNAME chains count towards the TTL as well
+        ttl = record_ttl if ttl is None else min(ttl, record_ttl)
+        if rtype == 1 and rclass == 1 and length == 4:
+            addresses.append(socket.inet_ntoa(data[offset:offset + 4]))
+        offset += length
+    return flags & 0x000F, addresses, ttl
+
+
+class _DNSEntry:
+    """Cached answer for one host."""
+
+    __slots__ = ("addresses", "expires", "refresh_at", "cursor", "refreshing")
+
+    def __init__(self, addresses: Tuple[str, ...], ttl: float, now: float):
+        self.addresses = addresses
+        self.expires = now + ttl
+        self.refresh_at = now + ttl * DNS_REFRESH_AHEAD
+        self.cursor = 0
+        self.refreshing = False
+
+
+class DNSCache:
+    """
+    Async resolver cache for Docker-DNS fallback hostnames.
+
+    Queries the resolv.conf nameservers directly for A records and caches
+    them for their TTL, falling back to getaddrinfo for names DNS does not
+    answer (hosts file entries, search domains). All addresses are kept and
+    handed out round-robin. Entries used after `DNS_REFRESH_AHEAD` of their
+    TTL are refreshed in the background, so hot paths keep getting cached
+    answers; failed lookups are cached for `negative_ttl` seconds.
+
+    Example:
+        cache = get_dns_cache()
+        address = await cache.resolve_one("hi-rag-gateway-v2")
+    """
+
+    def __init__(
+        self,
+        nameservers: Optional[List[str]] = None,
+        default_ttl: float = DNS_CACHE_TTL,
+        negative_ttl: float = DNS_NEGATIVE_TTL,
+        timeout: float = DNS_QUERY_TIMEOUT,
+    ):
+        """
+        Args:
+            nameservers: DNS servers to query (defaults to /etc/resolv.conf)
+            default_ttl: TTL for answers that carry none (getaddrinfo)
+            negative_ttl: Seconds to cache failed lookups
+            timeout: Per-nameserver query timeout in seconds
+        """
+        self.nameservers = _read_nameservers() if nameservers is None else nameservers
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.refreshes = 0
+        self._entries: Dict[str, _DNSEntry] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def resolve(self, host: str) -> Tuple[str, ...]:
+        """
+        All cached addresses of `host`, resolving on a miss.
+
+        Raises:
+            socket.gaierror: If the name does not resolve (cached negatively)
+        """
+        if _is_ip_address(host):
+            return (host,)
+        return (await self._entry(host)).addresses
+
+    async def resolve_one(self, host: str) -> str:
+        """
+        Next address of `host`, rotating through its A records.
+
+        Raises:
+            socket.gaierror: If the name does not resolve (cached negatively)
+        """
+        if _is_ip_address(host):
+            return host
+        entry = await self._entry(host)
+        entry.cursor = (entry.cursor + 1) % len(entry.addresses)
+        return entry.addresses[entry.cursor]
+
+    async def prefetch(self, hosts: List[str]) -> None:
+        """Resolve hosts ahead of use; failures are cached, not raised."""
+        await asyncio.gather(*(self.resolve(host) for host in hosts), return_exceptions=True)
+
+    def clear(self) -> None:
+        """Forget every cached answer."""
+        self._entries.clear()
+
+    async def _entry(self, host: str) -> _DNSEntry:
+        entry = self._entries.get(host)
+        now = time.monotonic()
+        if entry is None or now >= entry.expires:
+            self.misses += 1
+            entry = await self._lookup(host)
+        elif not entry.addresses:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+            if now >= entry.refresh_at and not entry.refreshing:
+                self._refresh(host, entry)
+        if not entry.addresses:
+            raise socket.gaierror(socket.EAI_NONAME, f"Name does not resolve: {host}")
+        return entry
+
+    async def _lookup(self, host: str) -> _DNSEntry:
+        """
+        Single-flight lookup: concurrent misses share one query.
+
+        The query runs as its own task, so a cancelled caller does not cancel
+        it for the others waiting on the same name.
+        """
+        inflight = self._inflight.get(host)
+        if inflight is None or inflight.get_loop() is not asyncio.get_running_loop():
+            inflight = self._inflight[host] = asyncio.ensure_future(self._lookup_shared(host))
+        return await asyncio.shield(inflight)
+
+    async def _lookup_shared(self, host: str) -> _DNSEntry:
+        try:
+            addresses, ttl = await self._query(host)
+            entry = _DNSEntry(addresses, ttl, time.monotonic())
+            self._entries[host] = entry
+            return entry
+        finally:
+            self._inflight.pop(host, None)
+
+    def _refresh(self, host: str, entry: _DNSEntry) -> None:
+        entry.refreshing = True
+        self.refreshes += 1
+
+        async def refresh() -> None:
+            try:
+                addresses, ttl = await self._query(host)
+            except Exception:
+                addresses, ttl = (), self.negative_ttl
+            now = time.monotonic()
+            if addresses or now >= entry.expires:
+                self._entries[host] = _DNSEntry(addresses, ttl, now)
+            else:
+                # Keep serving the last good answer until it expires, and
+                # back off so every hit does not start another query
+                entry.refresh_at = now + self.negative_ttl
+                entry.refreshing = False
+
+        task = asyncio.create_task(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _query(self, host: str) -> Tuple[Tuple[str, ...], float]:
+        """Resolve `host`; returns (addresses, ttl), empty for a failed lookup."""
+        for nameserver in self.nameservers:
+            try:
+                addresses, ttl = await asyncio.wait_for(self._query_nameserver(nameserver, host), self.timeout)
+            except (OSError, ValueError, struct.error, IndexError, asyncio.TimeoutError):
+                continue
+            if addresses:
+                return tuple(dict.fromkeys(addresses)), max(DNS_MIN_TTL, ttl if ttl is not None else self.default_ttl)
+            break  # The nameserver answered; let getaddrinfo try hosts and search domains
+
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await loop.getaddrinfo(host, None, family=socket.AF_INET, type=socket.SOCK_STREAM)
+        except socket.gaierror:
+            return (), self.negative_ttl
+        return tuple(dict.fromkeys(info[4][0] for info in infos)), self.default_ttl
+
+    async def _query_nameserver(self, nameserver: str, host: str) -> Tuple[List[str], Optional[int]]:
+        loop = asyncio.get_running_loop()
+        query_id = int.from_bytes(os.urandom(2), "big")
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.setblocking(False)
+            sock.connect((nameserver, 53))
+            await loop.sock_sendall(sock, _build_query(host, query_id))
+            while True:
+                data = await loop.sock_recv(sock, 4096)
+                try:
+                    rcode, addresses, ttl = _parse_response(data, query_id)
+                except ValueError:
+                    continue  # Stray datagram for another query id
+                return (addresses if rcode == 0 else []), ttl
+
+
+_dns_cache: Optional[DNSCache] = None
+
+
+def get_dns_cache() -> DNSCache:
+    """Get the process-wide DNS cache."""
+    global _dns_cache
+    if _dns_cache is None:
+        _dns_cache = DNSCache()
+    return _dns_cache
+
+
 async def get_service_info(
     slug: str,
     *,
@@ -172,12 +465,16 @@ async def get_service_info(
         )
 
     # 2. Fallback to DNS-based URL
-    fallback_url = _fallback_dns_url(slug, default_port)
+    return _fallback_service_info(slug, slug, default_port)
+
+
+def _fallback_service_info(slug: str, host: str, default_port: int) -> ServiceInfo:
+    """ServiceInfo for a Docker-DNS fallback reached at `host` (the slug or a resolved address)."""
     return ServiceInfo(
         slug=slug,
         name=f"{slug} (fallback)",
         description=f"Service resolved via Docker DNS fallback",
-        health_check_url=fallback_url,
+        health_check_url=_fallback_dns_url(host, default_port),
         default_port=default_port,
         tier=ServiceTier.API,
     )
@@ -188,6 +485,7 @@ async def get_service_url(
     *,
     default_port: int = 80,
     use_base_url: bool = True,
+    resolve: bool = False,
 ) -> str:
     """
     Resolve service URL with fallback chain.
@@ -196,15 +494,28 @@ async def get_service_url(
         slug: Service slug to resolve
         default_port: Port for fallback URL construction
         use_base_url: Return base URL instead of health_check_url
+        resolve: For Docker-DNS fallback URLs, substitute an address from
+            the DNS cache so connecting does not wait on getaddrinfo
 
     Returns:
         Resolved service URL
 
+    Raises:
+        ServiceNotFoundError: If `resolve` is set and the fallback name
+            does not resolve
+
     Example:
         >>> await get_service_url("hirag-v2")
         "http://hi-rag-gateway-v2:8086"
     """
-    info = await get_service_info(slug, default_port=default_port)
+    if resolve and _get_env_url(slug) is None:
+        try:
+            address = await get_dns_cache().resolve_one(slug)
+        except socket.gaierror as e:
+            raise ServiceNotFoundError(slug, f"Service '{slug}' does not resolve via Docker DNS: {e}") from e
+        info = _fallback_service_info(slug, address, default_port)
+    else:
+        info = await get_service_info(slug, default_port=default_port)
     return info.base_url if use_base_url else info.health_check_url
 
 
@@ -217,6 +528,10 @@ async def check_service_health(
     """
     Check if a service is healthy by calling its health endpoint.
 
+    Docker-DNS fallback names are resolved through the DNS cache, so a
+    probe connects to a cached address instead of waiting on getaddrinfo;
+    a name that does not resolve is unhealthy without a request.
+
     Args:
         slug: Service slug to check
         default_port: Port for fallback URL construction
@@ -228,10 +543,19 @@ async def check_service_health(
     import httpx
 
     info = await get_service_info(slug, default_port=default_port)
+    url = info.health_check_url
+    headers = None
+    if _get_env_url(slug) is None:
+        try:
+            address = await get_dns_cache().resolve_one(slug)
+        except socket.gaierror:
+            return False
+        url = _fallback_dns_url(address, default_port)
+        headers = {"Host": f"{slug}:{default_port}"}
 
     try:
         async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.get(info.health_check_url)
+            response = await client.get(url, headers=headers)
             return response.status_code == 200
     except Exception:
         return False
@@ -0,0 +1,198 @@
+"""
+PMOVES.AI Cross-Worker Shared State
+
+Lets the worker processes of one service (uvicorn --workers N, gunicorn)
+share a single copy of state that is expensive to produce, such as health
+probe results or the announcement catalog. One worker holds a file lock and
+becomes the leader; it alone produces the state and writes it into an
+mmap-backed region. The other workers read the region without locks.
+
+This module provides:
+- SharedRegion: Single-writer, many-reader mmap region guarded by a seqlock
+- LeaderLock: Non-blocking leader election through flock()
+- shared_path(): Location of the lock and region files for a name
+
+Failover:
+The lock is held for the life of the leader process and released by the
+kernel when it exits, so followers that keep calling `try_acquire()` take
+over from a crashed leader.
+
+Region Layout:
+    [seq: u64][length: u32][reserved: u32][payload: length bytes]
+
+The writer makes `seq` odd while it writes and even again afterwards;
+readers retry until they see the same even `seq` before and after copying
+the payload. `version` is seq // 2, so readers can skip decoding when
+nothing changed.
+
+Usage:
+    from pmoves_shared import LeaderLock, SharedRegion
+
+    lock = LeaderLock("my-service-health")
+    region = SharedRegion("my-service-health")
+    if lock.try_acquire():
+        region.write(b'{"status":"healthy"}')
+    payload = region.read()
+
+Environment Variables:
+    SHARED_STATE_DIR: Directory for lock and region files
+        (defaults to /dev/shm, or the temp directory without it)
+"""
+
+import os
+import struct
+import tempfile
+from typing import Optional, Tuple
+
+SHARED_REGION_SIZE = 4 * 1024 * 1024
+_HEADER = struct.Struct("<QII")
+_SEQ = struct.Struct("<Q")
+_READ_ATTEMPTS = 1000
+
+
+def shared_path(name: str, suffix: str) -> str:
+    """Path of the shared file `pmoves-<name>.<suffix>`."""
+    directory = os.getenv("SHARED_STATE_DIR")
+    if not directory:
+        directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+    return os.path.join(directory, f"pmoves-{safe}.{suffix}")
+
+
+class LeaderLock:
+    """
+    Leader election among the processes sharing a name.
+
+    Example:
+        lock = LeaderLock("hirag-v2-health")
+        if lock.try_acquire():
+            ...  # this process does the shared work
+    """
+
+    def __init__(self, name: str, path: Optional[str] = None):
+        """
+        Args:
+            name: Name shared by the competing processes
+            path: Lock file (defaults to shared_path(name, "lock"))
+        """
+        self.path = path or shared_path(name, "lock")
+        self._fd: Optional[int] = None
+
+    @property
+    def is_leader(self) -> bool:
+        """True while this process holds the lock."""
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        """Take the lock if no other process holds it; never blocks."""
+        import fcntl
+
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        """Give up leadership."""
+        if self._fd is not None:
+            os.close(self._fd)  # Closing the descriptor drops the flock
+            self._fd = None
+
+
+class SharedRegion:
+    """
+    Memory-mapped region with one writer and lock-free readers.
+
+    Example:
+        region = SharedRegion("hirag-v2-catalog")
+        region.write(payload)          # leader
+        version, payload = region.read_versioned()   # any worker
+    """
+
+    def __init__(self, name: str, size: int = SHARED_REGION_SIZE, path: Optional[str] = None):
+        """
+        Args:
+            name: Name shared by the processes using the region
+            size: Payload capacity in bytes
+            path: Region file (defaults to shared_path(name, "state"))
+        """
+        import mmap
+
+        self.path = path or shared_path(name, "state")
+        self.size = size
+        total = _HEADER.size + size
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size < total:
+                os.ftruncate(fd, total)
+            self._map = mmap.mmap(fd, total)
+        finally:
+            os.close(fd)
+
+    @property
+    def version(self) -> int:
+        """Number of completed writes; cheap enough to poll."""
+        return _SEQ.unpack_from(self._map, 0)[0] // 2
+
+    def write(self, payload: bytes) -> int:
+        """
+        Publish a payload (leader only).
+
+        Returns:
+            The new version
+
+        Raises:
+            ValueError: If the payload does not fit the region
+        """
+        if len(payload) > self.size:
+            raise ValueError(f"payload of {len(payload)} bytes exceeds region size {self.size}")
+        seq = _SEQ.unpack_from(self._map, 0)[0]
+        seq += 1 if seq % 2 == 0 else 0  # A writer that died mid-write left seq odd
+        _SEQ.pack_into(self._map, 0, seq)
+        self._map[_HEADER.size:_HEADER.size + len(payload)] = payload
+        _HEADER.pack_into(self._map, 0, seq + 1, len(payload), 0)
+        return (seq + 1) // 2
+
+    def clear(self) -> int:
+        """Publish "no state yet" (a new leader before its first write)."""
+        seq = _SEQ.unpack_from(self._map, 0)[0]
+        seq += 2 if seq % 2 == 0 else 1
+        _HEADER.pack_into(self._map, 0, seq, 0, 0)
+        return seq // 2
+
+    def read_versioned(self) -> Tuple[int, Optional[bytes]]:
+        """
+        Copy out the current payload.
+
+        Returns:
+            (version, payload), payload None if nothing has been written
+
+        Raises:
+            RuntimeError: If no consistent copy could be taken
+        """
+        mapped = self._map
+        for _ in range(_READ_ATTEMPTS):
+            seq, length, _ = _HEADER.unpack_from(mapped, 0)
+            if seq % 2:
+                continue  # Write in progress
+            payload = mapped[_HEADER.size:_HEADER.size + min(length, self.size)]
+            if _SEQ.unpack_from(mapped, 0)[0] == seq:
+                return seq // 2, (payload if length else None)
+        raise RuntimeError(f"shared region {self.path} is being rewritten continuously")
+
+    def read(self) -> Optional[bytes]:
+        """Copy out the current payload, None if nothing has been written."""
+        return self.read_versioned()[1]
+
+    def close(self) -> None:
+        """Unmap the region."""
+        self._map.close()
+
+
+__all__ = ["LeaderLock", "SHARED_REGION_SIZE", "SharedRegion", "shared_path"]
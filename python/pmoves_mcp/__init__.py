@@ -3,18 +3,52 @@ PMOVES MCP Adapters for Archon
 
 This module provides MCP (Model Context Protocol) adapters for Archon
 to interact with PMOVES services through Agent Zero.
+
+Exports are resolved lazily (PEP 562), so `import pmoves_mcp` does not
+import the adapter or httpx until one of the names below is used.
 """
 
-from .claude_code_adapter import (
-    ClaudeCodeMCPAdapter,
-    CommandResult,
-    ARCHON_MCP_TOOLS,
-    create_adapter,
-)
-
-__all__ = [
-    "ClaudeCodeMCPAdapter",
-    "CommandResult",
-    "ARCHON_MCP_TOOLS",
-    "create_adapter",
-]
+from importlib import import_module
+from typing import Any
+
+_EXPORTS = {
+    "ClaudeCodeMCPAdapter": ".claude_code_adapter",
+    "CommandResult": ".claude_code_adapter",
+    "CommandRequest": ".claude_code_adapter",
+    "ARCHON_MCP_TOOLS": ".claude_code_adapter",
+    "create_adapter": ".claude_code_adapter",
+    "CompiledTool": ".claude_code_adapter",
+    "TOOL_INDEX": ".claude_code_adapter",
+    "compile_tools": ".claude_code_adapter",
+    "CacheStats": ".result_cache",
+    "ResultCache": ".result_cache",
+    "HTTPTransport": ".transports",
+    "NATSTransport": ".transports",
+    "Transport": ".transports",
+    "TransportError": ".transports",
+    "TransportTimeout": ".transports",
+    "RequestTrace": ".tracing",
+    "current_traceparent": ".tracing",
+    "parse_server_timing": ".tracing",
+    "CommandScheduler": ".scheduling",
+    "ScheduleRule": ".scheduling",
+    "CommandPolicy": ".policies",
+    "LatencyTracker": ".policies",
+    "RequestStats": ".policies",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
+
+
+__all__ = list(_EXPORTS)
@@ -10,20 +10,154 @@ This adapter enables Archon to:
 - Access PMOVES infrastructure programmatically
 """
 
-import httpx
+import asyncio
 import json
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+import time
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Dict, Any, List, Optional, Sequence, Set, Tuple, Union
+from dataclasses import dataclass, replace
+
+from .policies import (
+    DEFAULT_COMMAND_POLICIES,
+    CommandPolicy,
+    LatencyTracker,
+    RequestStats,
+    backoff_delay,
+    resolve_policy,
+)
+from .result_cache import ResultCache
+from .scheduling import CommandScheduler
+from .transports import (
+    MCP_EXECUTE_SUBJECT,
+    UNSUPPORTED_STATUSES,
+    HTTPTransport,
+    NATSTransport,
+    Transport,
+    TransportError,
+    TransportTimeout,
+)
+from .tracing import RequestTrace, new_trace_id, numeric_timings, parse_server_timing
+
+# httpx is imported on first request so that importing the adapter (e.g. for
+# CommandResult or ARCHON_MCP_TOOLS) does not pay for the HTTP stack.
+if TYPE_CHECKING:
+    import httpx
 
 
 @dataclass
 class CommandResult:
-    """Result from a Claude Code command execution."""
+    """
+    Result from a Claude Code command execution.
+
+    `timings` holds the adapter-side phases in milliseconds (queue, connect,
+    ttfb, body, decode, total; see pmoves_mcp.tracing) and `server_timings`
+    what Agent Zero reported through Server-Timing or a `timings` reply field.
+    `trace_id` is the W3C trace id sent to Agent Zero.
+    """
     success: bool
     output: Any
     stderr: Optional[str] = None
     error: Optional[str] = None
     command: Optional[str] = None
+    partial: bool = False
+    trace_id: Optional[str] = None
+    timings: Optional[Dict[str, float]] = None
+    server_timings: Optional[Dict[str, float]] = None
+
+
+# Upper bound on a single streamed record (NDJSON line or SSE event)
+STREAM_MAX_RECORD_BYTES = 1024 * 1024
+
+
+@dataclass
+class CommandRequest:
+    """A single slash command invocation for batch execution."""
+    command: str
+    prompt: Optional[str] = None
+    context: Optional[Dict[str, Any]] = None
+
+
+CommandLike = Union[CommandRequest, str, Tuple[Any, ...]]
+
+
+def _as_request(item: CommandLike) -> CommandRequest:
+    """Normalize a command string, tuple or CommandRequest."""
+    if isinstance(item, CommandRequest):
+        return item
+    if isinstance(item, str):
+        return CommandRequest(item)
+    return CommandRequest(*item)
+
+
+def _parse_command_result(data: Dict[str, Any]) -> CommandResult:
+    """Build a CommandResult from an Agent Zero execute_command response."""
+    return CommandResult(
+        success=data.get("success", False),
+        output=data.get("output") or data.get("stdout"),
+        stderr=data.get("stderr"),
+        error=data.get("error"),
+        command=data.get("command"),
+        server_timings=numeric_timings(data.get("timings")) or None
+    )
+
+
+def _with_trace(result: CommandResult, trace: Optional[RequestTrace]) -> CommandResult:
+    """Attach a request's trace id and timings to its result."""
+    if trace is not None:
+        result.trace_id = trace.trace_id
+        result.timings = trace.timings()
+        if trace.server:
+            result.server_timings = {**trace.server, **(result.server_timings or {})}
+    return result
+
+
+def _from_cache(result: CommandResult, started: float) -> CommandResult:
+    """
+    Copy of a cached result for one caller, with its own trace id and timings.
+
+    The cached object keeps the trace of the request that loaded it and is
+    never modified, since other callers may hold it.
+    """
+    elapsed = (time.perf_counter() - started) * 1000.0
+    return replace(
+        result,
+        trace_id=new_trace_id(),
+        timings={"cache": elapsed, "total": elapsed},
+        server_timings=dict(result.server_timings) if result.server_timings else None
+    )
+
+
+def _parse_stream_fragment(data: Dict[str, Any], command: str) -> CommandResult:
+    """Build a CommandResult fragment from one streamed record."""
+    done = bool(data.get("done", False))
+    return CommandResult(
+        success=data.get("success", not data.get("error")) if done else True,
+        output=data.get("output") or data.get("stdout"),
+        stderr=data.get("stderr"),
+        error=data.get("error"),
+        command=data.get("command") or command,
+        partial=not done
+    )
+
+
+async def _iter_lines_bounded(
+    response: "httpx.Response",
+    max_record_bytes: int
+) -> AsyncIterator[bytes]:
+    """Split a streamed body into lines, refusing lines over max_record_bytes."""
+    buffer = bytearray()
+    async for chunk in response.aiter_bytes():
+        buffer += chunk
+        while True:
+            newline = buffer.find(b"\n")
+            if newline < 0:
+                break
+            line = bytes(buffer[:newline]).rstrip(b"\r")
+            del buffer[:newline + 1]
+            yield line
+        if len(buffer) > max_record_bytes:
+            raise ValueError(f"Streamed record exceeds {max_record_bytes} bytes")
+    if buffer:
+        yield bytes(buffer).rstrip(b"\r")
 
 
 class ClaudeCodeMCPAdapter:
@@ -32,24 +166,73 @@ class ClaudeCodeMCPAdapter:
     def __init__(
         self,
         agent_zero_url: str = "http://agent-zero:8080",
-        timeout: float = 30.0
+        timeout: float = 30.0,
+        max_concurrency: int = 8,
+        server_batching: Optional[bool] = False,
+        batch_size: int = 16,
+        cache: Optional[ResultCache] = None,
+        policies: Optional[Dict[str, CommandPolicy]] = None,
+        transport: Optional[Transport] = None,
+        scheduler: Optional[CommandScheduler] = None
     ):
+        """
+        Args:
+            agent_zero_url: Base URL of Agent Zero
+            timeout: HTTP timeout in seconds
+            max_concurrency: Default concurrency bound for execute_many
+            server_batching: Send several commands per request via the
+                execute_batch action (opt-in; Agent Zero must implement it).
+                None probes support on first use; a probe that fails in
+                any way disables batching and falls back to one request
+                per command.
+            batch_size: Maximum commands per server-side batch
+            cache: Result cache for read-only commands (None disables caching)
+            policies: Per-command timeout/retry/hedge policy overrides merged
+                over DEFAULT_COMMAND_POLICIES. Commands without a policy use
+                `timeout` and a single attempt.
+            transport: Request transport for execute, batch, listing and
+                help requests (defaults to HTTP POST to agent_zero_url).
+                Streaming commands always use HTTP.
+            scheduler: Admission control for requests (defaults to a
+                CommandScheduler with DEFAULT_SCHEDULE_RULES)
+        """
         self.agent_zero_url = agent_zero_url
         self.timeout = timeout
-        self._client: Optional[httpx.AsyncClient] = None
+        self.max_concurrency = max_concurrency
+        self.server_batching = server_batching
+        self.batch_size = batch_size
+        self.cache = cache
+        self.policies = {**DEFAULT_COMMAND_POLICIES, **(policies or {})}
+        self.latency = LatencyTracker()
+        self.request_stats = RequestStats()
+        self._default_policy = CommandPolicy(timeout, min(1.0, timeout), timeout)
+        self._http = HTTPTransport(agent_zero_url, timeout)
+        self.transport = transport or self._http
+        self.scheduler = scheduler or CommandScheduler()
+        self._tools: Optional[Dict[str, Tuple[Callable[..., Any], Callable[[Any], Optional[str]]]]] = None
 
     @property
-    def client(self) -> httpx.AsyncClient:
+    def client(self) -> "httpx.AsyncClient":
         """Lazy initialization of async client."""
-        if self._client is None:
-            self._client = httpx.AsyncClient(timeout=self.timeout)
-        return self._client
+        return self._http.client
 
     async def close(self):
-        """Close the HTTP client."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        """Close the transport and the HTTP client."""
+        if self.transport is not self._http:
+            await self.transport.close()
+        await self._http.close()
+
+    @staticmethod
+    def _command_params(
+        command: str,
+        prompt: Optional[str],
+        context: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        return {
+            "command": command,
+            "prompt": prompt,
+            "context": context or {}
+        }
 
     async def execute_slash_command(
         self,
@@ -68,79 +251,623 @@ class ClaudeCodeMCPAdapter:
         Returns:
             CommandResult with output or error
         """
+        ttl = self.cache.ttl_for(command) if self.cache else None
+        if ttl is None:
+            return await self._post_command(command, prompt, context)
+        started = time.perf_counter()
+        loaded: List[CommandResult] = []
+
+        async def load() -> CommandResult:
+            loaded.append(await self._post_command(command, prompt, context))
+            return loaded[0]
+
+        result = await self.cache.get_or_load(
+            self._cache_key(command, prompt, context),
+            ttl,
+            load,
+            should_store=lambda result: result.success
+        )
+        # Cache hits and coalesced callers get their own copy
+        return result if loaded else _from_cache(result, started)
+
+    @staticmethod
+    def _cache_key(
+        command: str,
+        prompt: Optional[str],
+        context: Optional[Dict[str, Any]]
+    ) -> Tuple[str, Optional[str], str]:
+        return (command, prompt, json.dumps(context or {}, sort_keys=True, default=str))
+
+    async def _post_command(
+        self,
+        command: str,
+        prompt: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None
+    ) -> CommandResult:
+        """Send one execute_command request to Agent Zero (uncached)."""
         payload = {
             "instrument": "claude_code",
             "action": "execute_command",
-            "params": {
-                "command": command,
-                "prompt": prompt,
-                "context": context or {}
-            }
+            "params": self._command_params(command, prompt, context)
         }
 
+        data, error, trace = await self._call(command, payload)
+        if error is not None:
+            return _with_trace(CommandResult(success=False, output=None, error=error), trace)
+        return _with_trace(_parse_command_result(data), trace)
+
+    # Request policies: adaptive timeouts, retries and hedging
+
+    async def _send(
+        self,
+        payload: Dict[str, Any],
+        timeout: float,
+        trace: Optional[RequestTrace] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str], bool]:
+        """
+        Make one attempt over the transport.
+
+        Returns:
+            (data, error, retryable) where error is None on success
+        """
         try:
-            response = await self.client.post(
-                f"{self.agent_zero_url}/mcp/execute",
-                json=payload
-            )
-            response.raise_for_status()
-            data = response.json()
+            return await self.transport.request(payload, timeout, trace), None, False
+        except TransportTimeout as e:
+            self.request_stats.timeouts += 1
+            return None, str(e), True
+        except TransportError as e:
+            return None, str(e), e.retryable
+        except Exception as e:
+            return None, str(e), False
 
-            return CommandResult(
-                success=data.get("success", False),
-                output=data.get("output") or data.get("stdout"),
-                stderr=data.get("stderr"),
-                command=data.get("command")
-            )
+    async def _timed_send(
+        self,
+        name: str,
+        payload: Dict[str, Any],
+        timeout: float,
+        trace_id: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str], bool, RequestTrace]:
+        trace = RequestTrace(trace_id)
+        queued = time.perf_counter()
+        async with self.scheduler.slot(name):
+            # Latency excludes the scheduler queue: it drives adaptive timeouts
+            started = trace.since("queue", queued)
+            data, error, retryable = await self._send(payload, timeout, trace)
+        if error is None:
+            self.latency.record(name, time.perf_counter() - started)
+        return data, error, retryable, trace
+
+    async def _send_hedged(
+        self,
+        name: str,
+        payload: Dict[str, Any],
+        timeout: float,
+        delay: float,
+        trace_id: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str], bool, RequestTrace]:
+        """Send a request and a hedge after `delay`; return the first success."""
+        primary = asyncio.create_task(self._timed_send(name, payload, timeout, trace_id))
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+
+            self.request_stats.hedges += 1
+            hedge = asyncio.create_task(self._timed_send(name, payload, timeout, trace_id))
+            pending = {primary, hedge}
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    outcome = task.result()
+                    if outcome[1] is None or not pending:
+                        if task is hedge and outcome[1] is None:
+                            self.request_stats.hedge_wins += 1
+                        return outcome
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _policy(self, name: str) -> CommandPolicy:
+        return resolve_policy(name, self.policies, self._default_policy)
+
+    async def _call(
+        self,
+        name: str,
+        payload: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str], Optional[RequestTrace]]:
+        """
+        Send a request under the command's policy.
+
+        The timeout adapts to observed latency, idempotent commands are
+        retried with jittered backoff on timeouts, transport errors and
+        5xx/429 responses, and hedged commands send a second request once
+        the first has run longer than the observed p95.
+
+        Every attempt joins one trace (the caller's, see
+        tracing.current_traceparent, or a new one).
+
+        Returns:
+            (data, error, trace) where error is None on success and trace
+            holds the timings of the attempt that produced the outcome, with
+            `total` covering the whole call
+        """
+        policy = self._policy(name)
+        attempts = max(1, policy.max_attempts) if policy.idempotent else 1
+        trace_id = new_trace_id()
+        started = time.perf_counter()
+
+        for attempt in range(attempts):
+            timeout = self.latency.timeout_for(name, policy)
+            delay = self.latency.hedge_delay(name) if policy.hedge and policy.idempotent else None
+            if delay is not None and delay < timeout:
+                data, error, retryable, trace = await self._send_hedged(name, payload, timeout, delay, trace_id)
+            else:
+                data, error, retryable, trace = await self._timed_send(name, payload, timeout, trace_id)
+
+            if error is None or not retryable or attempt == attempts - 1:
+                trace.since("total", started)
+                return data, error, trace
+            self.request_stats.retries += 1
+            await asyncio.sleep(backoff_delay(attempt))
+        return None, "No attempts made", None
+
+    # Streaming execution
+
+    async def stream_slash_command(
+        self,
+        command: str,
+        prompt: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        *,
+        max_record_bytes: int = STREAM_MAX_RECORD_BYTES
+    ) -> AsyncIterator[CommandResult]:
+        """
+        Execute a slash command and yield its output incrementally.
+
+        Agent Zero may answer with NDJSON (`application/x-ndjson`) or SSE
+        (`text/event-stream`). Each record is a JSON object with `output`
+        (or `stdout`), optional `stderr`/`error`, and `done: true` on the
+        final record. A plain JSON response from a server without streaming
+        support is yielded as a single final result.
+
+        Records are read as the consumer iterates, so at most one record of
+        up to `max_record_bytes` is buffered at a time.
+
+        Args:
+            command: Slash command (e.g., "/search:deepresearch", "/deploy:up")
+            prompt: Optional prompt/query for the command
+            context: Additional context for execution
+            max_record_bytes: Maximum size of a single streamed record
+
+        Yields:
+            CommandResult fragments with partial=True, then one final
+            CommandResult with partial=False
+
+        Example:
+            async for fragment in adapter.stream_slash_command("/deploy:up"):
+                print(fragment.output, end="")
+        """
+        payload = {
+            "instrument": "claude_code",
+            "action": "execute_command",
+            "params": {**self._command_params(command, prompt, context), "stream": True}
+        }
+        trace = RequestTrace()
+        headers = {
+            "Accept": "application/x-ndjson, text/event-stream, application/json",
+            "traceparent": trace.traceparent
+        }
+        import httpx
+
+        def traced(fragment: CommandResult) -> CommandResult:
+            # Fragments carry the trace id; the final result also the timings
+            if fragment.partial:
+                fragment.trace_id = trace.trace_id
+                return fragment
+            trace.since("total", started)
+            return _with_trace(fragment, trace)
+
+        finished = False
+        started = time.perf_counter()
+        try:
+            async with self.scheduler.slot(command):
+                sent = trace.since("queue", started)
+                async with self.client.stream(
+                    "POST",
+                    f"{self.agent_zero_url}/mcp/execute",
+                    json=payload,
+                    headers=headers
+                ) as response:
+                    # Connect and TTFB are not separated here: both count as ttfb
+                    sent = trace.since("ttfb", sent)
+                    trace.server.update(parse_server_timing(response.headers.get("server-timing")))
+                    response.raise_for_status()
+                    content_type = response.headers.get("content-type", "")
+
+                    if "text/event-stream" in content_type:
+                        records = self._iter_sse_records(response, max_record_bytes)
+                    elif "ndjson" in content_type or "jsonl" in content_type:
+                        records = self._iter_ndjson_records(response, max_record_bytes)
+                    else:
+                        body = await response.aread()
+                        decoding = trace.since("body", sent)
+                        data = json.loads(body)
+                        trace.since("decode", decoding)
+                        finished = True
+                        yield traced(_parse_command_result(data))
+                        return
+
+                    async for record in records:
+                        fragment = _parse_stream_fragment(record, command)
+                        finished = not fragment.partial
+                        if finished:
+                            trace.since("body", sent)
+                        yield traced(fragment)
+                        if finished:
+                            return
         except httpx.HTTPStatusError as e:
-            return CommandResult(
+            finished = True
+            yield traced(CommandResult(
                 success=False,
                 output=None,
-                error=f"HTTP error: {e.response.status_code}"
-            )
+                error=f"HTTP error: {e.response.status_code}",
+                command=command
+            ))
         except Exception as e:
+            finished = True
+            yield traced(CommandResult(success=False, output=None, error=str(e), command=command))
+
+        if not finished:
+            yield traced(CommandResult(
+                success=False,
+                output=None,
+                error="Stream ended without a final result",
+                command=command
+            ))
+
+    @staticmethod
+    async def _iter_ndjson_records(
+        response: "httpx.Response",
+        max_record_bytes: int
+    ) -> AsyncIterator[Dict[str, Any]]:
+        async for line in _iter_lines_bounded(response, max_record_bytes):
+            if line.strip():
+                yield json.loads(line)
+
+    @staticmethod
+    async def _iter_sse_records(
+        response: "httpx.Response",
+        max_record_bytes: int
+    ) -> AsyncIterator[Dict[str, Any]]:
+        event = "message"
+        data: List[bytes] = []
+        size = 0
+        async for line in _iter_lines_bounded(response, max_record_bytes):
+            if not line:
+                if data:
+                    record = json.loads(b"\n".join(data))
+                    if event == "error":
+                        record = {"done": True, "success": False, **record}
+                    yield record
+                event, data, size = "message", [], 0
+            elif line.startswith(b"data:"):
+                value = line[5:].lstrip(b" ")
+                size += len(value)
+                if size > max_record_bytes:
+                    raise ValueError(f"Streamed record exceeds {max_record_bytes} bytes")
+                data.append(value)
+            elif line.startswith(b"event:"):
+                event = line[6:].strip().decode()
+        if data:
+            yield json.loads(b"\n".join(data))
+
+    # Batch execution
+
+    async def _execute_with_timeout(
+        self,
+        request: CommandRequest,
+        timeout: Optional[float]
+    ) -> CommandResult:
+        """Execute one command, converting a timeout into a failed result."""
+        try:
+            return await asyncio.wait_for(
+                self.execute_slash_command(request.command, request.prompt, request.context),
+                timeout
+            )
+        except asyncio.TimeoutError:
             return CommandResult(
                 success=False,
                 output=None,
-                error=str(e)
+                error=f"Timed out after {timeout}s",
+                command=request.command
+            )
+
+    async def _execute_batch(
+        self,
+        requests: Sequence[CommandRequest],
+        timeout: Optional[float]
+    ) -> Optional[List[Optional[CommandResult]]]:
+        """
+        Execute several commands in one execute_batch request.
+
+        All requests must share a scheduler batch group: the batch holds one
+        slot (and one token) of their rule per command.
+
+        Returns None when Agent Zero does not support batching (or a probe
+        for it failed), so the caller can fall back to individual requests.
+        When a batch fails otherwise, idempotent commands come back as None
+        and are re-sent individually under their own policy; the others get
+        the failure, since Agent Zero may already have run them.
+        """
+        payload = {
+            "instrument": "claude_code",
+            "action": "execute_batch",
+            "params": {
+                "commands": [
+                    self._command_params(r.command, r.prompt, r.context) for r in requests
+                ]
+            }
+        }
+        trace = RequestTrace()
+        started = time.perf_counter()
+
+        async def send() -> Any:
+            async with self.scheduler.slot(requests[0].command, len(requests)):
+                trace.since("queue", started)
+                return await self.transport.request(payload, self.timeout if timeout is None else timeout, trace)
+
+        try:
+            data = await asyncio.wait_for(send(), timeout)
+            results = data.get("results") if isinstance(data, dict) else None
+            if not isinstance(results, list) or len(results) != len(requests):
+                self.server_batching = False
+                return None
+            self.server_batching = True
+            trace.since("total", started)
+            # Every result of the batch shares the request's trace and timings
+            return [_with_trace(_parse_command_result(r), trace) for r in results]
+        except asyncio.TimeoutError:
+            error = f"Timed out after {timeout}s"
+        except TransportError as e:
+            if e.status in UNSUPPORTED_STATUSES:
+                self.server_batching = False
+                return None
+            error = str(e)
+        except Exception as e:
+            error = str(e)
+        if self.server_batching is None:
+            self.server_batching = False  # Only a confirmed batch endpoint is used again
+            return None
+        trace.since("total", started)
+        return [
+            None if self._policy(r.command).idempotent else
+            _with_trace(CommandResult(success=False, output=None, error=error, command=r.command), trace)
+            for r in requests
+        ]
+
+    async def execute_many_as_completed(
+        self,
+        commands: Sequence[CommandLike],
+        *,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[Tuple[int, CommandResult]]:
+        """
+        Execute many slash commands concurrently, yielding results as they finish.
+
+        Concurrency is bounded by a semaphore. When server-side batching is
+        enabled (or being probed), commands in the same scheduler batch group
+        are grouped into execute_batch requests of up to `batch_size`, further
+        limited by the rule's cap and burst; each batch counts as one
+        semaphore slot but one scheduler slot per command.
+
+        Args:
+            commands: Command strings, (command, prompt[, context]) tuples
+                or CommandRequest objects
+            max_concurrency: In-flight request bound (defaults to the adapter's)
+            timeout: Per-request timeout in seconds (None for no extra timeout)
+
+        Yields:
+            (index, CommandResult) pairs in completion order, where index is
+            the position of the command in `commands`
+        """
+        requests = [_as_request(c) for c in commands]
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        queue: asyncio.Queue = asyncio.Queue()
+        settled: Set[int] = set()
+
+        def deliver(pairs: List[Tuple[int, CommandResult]]) -> None:
+            # Each index is reported exactly once, even if a task is cancelled mid-way
+            pairs = [(i, result) for i, result in pairs if i not in settled]
+            settled.update(i for i, _ in pairs)
+            if pairs:
+                queue.put_nowait(pairs)
+
+        def cancelled(indexes: List[int]) -> None:
+            deliver([
+                (i, CommandResult(success=False, output=None, error="Cancelled", command=requests[i].command))
+                for i in indexes
+            ])
+
+        # Serve cached results immediately; only misses go to Agent Zero
+        pending: List[int] = []
+        for index, request in enumerate(requests):
+            if self.cache and self.cache.ttl_for(request.command) is not None:
+                started = time.perf_counter()
+                found, cached = self.cache.get(
+                    self._cache_key(request.command, request.prompt, request.context)
+                )
+                if found:
+                    deliver([(index, _from_cache(cached, started))])
+                    continue
+            pending.append(index)
+
+        async def run_single(index: int) -> None:
+            try:
+                async with semaphore:
+                    result = await self._execute_with_timeout(requests[index], timeout)
+            except asyncio.CancelledError:
+                cancelled([index])
+                raise
+            deliver([(index, result)])
+
+        async def run_batch(indexes: List[int]) -> None:
+            try:
+                async with semaphore:
+                    results = None
+                    if self.server_batching is not False:
+                        results = await self._execute_batch([requests[i] for i in indexes], timeout)
+                if results is None:
+                    await asyncio.gather(*(run_single(i) for i in indexes))
+                    return
+                retry = [i for i, result in zip(indexes, results) if result is None]
+                done = [(i, result) for i, result in zip(indexes, results) if result is not None]
+                if self.cache:
+                    for i, result in done:
+                        ttl = self.cache.ttl_for(requests[i].command)
+                        if ttl is not None and result.success:
+                            r = requests[i]
+                            self.cache.put(self._cache_key(r.command, r.prompt, r.context), result, ttl)
+                deliver(done)
+                await asyncio.gather(*(run_single(i) for i in retry))
+            except asyncio.CancelledError:
+                cancelled(indexes)
+                raise
+
+        tasks = []
+        if self.server_batching is not False and len(pending) > 1:
+            groups: Dict[str, List[int]] = {}
+            for i in pending:
+                groups.setdefault(self.scheduler.batch_group(requests[i].command), []).append(i)
+            for indexes in groups.values():
+                size = min(self.batch_size, self.scheduler.max_batch(requests[indexes[0]].command))
+                for start in range(0, len(indexes), size):
+                    chunk = indexes[start:start + size]
+                    task = run_batch(chunk) if len(chunk) > 1 else run_single(chunk[0])
+                    tasks.append(asyncio.create_task(task))
+        else:
+            tasks = [asyncio.create_task(run_single(i)) for i in pending]
+
+        remaining = len(requests)
+        try:
+            while remaining:
+                for item in await queue.get():
+                    remaining -= 1
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def execute_many(
+        self,
+        commands: Sequence[CommandLike],
+        *,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> List[CommandResult]:
+        """
+        Execute many slash commands concurrently and return results in order.
+
+        Args:
+            commands: Command strings, (command, prompt[, context]) tuples
+                or CommandRequest objects
+            max_concurrency: In-flight request bound (defaults to the adapter's)
+            timeout: Per-request timeout in seconds
+
+        Returns:
+            CommandResults in the same order as `commands`
+
+        Example:
+            results = await adapter.execute_many(
+                [("/search:hirag", q) for q in queries],
+                max_concurrency=8,
+                timeout=20.0
             )
+        """
+        results: List[Optional[CommandResult]] = [None] * len(commands)
+        async for index, result in self.execute_many_as_completed(
+            commands, max_concurrency=max_concurrency, timeout=timeout
+        ):
+            results[index] = result
+        return results
 
     async def list_available_commands(self) -> List[str]:
         """List all available Claude Code slash commands."""
+        ttl = self.cache.ttl_for("list_commands") if self.cache else None
+        if ttl is None:
+            return await self._fetch_commands()
+        return await self.cache.get_or_load(
+            ("list_commands",), ttl, self._fetch_commands, should_store=bool
+        )
+
+    async def _fetch_commands(self) -> List[str]:
         payload = {
             "instrument": "claude_code",
             "action": "list_commands"
         }
 
-        try:
-            response = await self.client.post(
-                f"{self.agent_zero_url}/mcp/execute",
-                json=payload
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("commands", [])
-        except Exception:
+        data, error, _ = await self._call("list_commands", payload)
+        if error is not None or not isinstance(data, dict):
             return []
+        return data.get("commands", [])
 
     async def get_command_help(self, command: str) -> Optional[str]:
         """Get help text for a specific command."""
+        ttl = self.cache.ttl_for("get_command_help") if self.cache else None
+        if ttl is None:
+            return await self._fetch_command_help(command)
+        return await self.cache.get_or_load(
+            ("get_command_help", command),
+            ttl,
+            lambda: self._fetch_command_help(command),
+            should_store=lambda help_text: help_text is not None
+        )
+
+    async def _fetch_command_help(self, command: str) -> Optional[str]:
         payload = {
             "instrument": "claude_code",
             "action": "get_command_help",
             "params": {"command": command}
         }
 
-        try:
-            response = await self.client.post(
-                f"{self.agent_zero_url}/mcp/execute",
-                json=payload
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("help")
-        except Exception:
+        data, error, _ = await self._call("get_command_help", payload)
+        if error is not None or not isinstance(data, dict):
             return None
+        return data.get("help")
+
+    # Tool dispatch
+
+    async def invoke_tool(self, name: str, params: Optional[Dict[str, Any]] = None) -> CommandResult:
+        """
+        Invoke an Archon MCP tool by name.
+
+        The tool is looked up in the precompiled TOOL_INDEX and its params
+        are validated locally; unknown tools and invalid params return a
+        failed CommandResult without a request to Agent Zero.
+
+        Args:
+            name: Tool name from ARCHON_MCP_TOOLS (e.g. "claude_code_search")
+            params: Tool parameters (e.g. {"command": "/search:hirag", "prompt": "..."})
+
+        Returns:
+            CommandResult from the tool's adapter method
+        """
+        if self._tools is None:
+            # Bind once per adapter: dispatch is then one dict lookup
+            self._tools = {
+                tool.name: (getattr(self, tool.method), tool.validate) for tool in TOOL_INDEX.values()
+            }
+        params = params or {}
+        entry = self._tools.get(name)
+        command = params.get("command") if isinstance(params, dict) else None
+        if entry is None:
+            return CommandResult(success=False, output=None, error=f"Unknown tool: {name}", command=command)
+        method, validate = entry
+        error = validate(params)
+        if error is not None:
+            return CommandResult(success=False, output=None, error=f"Invalid call to {name}: {error}", command=command)
+        return await method(**params)
 
     # Convenience methods for common operations
 
@@ -255,11 +982,136 @@ ARCHON_MCP_TOOLS = [
 ]
 
 
+# Precompiled tool dispatch
+# ARCHON_MCP_TOOLS is compiled once at import: unknown adapters, methods or
+# parameter types fail here instead of on the first call, and each tool gets
+# a validator that rejects bad calls before any request is sent.
+
+_PARAM_TYPES: Dict[str, Union[type, Tuple[type, ...]]] = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "object": dict,
+    "array": list,
+}
+
+_TOOL_ADAPTERS: Dict[str, type] = {"ClaudeCodeMCPAdapter": ClaudeCodeMCPAdapter}
+
+
+@dataclass(frozen=True)
+class CompiledTool:
+    """A tool definition resolved to an adapter method and a validator."""
+    name: str
+    description: str
+    method: str
+    validate: Callable[[Any], Optional[str]]
+
+
+def _compile_validator(tool: str, params: Dict[str, Dict[str, Any]]) -> Callable[[Any], Optional[str]]:
+    """Build a validator returning an error message, or None for valid params."""
+    allowed = frozenset(params)
+    required = tuple(name for name, spec in params.items() if not spec.get("optional"))
+    checks = []
+    for name, spec in params.items():
+        kind = spec.get("type", "string")
+        if kind not in _PARAM_TYPES:
+            raise ValueError(f"Tool {tool!r}: unsupported type {kind!r} for parameter {name!r}")
+        enum = frozenset(spec["enum"]) if "enum" in spec else None
+        checks.append((name, kind, _PARAM_TYPES[kind], enum))
+
+    def validate(values: Any) -> Optional[str]:
+        if not isinstance(values, dict):
+            return "params must be an object"
+        for name in required:
+            if values.get(name) is None:
+                return f"missing required parameter {name!r}"
+        if not allowed.issuperset(values):
+            return f"unknown parameter(s): {', '.join(sorted(set(values) - allowed))}"
+        for name, kind, py_type, enum in checks:
+            value = values.get(name)
+            if value is None:
+                continue
+            # bool is an int subclass; do not accept it for numeric types
+            if not isinstance(value, py_type) or (isinstance(value, bool) and kind != "boolean"):
+                return f"parameter {name!r} must be of type {kind}"
+            if enum is not None and value not in enum:
+                return f"parameter {name!r} must be one of: {', '.join(sorted(enum))}"
+        return None
+
+    return validate
+
+
+def compile_tools(tools: Sequence[Dict[str, Any]] = ARCHON_MCP_TOOLS) -> Dict[str, CompiledTool]:
+    """
+    Compile tool definitions into a dispatch index keyed by tool name.
+
+    Raises:
+        ValueError: For duplicate names, unknown adapters or methods, or
+            unsupported parameter types
+    """
+    index: Dict[str, CompiledTool] = {}
+    for tool in tools:
+        name = tool["name"]
+        if name in index:
+            raise ValueError(f"Duplicate tool name {name!r}")
+        adapter = _TOOL_ADAPTERS.get(tool["adapter"])
+        if adapter is None:
+            raise ValueError(f"Tool {name!r}: unknown adapter {tool['adapter']!r}")
+        if not callable(getattr(adapter, tool["method"], None)):
+            raise ValueError(f"Tool {name!r}: {tool['adapter']} has no method {tool['method']!r}")
+        index[name] = CompiledTool(
+            name=name,
+            description=tool.get("description", ""),
+            method=tool["method"],
+            validate=_compile_validator(name, tool.get("params", {})),
+        )
+    return index
+
+
+TOOL_INDEX = compile_tools(ARCHON_MCP_TOOLS)
+
+
 # Factory function for Archon integration
 def create_adapter(config: Optional[Dict[str, Any]] = None) -> ClaudeCodeMCPAdapter:
-    """Create a configured ClaudeCodeMCPAdapter instance."""
+    """
+    Create a configured ClaudeCodeMCPAdapter instance.
+
+    Caching is enabled with `cache: True` (default TTLs) or a dict with
+    `max_entries`, `max_bytes` and `ttls` overrides. `scheduler` takes
+    `max_in_flight` and `rules` (ScheduleRule overrides). `transport: "nats"`
+    sends requests over NATS request/reply (`nats_url`, `nats_subject`)
+    instead of HTTP.
+    """
     config = config or {}
+    cache_config = config.get("cache")
+    cache = None
+    if cache_config:
+        options = cache_config if isinstance(cache_config, dict) else {}
+        cache = ResultCache(
+            max_entries=options.get("max_entries", 1024),
+            max_bytes=options.get("max_bytes", 8 * 1024 * 1024),
+            ttls=options.get("ttls")
+        )
+    scheduler_config = config.get("scheduler") or {}
+    scheduler = CommandScheduler(
+        max_in_flight=scheduler_config.get("max_in_flight", 32),
+        rules=scheduler_config.get("rules")
+    )
+    transport = None
+    if config.get("transport", "http") == "nats":
+        transport = NATSTransport(
+            config.get("nats_url", "nats://nats:4222"),
+            config.get("nats_subject", MCP_EXECUTE_SUBJECT)
+        )
     return ClaudeCodeMCPAdapter(
         agent_zero_url=config.get("agent_zero_url", "http://agent-zero:8080"),
-        timeout=config.get("timeout", 30.0)
+        timeout=config.get("timeout", 30.0),
+        max_concurrency=config.get("max_concurrency", 8),
+        server_batching=config.get("server_batching", False),
+        batch_size=config.get("batch_size", 16),
+        cache=cache,
+        policies=config.get("policies"),
+        transport=transport,
+        scheduler=scheduler
     )
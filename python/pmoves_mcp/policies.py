@@ -0,0 +1,151 @@
+"""
+Per-command timeout, retry and hedging policies for MCP commands.
+
+A single fixed timeout does not fit commands whose latency ranges from
+milliseconds (`/agents:status`) to minutes (`/search:deepresearch`). This
+module provides:
+
+- CommandPolicy: Timeout bounds, retry and hedging settings for a command
+- DEFAULT_COMMAND_POLICIES: Policies for the commands in ARCHON_MCP_TOOLS
+- LatencyTracker: Rolling latency percentiles used to adapt timeouts and
+  decide when to send a hedged request
+- backoff_delay(): Full-jitter exponential backoff
+
+Only idempotent commands are retried or hedged; deploy and BoTZ commands
+always get exactly one attempt.
+"""
+
+import random
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class CommandPolicy:
+    """
+    Execution policy for one command (or command prefix).
+
+    Attributes:
+        timeout: Timeout in seconds until enough latency samples exist
+        min_timeout: Lower bound for the adaptive timeout
+        max_timeout: Upper bound for the adaptive timeout
+        idempotent: Safe to retry and hedge
+        hedge: Send a second request once the first exceeds the observed p95
+        max_attempts: Attempts including the first (idempotent commands only)
+    """
+    timeout: float = 30.0
+    min_timeout: float = 1.0
+    max_timeout: float = 30.0
+    idempotent: bool = False
+    hedge: bool = False
+    max_attempts: int = 1
+
+
+# Keys are exact commands/actions or "/group:" prefixes
+DEFAULT_COMMAND_POLICIES: Dict[str, CommandPolicy] = {
+    "/agents:status": CommandPolicy(5.0, 0.5, 10.0, idempotent=True, hedge=True, max_attempts=3),
+    "/agents:mcp-query": CommandPolicy(30.0, 2.0, 60.0),
+    "/health:check-all": CommandPolicy(15.0, 2.0, 30.0, idempotent=True, max_attempts=2),
+    "/health:metrics": CommandPolicy(10.0, 0.5, 15.0, idempotent=True, hedge=True, max_attempts=3),
+    "/search:hirag": CommandPolicy(20.0, 1.0, 30.0, idempotent=True, hedge=True, max_attempts=3),
+    "/search:supaserch": CommandPolicy(30.0, 2.0, 60.0, idempotent=True, max_attempts=2),
+    "/search:deepresearch": CommandPolicy(600.0, 60.0, 900.0),
+    "/deploy:": CommandPolicy(900.0, 60.0, 1800.0),
+    "/botz:": CommandPolicy(120.0, 10.0, 300.0),
+    "list_commands": CommandPolicy(10.0, 1.0, 15.0, idempotent=True, max_attempts=3),
+    "get_command_help": CommandPolicy(10.0, 1.0, 15.0, idempotent=True, max_attempts=3),
+}
+
+
+def resolve_policy(
+    name: str,
+    policies: Dict[str, CommandPolicy],
+    default: CommandPolicy
+) -> CommandPolicy:
+    """Find the policy for a command: exact match, then "/group:" prefix."""
+    policy = policies.get(name)
+    if policy is None and ":" in name:
+        policy = policies.get(name.split(":", 1)[0] + ":")
+    return policy or default
+
+
+def backoff_delay(attempt: int, base: float = 0.2, cap: float = 5.0) -> float:
+    """Full-jitter exponential backoff for retry `attempt` (0-based)."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def _nearest_rank(ordered: List[float], p: float) -> float:
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+@dataclass
+class RequestStats:
+    """Counters for retries and hedged requests."""
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    timeouts: int = 0
+
+
+class LatencyTracker:
+    """
+    Rolling latency window per command.
+
+    Timeouts adapt to `p99 * headroom`, clamped to the policy bounds, once
+    `min_samples` successful calls have been observed.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20, headroom: float = 2.0):
+        self.window = window
+        self.min_samples = min_samples
+        self.headroom = headroom
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record the latency of a successful call."""
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def percentile(self, name: str, p: float) -> Optional[float]:
+        """Latency percentile for a command, or None until warmed up."""
+        samples = self._samples.get(name)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        return _nearest_rank(sorted(samples), p)
+
+    def timeout_for(self, name: str, policy: CommandPolicy) -> float:
+        """Adaptive timeout for the next call of a command."""
+        p99 = self.percentile(name, 99)
+        if p99 is None:
+            return policy.timeout
+        return max(policy.min_timeout, min(policy.max_timeout, p99 * self.headroom))
+
+    def hedge_delay(self, name: str) -> Optional[float]:
+        """Delay before sending a hedged request (observed p95)."""
+        return self.percentile(name, 95)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Per-command sample count and p50/p95/p99 in seconds."""
+        result = {}
+        for name, samples in self._samples.items():
+            ordered = sorted(samples)
+            result[name] = {
+                "count": len(ordered),
+                "p50": _nearest_rank(ordered, 50),
+                "p95": _nearest_rank(ordered, 95),
+                "p99": _nearest_rank(ordered, 99),
+            }
+        return result
+
+
+__all__ = [
+    "CommandPolicy",
+    "DEFAULT_COMMAND_POLICIES",
+    "LatencyTracker",
+    "RequestStats",
+    "backoff_delay",
+    "resolve_policy",
+]
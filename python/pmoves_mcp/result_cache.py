@@ -0,0 +1,216 @@
+"""
+Result cache for idempotent MCP commands.
+
+Read-only Agent Zero calls (command listings, help text, knowledge search,
+metrics queries) are repeated with identical arguments across Archon workflow
+runs. This module provides a small in-process cache for those results:
+
+- Per-command TTL policies (long for listings/help, short for search/metrics)
+- Size-bounded LRU with byte accounting
+- Single-flight de-duplication of identical in-flight calls
+- Hit/miss/coalesce/eviction counters
+
+Mutating commands (`/deploy:*`, `/botz:*`) are never cached, even if a TTL
+policy names them.
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+# TTLs in seconds, keyed by slash command or adapter action name
+DEFAULT_CACHE_TTLS: Dict[str, float] = {
+    "list_commands": 3600.0,
+    "get_command_help": 3600.0,
+    "/search:hirag": 60.0,
+    "/search:supaserch": 60.0,
+    "/health:metrics": 10.0,
+}
+
+# Command prefixes that change state and must never be served from cache
+NEVER_CACHE_PREFIXES = ("/deploy:", "/botz:")
+
+
+def is_cacheable(name: str) -> bool:
+    """Return False for commands that must never be cached."""
+    return not name.startswith(NEVER_CACHE_PREFIXES)
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate the memory footprint of a cached value in bytes."""
+    try:
+        return len(json.dumps(value, default=lambda o: getattr(o, "__dict__", str(o))))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+class _LoadAbandoned(Exception):
+    """The caller loading a key was cancelled before it finished."""
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness."""
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups served without a new round trip."""
+        total = self.hits + self.coalesced + self.misses
+        return (self.hits + self.coalesced) / total if total else 0.0
+
+
+class ResultCache:
+    """
+    Size-bounded LRU cache with TTLs and single-flight loading.
+
+    Example:
+        cache = ResultCache(max_bytes=4 * 1024 * 1024)
+        result = await cache.get_or_load(
+            ("/search:hirag", query), ttl=60.0,
+            loader=lambda: adapter_call(query),
+            should_store=lambda r: r.success,
+        )
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 8 * 1024 * 1024,
+        ttls: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            max_entries: Maximum number of cached results
+            max_bytes: Maximum total estimated size of cached results
+            ttls: TTL policy overrides merged over DEFAULT_CACHE_TTLS
+            clock: Monotonic time source (seconds)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_CACHE_TTLS, **(ttls or {})}
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    def ttl_for(self, name: str) -> Optional[float]:
+        """TTL for a command or action name, or None if it is not cached."""
+        if not is_cacheable(name):
+            return None
+        ttl = self.ttls.get(name)
+        return ttl if ttl and ttl > 0 else None
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (found, value) for a fresh entry, updating LRU order and stats."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires_at, _ = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return True, value
+            self._remove(key)
+            self.stats.expirations += 1
+        return False, None
+
+    def put(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store a value, evicting least recently used entries to fit."""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, self._clock() + ttl, size)
+        self.stats.bytes += size
+        while len(self._entries) > self.max_entries or self.stats.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats.evictions += 1
+        self.stats.entries = len(self._entries)
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self.stats.bytes -= size
+        self.stats.entries = len(self._entries)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop all entries, or only those whose key starts with `name`."""
+        for key in list(self._entries):
+            if name is None or (isinstance(key, tuple) and key and key[0] == name):
+                self._remove(key)
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        ttl: float,
+        loader: Callable[[], Awaitable[Any]],
+        should_store: Callable[[Any], bool] = lambda value: True
+    ) -> Any:
+        """
+        Return a cached value or load it once for all concurrent callers.
+
+        Args:
+            key: Cache key (first element should be the command/action name)
+            ttl: Time to live in seconds for a stored result
+            loader: Coroutine factory performing the real call
+            should_store: Predicate deciding if a loaded value is cacheable
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        while True:
+            found, value = self.get(key)
+            if found:
+                return value
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            self.stats.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except _LoadAbandoned:
+                continue  # The loading caller was cancelled; load again
+
+        self.stats.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            # Waiting callers were not cancelled; they retry the load instead
+            future.set_exception(_LoadAbandoned())
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unobserved failure does not log a warning
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if should_store(value):
+                self.put(key, value, ttl)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+
+__all__ = [
+    "CacheStats",
+    "DEFAULT_CACHE_TTLS",
+    "NEVER_CACHE_PREFIXES",
+    "ResultCache",
+    "is_cacheable",
+]
@@ -0,0 +1,313 @@
+"""
+In-adapter scheduling for MCP commands.
+
+Every command shares the adapter's connection pool. Without scheduling, a
+fan-out of `/search:hirag` calls queues ahead of an urgent
+`/health:check-all`, and long `/deploy:*` or `/search:deepresearch` calls can
+hold most of the pool. This module provides:
+
+- ScheduleRule: Lane, concurrency cap and token-bucket rate for a command
+- DEFAULT_SCHEDULE_RULES: Rules for the commands in ARCHON_MCP_TOOLS
+- CommandScheduler: Admits requests by lane priority
+  (interactive > health > search > deploy) within a global in-flight bound,
+  per-rule concurrency caps and rate limits, and records queue depth and
+  wait times
+
+Rules are keyed like command policies: exact commands/actions or "/group:"
+prefixes. The cap and the token bucket belong to the rule, so every command
+under a prefix rule shares them. A server-side batch of N commands takes N
+slots and N tokens of its commands' rule at once, so batching never gets
+around a cap, a rate limit or lane priority.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+
+from .policies import LatencyTracker
+
+# Lanes in priority order
+LANES = ("interactive", "health", "search", "deploy")
+
+
+@dataclass(frozen=True)
+class ScheduleRule:
+    """
+    Scheduling rule for one command (or command prefix).
+
+    Attributes:
+        lane: Priority lane, one of LANES
+        max_concurrency: In-flight requests allowed for this rule (None for
+            no cap beyond the scheduler's)
+        rate: Sustained requests per second (None for no rate limit)
+        burst: Requests allowed back to back before `rate` applies
+    """
+    lane: str = "search"
+    max_concurrency: Optional[int] = None
+    rate: Optional[float] = None
+    burst: int = 1
+
+
+# Keys are exact commands/actions or "/group:" prefixes
+DEFAULT_SCHEDULE_RULES: Dict[str, ScheduleRule] = {
+    "/agents:": ScheduleRule("interactive", max_concurrency=8),
+    "list_commands": ScheduleRule("interactive", max_concurrency=2),
+    "get_command_help": ScheduleRule("interactive", max_concurrency=4),
+    "/health:": ScheduleRule("health", max_concurrency=4),
+    "/search:hirag": ScheduleRule("search", max_concurrency=8, rate=20.0, burst=20),
+    "/search:supaserch": ScheduleRule("search", max_concurrency=4, rate=5.0, burst=5),
+    "/search:deepresearch": ScheduleRule("search", max_concurrency=2, rate=0.5, burst=2),
+    "/deploy:": ScheduleRule("deploy", max_concurrency=1),
+    "/botz:": ScheduleRule("deploy", max_concurrency=2),
+}
+
+DEFAULT_RULE = ScheduleRule()
+
+
+def resolve_rule(name: str, rules: Dict[str, ScheduleRule]) -> Tuple[str, ScheduleRule]:
+    """Find the rule for a command: exact match, then "/group:" prefix."""
+    rule = rules.get(name)
+    if rule is not None:
+        return name, rule
+    if ":" in name:
+        prefix = name.split(":", 1)[0] + ":"
+        rule = rules.get(prefix)
+        if rule is not None:
+            return prefix, rule
+    return name, DEFAULT_RULE
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second up to `burst`."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+    def delay(self, now: float, count: int = 1) -> float:
+        """Seconds until `count` tokens are available (0 if they are available now)."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= count else (count - self.tokens) / self.rate
+
+    def take(self, count: int = 1) -> None:
+        self.tokens -= count
+
+
+class _Waiter:
+    __slots__ = ("key", "rule", "count", "future", "enqueued", "limited")
+
+    def __init__(self, key: str, rule: ScheduleRule, count: int, future: "asyncio.Future"):
+        self.key = key
+        self.rule = rule
+        self.count = count
+        self.future = future
+        self.enqueued = time.monotonic()
+        self.limited = False
+
+
+class CommandScheduler:
+    """
+    Priority-lane admission for adapter requests.
+
+    A request waits until it fits the global `max_in_flight` bound, its
+    rule's concurrency cap and its rule's token bucket. Freed capacity goes
+    to the highest-priority lane with an admissible request; within a lane
+    requests are admitted in arrival order, skipping ones that are capped
+    or rate limited.
+
+    Example:
+        scheduler = CommandScheduler(max_in_flight=16)
+        async with scheduler.slot("/search:hirag"):
+            ...  # send the request
+        scheduler.stats()["lanes"]["search"]["wait_p95"]
+    """
+
+    def __init__(self, max_in_flight: int = 32, rules: Optional[Dict[str, ScheduleRule]] = None):
+        """
+        Args:
+            max_in_flight: Requests in flight across all commands
+            rules: Rule overrides merged over DEFAULT_SCHEDULE_RULES
+        """
+        self.max_in_flight = max_in_flight
+        self.rules = {**DEFAULT_SCHEDULE_RULES, **(rules or {})}
+        for key, rule in self.rules.items():
+            if rule.lane not in LANES:
+                raise ValueError(f"Unknown lane {rule.lane!r} for {key!r}; expected one of {LANES}")
+        self.in_flight = 0
+        self.wait_times = LatencyTracker(window=500, min_samples=1)
+        self.admitted: Dict[str, int] = {lane: 0 for lane in LANES}
+        self.rate_limited: Dict[str, int] = {lane: 0 for lane in LANES}
+        self.max_depth: Dict[str, int] = {lane: 0 for lane in LANES}
+        self._lanes: Dict[str, Deque[_Waiter]] = {lane: deque() for lane in LANES}
+        self._running: Dict[str, int] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._timer: Optional["asyncio.TimerHandle"] = None
+
+    def lane_for(self, name: str) -> str:
+        """Lane a command is scheduled in."""
+        return resolve_rule(name, self.rules)[1].lane
+
+    def batch_group(self, name: str) -> str:
+        """
+        Commands with the same batch group may share a server-side batch.
+
+        Capped or rate-limited commands are grouped by rule, so a batch draws
+        on one cap and one bucket; the rest only need to share a lane.
+        """
+        key, rule = resolve_rule(name, self.rules)
+        if rule.max_concurrency is None and rule.rate is None:
+            return f"lane:{rule.lane}"
+        return key
+
+    def max_batch(self, name: str) -> int:
+        """Most commands of `name`'s rule one batch may hold: its cap, burst and max_in_flight."""
+        rule = resolve_rule(name, self.rules)[1]
+        limit = min(self.max_in_flight, rule.max_concurrency or math.inf)
+        if rule.rate is not None:
+            limit = min(limit, max(1, rule.burst))
+        return int(limit)
+
+    @asynccontextmanager
+    async def slot(self, name: str, count: int = 1) -> AsyncIterator[None]:
+        """Hold execution slots for `count` requests of command `name`."""
+        key = await self.acquire(name, count)
+        try:
+            yield
+        finally:
+            self.release(key, count)
+
+    async def acquire(self, name: str, count: int = 1) -> str:
+        """
+        Wait for `count` execution slots (and tokens) at once.
+
+        Returns:
+            Key to pass to release()
+
+        Raises:
+            ValueError: If `count` exceeds max_batch(name) and could never be admitted
+        """
+        if count > self.max_batch(name):
+            raise ValueError(f"{count} slots for {name!r} exceed its limit of {self.max_batch(name)}")
+        key, rule = resolve_rule(name, self.rules)
+        lane = self._lanes[rule.lane]
+        if not any(self._lanes.values()) and self._admissible(key, rule, count, time.monotonic()) == 0:
+            self._admit(key, rule, count, 0.0)
+            return key
+
+        waiter = _Waiter(key, rule, count, asyncio.get_running_loop().create_future())
+        lane.append(waiter)
+        self.max_depth[rule.lane] = max(self.max_depth[rule.lane], len(lane))
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release(key, count)  # Admitted just as the caller gave up
+            else:
+                lane.remove(waiter)
+            raise
+        return key
+
+    def release(self, key: str, count: int = 1) -> None:
+        """Free slots taken by acquire()."""
+        self.in_flight -= count
+        self._running[key] -= count
+        self._dispatch()
+
+    def _admissible(self, key: str, rule: ScheduleRule, count: int, now: float) -> Optional[float]:
+        """0 if the requests can start now, seconds to wait for tokens, or None if capped."""
+        if self.in_flight + count > self.max_in_flight:
+            return None
+        if rule.max_concurrency is not None and self._running.get(key, 0) + count > rule.max_concurrency:
+            return None
+        if rule.rate is None:
+            return 0.0
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(rule.rate, rule.burst)
+        return bucket.delay(now, count)
+
+    def _admit(self, key: str, rule: ScheduleRule, count: int, waited: float) -> None:
+        if rule.rate is not None:
+            self._buckets[key].take(count)
+        self.in_flight += count
+        self._running[key] = self._running.get(key, 0) + count
+        self.admitted[rule.lane] += count
+        self.wait_times.record(rule.lane, waited)
+
+    def _dispatch(self) -> None:
+        """Admit waiting requests in lane priority order."""
+        now = time.monotonic()
+        retry_in: Optional[float] = None
+        for lane_name in LANES:
+            lane = self._lanes[lane_name]
+            for waiter in list(lane):
+                if self.in_flight >= self.max_in_flight:
+                    return
+                if waiter.future.done():
+                    continue
+                delay = self._admissible(waiter.key, waiter.rule, waiter.count, now)
+                if delay is None:
+                    continue
+                if delay > 0:
+                    if not waiter.limited:
+                        waiter.limited = True
+                        self.rate_limited[lane_name] += 1
+                    retry_in = delay if retry_in is None else min(retry_in, delay)
+                    continue
+                lane.remove(waiter)
+                self._admit(waiter.key, waiter.rule, waiter.count, now - waiter.enqueued)
+                waiter.future.set_result(None)
+        if retry_in is not None:
+            # Re-arm when a token comes due before the pending timer fires
+            loop = asyncio.get_running_loop()
+            due = loop.time() + retry_in
+            if self._timer is None or due < self._timer.when():
+                if self._timer is not None:
+                    self._timer.cancel()
+                self._timer = loop.call_at(due, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    def stats(self) -> Dict[str, object]:
+        """In-flight count and per-lane queue depth, admissions and wait times (seconds)."""
+        waits = self.wait_times.snapshot()
+        lanes = {}
+        for lane in LANES:
+            lane_waits = waits.get(lane, {})
+            lanes[lane] = {
+                "queued": len(self._lanes[lane]),
+                "max_queued": self.max_depth[lane],
+                "admitted": self.admitted[lane],
+                "rate_limited": self.rate_limited[lane],
+                "wait_p50": lane_waits.get("p50", 0.0),
+                "wait_p95": lane_waits.get("p95", 0.0),
+                "wait_p99": lane_waits.get("p99", 0.0),
+            }
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "running": {key: count for key, count in self._running.items() if count},
+            "lanes": lanes,
+        }
+
+
+__all__ = [
+    "CommandScheduler",
+    "DEFAULT_SCHEDULE_RULES",
+    "LANES",
+    "ScheduleRule",
+    "TokenBucket",
+    "resolve_rule",
+]
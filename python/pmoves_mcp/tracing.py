@@ -0,0 +1,152 @@
+"""
+Timing breakdown and trace context for MCP requests.
+
+Every request the adapter sends carries a W3C `traceparent` header, and the
+adapter records where the time went so a slow Archon step can be attributed
+to a hop. This module provides:
+
+- RequestTrace: Trace/span ids and phase timings of one request attempt
+- current_traceparent: Context variable holding the caller's trace context;
+  requests made while it is set join that trace instead of starting one
+- parse_server_timing(): Parse a `Server-Timing` response header
+
+Phases (milliseconds):
+- queue: Waiting for a CommandScheduler slot
+- connect: Waiting for a pooled connection, including TCP/TLS setup when a
+  new connection is opened (NATS: obtaining the shared connection)
+- ttfb: Request sent until response headers arrived; this is Agent Zero's
+  processing time plus the network round trip
+- body: Reading the response body
+- decode: Parsing the JSON reply
+- total: Wall-clock time of the whole call, including retries and hedge delay
+- cache: Serving the result from the ResultCache; a cache hit has its own
+  trace id and only `cache` and `total` timings
+
+Server-reported timings come from the `Server-Timing` header and from a
+`timings` object in the reply body (`{"hirag": 812.5, ...}`, milliseconds).
+
+Usage:
+    token = current_traceparent.set(request.headers.get("traceparent"))
+    try:
+        result = await adapter.search_knowledge("...")
+    finally:
+        current_traceparent.reset(token)
+    result.trace_id, result.timings, result.server_timings
+"""
+
+import os
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+PHASES = ("queue", "connect", "ttfb", "body", "decode")
+
+current_traceparent: ContextVar[Optional[str]] = ContextVar("pmoves_mcp_traceparent", default=None)
+
+_HEX = frozenset("0123456789abcdef")
+
+
+def trace_id_of(traceparent: Optional[str]) -> Optional[str]:
+    """Trace id of a valid `traceparent` value, else None."""
+    if not traceparent:
+        return None
+    parts = traceparent.strip().lower().split("-")
+    if len(parts) < 4 or len(parts[0]) != 2 or parts[0] == "ff":
+        return None
+    trace_id = parts[1]
+    if len(trace_id) != 32 or not _HEX.issuperset(trace_id) or trace_id == "0" * 32:
+        return None
+    return trace_id
+
+
+def new_trace_id() -> str:
+    """Trace id of the caller's trace context, or a new random one."""
+    return trace_id_of(current_traceparent.get()) or os.urandom(16).hex()
+
+
+def parse_server_timing(header: Optional[str]) -> Dict[str, float]:
+    """
+    Parse a Server-Timing header into {metric: duration_ms}.
+
+    Metrics without a `dur` parameter are skipped.
+
+    Example:
+        parse_server_timing('db;dur=53, hirag;desc="Hi-RAG";dur=120.5')
+        # {"db": 53.0, "hirag": 120.5}
+    """
+    timings: Dict[str, float] = {}
+    if not header:
+        return timings
+    for metric in header.split(","):
+        name, *params = (part.strip() for part in metric.split(";"))
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "dur" and name:
+                try:
+                    timings[name] = float(value.strip().strip('"'))
+                except ValueError:
+                    pass
+                break
+    return timings
+
+
+def numeric_timings(value: Any) -> Dict[str, float]:
+    """Numeric entries of a reply's `timings` object (anything else is ignored)."""
+    if not isinstance(value, dict):
+        return {}
+    return {
+        str(name): float(ms)
+        for name, ms in value.items()
+        if isinstance(ms, (int, float)) and not isinstance(ms, bool)
+    }
+
+
+class RequestTrace:
+    """
+    Trace context and phase timings of one request attempt.
+
+    Each attempt (retry or hedge) gets its own span id within the call's
+    trace id, so Agent Zero's logs show every attempt.
+    """
+
+    __slots__ = ("trace_id", "span_id", "phases", "server")
+
+    def __init__(self, trace_id: Optional[str] = None):
+        """
+        Args:
+            trace_id: Trace to join (defaults to new_trace_id())
+        """
+        self.trace_id = trace_id or new_trace_id()
+        self.span_id = os.urandom(8).hex()
+        self.phases: Dict[str, float] = {}
+        self.server: Dict[str, float] = {}
+
+    @property
+    def traceparent(self) -> str:
+        """W3C traceparent header value for this attempt (sampled)."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Add time to a phase."""
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds * 1000.0
+
+    def since(self, phase: str, started: float) -> float:
+        """Add the time since perf_counter() value `started` to a phase; return now."""
+        now = time.perf_counter()
+        self.add(phase, now - started)
+        return now
+
+    def timings(self) -> Dict[str, float]:
+        """Phase timings in milliseconds."""
+        return dict(self.phases)
+
+
+__all__ = [
+    "PHASES",
+    "RequestTrace",
+    "current_traceparent",
+    "new_trace_id",
+    "numeric_timings",
+    "parse_server_timing",
+    "trace_id_of",
+]
@@ -0,0 +1,265 @@
+"""
+Request transports between the MCP adapter and Agent Zero.
+
+ClaudeCodeMCPAdapter builds an execute payload and hands it to a transport,
+which returns Agent Zero's decoded JSON reply. This module provides:
+
+- Transport: Interface for one request/reply exchange
+- HTTPTransport: POST to Agent Zero's /mcp/execute (the default)
+- NATSTransport: NATS request/reply on MCP_EXECUTE_SUBJECT over one
+  long-lived connection; replies are correlated through the connection's
+  shared inbox, so concurrent requests are multiplexed on it
+- TransportError / TransportTimeout: Failures, flagged as retryable or not
+
+Both transports carry the same payload and reply documents, so retries,
+hedging and CommandResult parsing in the adapter do not depend on which one
+is used. Streaming commands always use HTTP.
+
+When given a RequestTrace, a transport sends its `traceparent` (HTTP header
+or NATS message header), records the connect/ttfb/body/decode phases and
+collects the reply's `Server-Timing` header.
+"""
+
+import asyncio
+import json
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from .tracing import RequestTrace, parse_server_timing
+
+# httpx and nats are imported when a transport first sends a request
+if TYPE_CHECKING:
+    import httpx
+    from nats.aio.client import Client as NATS
+
+# Subject Agent Zero's NATS responder listens on (queue group per deployment)
+MCP_EXECUTE_SUBJECT = "agent_zero.mcp.execute.v1"
+
+# HTTP statuses that mean "this server does not support the action"
+UNSUPPORTED_STATUSES = (400, 404, 405, 422, 501)
+
+
+class TransportError(Exception):
+    """A request did not produce a reply."""
+
+    def __init__(self, message: str, retryable: bool = False, status: Optional[int] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.status = status
+
+
+class TransportTimeout(TransportError):
+    """No reply within the request timeout."""
+
+    def __init__(self, timeout: float):
+        super().__init__(f"Timed out after {timeout:.1f}s", retryable=True)
+        self.timeout = timeout
+
+
+class Transport:
+    """One request/reply exchange with Agent Zero."""
+
+    async def request(
+        self,
+        payload: Dict[str, Any],
+        timeout: float,
+        trace: Optional[RequestTrace] = None
+    ) -> Any:
+        """
+        Send an execute payload and return the decoded reply.
+
+        Args:
+            payload: Execute payload
+            timeout: Request timeout in seconds
+            trace: Receives phase timings and server timings; its
+                traceparent is sent with the request
+
+        Raises:
+            TransportError: If no reply was received (TransportTimeout on timeout)
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release connections."""
+
+
+class HTTPTransport(Transport):
+    """POST requests to `<agent_zero_url>/mcp/execute`."""
+
+    def __init__(self, agent_zero_url: str = "http://agent-zero:8080", timeout: float = 30.0):
+        """
+        Args:
+            agent_zero_url: Base URL of Agent Zero
+            timeout: Default HTTP timeout in seconds
+        """
+        self.agent_zero_url = agent_zero_url
+        self.url = f"{agent_zero_url}/mcp/execute"
+        self.timeout = timeout
+        self._client: Optional["httpx.AsyncClient"] = None
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        """Lazy initialization of async client."""
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        return self._client
+
+    async def request(
+        self,
+        payload: Dict[str, Any],
+        timeout: float,
+        trace: Optional[RequestTrace] = None
+    ) -> Any:
+        import httpx
+
+        if trace is None:
+            headers = extensions = None
+        else:
+            headers = {"traceparent": trace.traceparent}
+            marks: Dict[str, float] = {}
+
+            # httpcore trace events, e.g. "http11.receive_response_headers.complete"
+            async def on_event(event: str, info: Dict[str, Any]) -> None:
+                marks[event.partition(".")[2]] = time.perf_counter()
+
+            extensions = {"trace": on_event}
+        client = self.client
+        started = time.perf_counter()
+        try:
+            try:
+                response = await client.post(
+                    self.url, json=payload, timeout=timeout, headers=headers, extensions=extensions
+                )
+            finally:
+                if trace is not None:
+                    _record_http_phases(trace, marks, started, time.perf_counter())
+            if trace is not None:
+                trace.server.update(parse_server_timing(response.headers.get("server-timing")))
+            response.raise_for_status()
+        except httpx.TimeoutException as e:
+            raise TransportTimeout(timeout) from e
+        except httpx.HTTPStatusError as e:
+            status = e.response.status_code
+            raise TransportError(f"HTTP error: {status}", status >= 500 or status == 429, status) from e
+        except httpx.TransportError as e:
+            raise TransportError(str(e), retryable=True) from e
+        if trace is None:
+            return response.json()
+        started = time.perf_counter()
+        data = response.json()
+        trace.since("decode", started)
+        return data
+
+    async def close(self) -> None:
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+
+def _record_http_phases(trace: RequestTrace, marks: Dict[str, float], started: float, ended: float) -> None:
+    """Split a request into connect/ttfb/body from httpcore trace events."""
+    sent = marks.get("send_request_headers.started")
+    if sent is None:
+        # Failed before sending (connect error), or no connection-level
+        # events at all (e.g. a mock transport), where it all counts as ttfb
+        trace.add("connect" if marks else "ttfb", ended - started)
+        return
+    trace.add("connect", sent - started)
+    headers = marks.get("receive_response_headers.complete")
+    if headers is None:
+        trace.add("ttfb", ended - sent)  # Timed out or failed waiting for the reply
+        return
+    trace.add("ttfb", headers - sent)
+    trace.add("body", ended - headers)
+
+
+class NATSTransport(Transport):
+    """
+    NATS request/reply with Agent Zero.
+
+    One connection is opened on first use and shared by every request.
+    nats-py subscribes a single wildcard inbox on it and matches each reply
+    to its request by token, so there is no per-request subscription or
+    connection setup. Agent Zero replies with the same JSON document it
+    returns from /mcp/execute.
+
+    Example:
+        adapter = ClaudeCodeMCPAdapter(transport=NATSTransport("nats://nats:4222"))
+    """
+
+    def __init__(self, nats_url: str = "nats://nats:4222", subject: str = MCP_EXECUTE_SUBJECT):
+        """
+        Args:
+            nats_url: NATS server URL
+            subject: Subject Agent Zero answers execute requests on
+        """
+        self.nats_url = nats_url
+        self.subject = subject
+        self._nc: Optional["NATS"] = None
+        self._connecting: Optional[asyncio.Lock] = None
+
+    async def _connection(self) -> "NATS":
+        if self._nc is not None and self._nc.is_connected:
+            return self._nc
+        if self._connecting is None:
+            self._connecting = asyncio.Lock()
+        async with self._connecting:
+            if self._nc is None or self._nc.is_closed:
+                from nats.aio.client import Client as NATS
+
+                nc = NATS()
+                await nc.connect(self.nats_url, connect_timeout=5)
+                self._nc = nc
+        return self._nc
+
+    async def request(
+        self,
+        payload: Dict[str, Any],
+        timeout: float,
+        trace: Optional[RequestTrace] = None
+    ) -> Any:
+        from nats.errors import NoRespondersError, TimeoutError as NATSTimeoutError
+
+        body = json.dumps(payload).encode()
+        headers = None if trace is None else {"traceparent": trace.traceparent}
+        started = time.perf_counter()
+        try:
+            nc = await self._connection()
+            if trace is not None:
+                started = trace.since("connect", started)
+            try:
+                msg = await nc.request(self.subject, body, timeout=timeout, headers=headers)
+            finally:
+                if trace is not None:
+                    trace.since("ttfb", started)
+        except (NATSTimeoutError, asyncio.TimeoutError) as e:
+            raise TransportTimeout(timeout) from e
+        except NoRespondersError as e:
+            raise TransportError(f"No responders on {self.subject}", retryable=True) from e
+        except Exception as e:
+            raise TransportError(str(e) or type(e).__name__, retryable=True) from e
+        if trace is None:
+            return json.loads(msg.data)
+        if msg.headers:
+            trace.server.update(parse_server_timing(msg.headers.get("Server-Timing")))
+        started = time.perf_counter()
+        data = json.loads(msg.data)
+        trace.since("decode", started)
+        return data
+
+    async def close(self) -> None:
+        if self._nc is not None:
+            await self._nc.close()
+            self._nc = None
+
+
+__all__ = [
+    "HTTPTransport",
+    "MCP_EXECUTE_SUBJECT",
+    "NATSTransport",
+    "Transport",
+    "TransportError",
+    "TransportTimeout",
+]
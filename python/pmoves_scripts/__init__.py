@@ -0,0 +1,61 @@
+"""
+PMOVES Python Script Node Runtime for Archon
+
+Runs Archon workflow script nodes with `runtime: uv` on resident Python
+workers instead of starting a new interpreter (and uv resolution) for every
+node execution.
+
+This module provides:
+- ScriptWorkerPool: Warm workers per dependency set, recycled after N runs
+- ScriptResult: Exit code and captured stdout/stderr of a run
+- ScriptStream: Incremental NDJSON output records of a streaming run
+- serve_socket(): Expose a pool to the workflow engine over a Unix socket
+- run_via_socket(): Client for a serving pool
+
+Scripts keep the same contract as `uv run script.py` (see
+`.archon/scripts/echo-py.py`): arguments arrive in `sys.argv[1:]` and the
+node output is whatever the script prints to stdout. Scripts that handle
+large inputs can use the NDJSON streaming protocol in
+`pmoves_scripts.streaming` instead.
+
+Usage:
+    # Start a pool server for the workflow engine
+    python -m pmoves_scripts serve --socket /tmp/archon-py.sock --workers 4
+
+    # Run a script through it
+    python -m pmoves_scripts run --socket /tmp/archon-py.sock \\
+        .archon/scripts/echo-py.py hello
+
+    # Or use the pool directly
+    pool = ScriptWorkerPool(size=4, max_runs=100)
+    result = await pool.run(".archon/scripts/echo-py.py", ["hello"])
+"""
+
+from importlib import import_module
+from typing import Any
+
+# Resolved lazily (PEP 562) so `import pmoves_scripts.streaming` inside a
+# script does not pull in asyncio and the pool.
+_EXPORTS = {
+    "ScriptResult": ".pool",
+    "ScriptStream": ".pool",
+    "ScriptWorkerPool": ".pool",
+    "run_via_socket": ".pool",
+    "serve_socket": ".pool",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
+
+
+__all__ = list(_EXPORTS)
@@ -0,0 +1,68 @@
+"""Command-line entry point: python -m pmoves_scripts {serve,run}"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+from .pool import ScriptWorkerPool, run_via_socket, serve_socket
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    pool = ScriptWorkerPool(size=args.workers, max_runs=args.max_runs)
+    if args.prewarm:
+        await pool.prewarm()
+    server = await serve_socket(pool, args.socket)
+    print(f"Serving Python script workers on {args.socket}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await pool.close()
+
+
+async def _run(args: argparse.Namespace) -> int:
+    response = await run_via_socket(args.socket, {
+        "id": 1,
+        "script": os.path.abspath(args.script),
+        "argv": args.args,
+        "stdin": sys.stdin.read() if args.stdin else None,
+        "cwd": os.getcwd(),
+        "deps": args.deps,
+        "timeout_ms": args.timeout_ms,
+    })
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    return response.get("exit_code", 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m pmoves_scripts")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    serve = sub.add_parser("serve", help="serve a warm worker pool on a Unix socket")
+    serve.add_argument("--socket", required=True)
+    serve.add_argument("--workers", type=int, default=2, help="workers per dependency set")
+    serve.add_argument("--max-runs", type=int, default=100, help="runs before a worker is recycled")
+    serve.add_argument("--prewarm", action="store_true", help="start workers before the first request")
+
+    run = sub.add_parser("run", help="run a script through a serving pool")
+    run.add_argument("--socket", required=True)
+    run.add_argument("--with", dest="deps", action="append", default=[])
+    run.add_argument("--timeout-ms", type=int, default=None)
+    run.add_argument("--stdin", action="store_true", help="forward this process's stdin to the script")
+    run.add_argument("script")
+    run.add_argument("args", nargs=argparse.REMAINDER)
+
+    args = parser.parse_args()
+    if args.cmd == "serve":
+        try:
+            asyncio.run(_serve(args))
+        except KeyboardInterrupt:
+            pass
+    else:
+        sys.exit(asyncio.run(_run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,490 @@
+"""
+Warm worker pool for Python script nodes.
+
+Keeps resident `worker.py` interpreters per dependency set (the node's
+`deps:` list) and hands script runs to them, recycling each worker after
+`max_runs` executions or when a run times out.
+
+Runs either capture stdout whole (`run`) or yield NDJSON output records as
+the script produces them (`stream`, see `pmoves_scripts.streaming`).
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import shutil
+import sys
+from dataclasses import dataclass, asdict
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+WORKER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "worker.py")
+
+# Largest single protocol line (one request or response) in bytes
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+# Request ids, unique per process so a response is never taken for another run's
+_request_ids = itertools.count(1)
+
+
+@dataclass
+class ScriptResult:
+    """Outcome of one script run."""
+    exit_code: int
+    stdout: str
+    stderr: str
+    duration_ms: float = 0.0
+    worker_pid: Optional[int] = None
+    timed_out: bool = False
+    records: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _build_request(
+    script: str,
+    argv: Sequence[str],
+    stdin: Optional[str],
+    input_file: Optional[str],
+    cwd: Optional[str],
+    env: Optional[Dict[str, str]],
+    stream: bool
+) -> Dict[str, Any]:
+    return {
+        "id": next(_request_ids),
+        "script": os.path.abspath(os.path.join(cwd or "", script)),
+        "argv": list(argv),
+        "stdin": stdin,
+        "input_file": input_file,
+        "cwd": cwd,
+        "env": env or {},
+        "stream": stream,
+    }
+
+
+def _decode_record(line: str) -> Any:
+    """Decode an output line as JSON, falling back to the raw text."""
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        return line
+
+
+def _timeout_result(worker: "_Worker", timeout: Optional[float]) -> ScriptResult:
+    return ScriptResult(
+        exit_code=124,
+        stdout="",
+        stderr=f"Script timed out after {timeout}s\n",
+        worker_pid=worker.process.pid,
+        timed_out=True,
+    )
+
+
+def _response_result(response: Dict[str, Any], worker: "_Worker") -> ScriptResult:
+    return ScriptResult(
+        exit_code=response.get("exit_code", 1),
+        stdout=response.get("stdout", ""),
+        stderr=response.get("stderr", ""),
+        duration_ms=response.get("duration_ms", 0.0),
+        worker_pid=worker.process.pid,
+        records=response.get("records", 0),
+    )
+
+
+class _Worker:
+    """One resident interpreter speaking the worker.py protocol."""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.runs = 0
+        self.aborted = False
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    @classmethod
+    async def spawn(cls, command: Sequence[str]) -> "_Worker":
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=MAX_MESSAGE_BYTES,
+        )
+        worker = cls(process)
+        ready = await process.stdout.readline()
+        if not ready:
+            await process.wait()
+            raise RuntimeError(f"Script worker exited during startup: {' '.join(command)}")
+        return worker
+
+    async def send(self, request: Dict[str, Any]) -> None:
+        self.runs += 1
+        self.process.stdin.write((json.dumps(request) + "\n").encode())
+        await self.process.stdin.drain()
+
+    async def receive(self, request_id: Any, timeout: Optional[float]) -> Dict[str, Any]:
+        line = await asyncio.wait_for(self.process.stdout.readline(), timeout)
+        if not line:
+            raise RuntimeError("Script worker exited unexpectedly")
+        message = json.loads(line)
+        if message.get("id") != request_id:
+            raise RuntimeError(
+                f"Script worker answered request {message.get('id')!r}, expected {request_id!r}"
+            )
+        return message
+
+    async def run(self, request: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+        await self.send(request)
+        return await self.receive(request["id"], timeout)
+
+    async def close(self) -> None:
+        if self.alive:
+            self.process.stdin.close()
+            try:
+                await asyncio.wait_for(self.process.wait(), 2.0)
+            except asyncio.TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+
+    async def kill(self) -> None:
+        if self.alive:
+            self.process.kill()
+            await self.process.wait()
+
+    def abort(self) -> None:
+        """Kill without waiting; used when the caller may already be cancelled."""
+        self.aborted = True
+        if self.alive:
+            self.process.kill()
+
+
+class _Lane:
+    """Workers sharing one dependency set."""
+
+    def __init__(self):
+        self.idle: asyncio.Queue = asyncio.Queue()
+        self.count = 0
+
+
+class ScriptWorkerPool:
+    """
+    Pool of resident Python workers keyed by dependency set.
+
+    Example:
+        pool = ScriptWorkerPool(size=4, max_runs=100)
+        result = await pool.run(".archon/scripts/echo-py.py", ["hello"])
+        print(result.stdout)
+        await pool.close()
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_runs: int = 100,
+        python_command: Optional[Sequence[str]] = None
+    ):
+        """
+        Args:
+            size: Maximum workers per dependency set
+            max_runs: Runs before a worker is replaced with a fresh one
+            python_command: Interpreter command (defaults to `uv run python`
+                when uv is installed, else the current interpreter)
+        """
+        self.size = size
+        self.max_runs = max_runs
+        self.python_command = list(python_command) if python_command else None
+        self._lanes: Dict[Tuple[str, ...], _Lane] = {}
+        self._tasks: set = set()
+        self._closed = False
+
+    def _command(self, deps: Tuple[str, ...]) -> List[str]:
+        if self.python_command:
+            return [*self.python_command, WORKER_PATH]
+        if shutil.which("uv"):
+            with_flags = [flag for dep in deps for flag in ("--with", dep)]
+            return ["uv", "run", *with_flags, "python", WORKER_PATH]
+        if deps:
+            raise RuntimeError("uv is required to run script nodes with deps")
+        return [sys.executable, WORKER_PATH]
+
+    async def prewarm(self, deps: Sequence[str] = ()) -> None:
+        """Start all workers for a dependency set ahead of the first run."""
+        key = tuple(deps)
+        lane = self._lanes.setdefault(key, _Lane())
+        missing = self.size - lane.count
+        lane.count += missing
+        for _ in range(missing):
+            self._spawn_into(key, lane)
+
+    def _spawn_into(self, key: Tuple[str, ...], lane: _Lane) -> None:
+        """Start a worker in the background and make it idle when ready."""
+
+        async def spawn():
+            try:
+                worker = await _Worker.spawn(self._command(key))
+            except Exception:
+                lane.count -= 1
+                lane.idle.put_nowait(None)  # wake a waiter so it can retry
+                return
+            if self._closed:
+                await worker.close()
+                return
+            lane.idle.put_nowait(worker)
+
+        task = asyncio.create_task(spawn())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _acquire(self, key: Tuple[str, ...]) -> _Worker:
+        lane = self._lanes.setdefault(key, _Lane())
+        while True:
+            if lane.idle.empty() and lane.count < self.size:
+                lane.count += 1
+                try:
+                    return await _Worker.spawn(self._command(key))
+                except Exception:
+                    lane.count -= 1
+                    raise
+            worker = await lane.idle.get()
+            if worker is not None and worker.alive:
+                return worker
+            if worker is not None:
+                lane.count -= 1
+
+    def _release(self, key: Tuple[str, ...], worker: _Worker) -> None:
+        lane = self._lanes[key]
+        if not self._closed and worker.alive and not worker.aborted and worker.runs < self.max_runs:
+            lane.idle.put_nowait(worker)
+            return
+        # Recycle: retire this worker and warm a replacement
+        task = asyncio.create_task(worker.close())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        if self._closed:
+            lane.count -= 1
+        else:
+            self._spawn_into(key, lane)
+
+    async def run(
+        self,
+        script: str,
+        argv: Sequence[str] = (),
+        *,
+        stdin: Optional[str] = None,
+        input_file: Optional[str] = None,
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        deps: Sequence[str] = (),
+        timeout: Optional[float] = None
+    ) -> ScriptResult:
+        """
+        Run a script file on a warm worker.
+
+        Args:
+            script: Path to the Python script
+            argv: Arguments (become sys.argv[1:])
+            stdin: Text provided on sys.stdin
+            input_file: NDJSON input file exposed as $ARCHON_INPUT_FILE
+            cwd: Working directory for the run
+            env: Environment variables added for the run
+            deps: Extra packages (`uv run --with`), selects the worker lane
+            timeout: Seconds before the worker is killed and replaced
+
+        Returns:
+            ScriptResult with exit code and captured output
+        """
+        if self._closed:
+            raise RuntimeError("ScriptWorkerPool is closed")
+        key = tuple(deps)
+        worker = await self._acquire(key)
+        request = _build_request(script, argv, stdin, input_file, cwd, env, stream=False)
+        finished = False
+        try:
+            response = await worker.run(request, timeout)
+            finished = True
+        except asyncio.TimeoutError:
+            await worker.kill()
+            return _timeout_result(worker, timeout)
+        except (RuntimeError, ConnectionError, ValueError) as e:
+            await worker.kill()
+            return ScriptResult(exit_code=1, stdout="", stderr=f"{e}\n", worker_pid=worker.process.pid)
+        finally:
+            if not finished:
+                # Cancelled mid-run: the worker may still answer this request later
+                worker.abort()
+            self._release(key, worker)
+
+        return _response_result(response, worker)
+
+    def stream(
+        self,
+        script: str,
+        argv: Sequence[str] = (),
+        *,
+        stdin: Optional[str] = None,
+        input_file: Optional[str] = None,
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        deps: Sequence[str] = (),
+        timeout: Optional[float] = None
+    ) -> "ScriptStream":
+        """
+        Run a script on a warm worker and iterate its output records.
+
+        Each stdout line is yielded as soon as the script writes it (decoded
+        as JSON when possible). The worker pipe applies backpressure, so a
+        slow consumer pauses the script rather than growing a buffer.
+
+        Example:
+            stream = pool.stream("scan.py", input_file=path)
+            async for record in stream:
+                handle(record)
+            print(stream.result.exit_code)
+
+        Returns:
+            ScriptStream; its `result` is set once iteration finishes
+        """
+        if self._closed:
+            raise RuntimeError("ScriptWorkerPool is closed")
+        request = _build_request(script, argv, stdin, input_file, cwd, env, stream=True)
+        return ScriptStream(self, request, tuple(deps), timeout)
+
+    async def close(self) -> None:
+        """Stop all workers."""
+        self._closed = True
+        workers = []
+        for lane in self._lanes.values():
+            while not lane.idle.empty():
+                worker = lane.idle.get_nowait()
+                if worker is not None:
+                    workers.append(worker)
+        await asyncio.gather(*(w.close() for w in workers), *self._tasks, return_exceptions=True)
+
+
+class ScriptStream:
+    """Async iterator over the output records of a streaming script run."""
+
+    def __init__(
+        self,
+        pool: ScriptWorkerPool,
+        request: Dict[str, Any],
+        key: Tuple[str, ...],
+        timeout: Optional[float]
+    ):
+        self._pool = pool
+        self._request = request
+        self._key = key
+        self._timeout = timeout
+        self.result: Optional[ScriptResult] = None
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        pool, key = self._pool, self._key
+        loop = asyncio.get_running_loop()
+        deadline = None if self._timeout is None else loop.time() + self._timeout
+        worker = await pool._acquire(key)
+        finished = False
+        try:
+            await worker.send(self._request)
+            while True:
+                remaining = None if deadline is None else max(0.0, deadline - loop.time())
+                message = await worker.receive(self._request["id"], remaining)
+                if "record" in message:
+                    yield _decode_record(message["record"])
+                    continue
+                self.result = _response_result(message, worker)
+                finished = True
+                return
+        except asyncio.TimeoutError:
+            await worker.kill()
+            self.result = _timeout_result(worker, self._timeout)
+        except (RuntimeError, ConnectionError, ValueError) as e:
+            await worker.kill()
+            self.result = ScriptResult(exit_code=1, stdout="", stderr=f"{e}\n", worker_pid=worker.process.pid)
+        finally:
+            if not finished:
+                # Consumer stopped early or was cancelled: the script is still mid-run
+                worker.abort()
+            pool._release(key, worker)
+
+
+async def serve_socket(pool: ScriptWorkerPool, path: str) -> asyncio.AbstractServer:
+    """
+    Serve script runs over a Unix socket using newline-delimited JSON.
+
+    Request:  {"id", "script", "argv", "stdin", "input_file", "cwd", "env",
+               "deps", "timeout_ms", "stream"}
+    Response: {"id", "exit_code", "stdout", "stderr", "duration_ms",
+               "worker_pid", "timed_out", "records"}
+
+    Streaming requests first receive `{"id", "record"}` messages, one per
+    output record, followed by the response.
+
+    Requests on one connection run concurrently; responses carry the
+    request id and may arrive out of order.
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        lock = asyncio.Lock()
+        tasks = set()
+
+        async def send(message: Dict[str, Any]) -> None:
+            async with lock:
+                writer.write((json.dumps(message) + "\n").encode())
+                await writer.drain()
+
+        async def respond(request: Dict[str, Any]) -> None:
+            timeout_ms = request.get("timeout_ms")
+            options = dict(
+                stdin=request.get("stdin"),
+                input_file=request.get("input_file"),
+                cwd=request.get("cwd"),
+                env=request.get("env"),
+                deps=request.get("deps", []),
+                timeout=timeout_ms / 1000 if timeout_ms else None,
+            )
+            try:
+                if request.get("stream"):
+                    stream = pool.stream(request["script"], request.get("argv", []), **options)
+                    async for record in stream:
+                        await send({"id": request.get("id"), "record": record})
+                    result = stream.result.to_dict()
+                else:
+                    result = (await pool.run(
+                        request["script"], request.get("argv", []), **options
+                    )).to_dict()
+            except Exception as e:
+                result = ScriptResult(exit_code=1, stdout="", stderr=f"{e}\n").to_dict()
+            result["id"] = request.get("id")
+            await send(result)
+
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    task = asyncio.create_task(respond(json.loads(line)))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, json.JSONDecodeError):
+            pass
+        finally:
+            writer.close()
+
+    if os.path.exists(path):
+        os.unlink(path)
+    return await asyncio.start_unix_server(handle, path, limit=MAX_MESSAGE_BYTES)
+
+
+async def run_via_socket(path: str, request: Dict[str, Any]) -> Dict[str, Any]:
+    """Send one request to a `serve_socket` server and return its response."""
+    reader, writer = await asyncio.open_unix_connection(path, limit=MAX_MESSAGE_BYTES)
+    try:
+        writer.write((json.dumps(request) + "\n").encode())
+        await writer.drain()
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+
+
+__all__ = ["ScriptResult", "ScriptStream", "ScriptWorkerPool", "run_via_socket", "serve_socket"]
@@ -0,0 +1,105 @@
+"""
+Line-delimited JSON streaming I/O for Python script nodes.
+
+The single-blob contract (one argv string in, one JSON document printed at
+exit) buffers everything and is limited by the OS argv size. Streaming
+scripts instead exchange newline-delimited JSON records:
+
+Input, in order of preference:
+- A file named by `$ARCHON_INPUT_FILE`, one JSON record per line. It is
+  memory-mapped, so large diffs or log bundles are paged in on demand.
+- stdin, one JSON record per line.
+
+Output: one JSON record per line on stdout, flushed as it is produced, so a
+warm worker (`ScriptWorkerPool.stream`) can hand each record downstream
+before the script finishes.
+
+Example script:
+    from pmoves_scripts.streaming import emit, read_records
+
+    for record in read_records():
+        if record.get("level") == "error":
+            emit({"file": record["file"], "line": record["line"]})
+
+The protocol itself is plain NDJSON; scripts that cannot import this module
+(e.g. under a bare `uv run`) can implement it with `json` and `sys` alone.
+This module only uses the standard library.
+"""
+
+import json
+import mmap
+import os
+import sys
+import tempfile
+from typing import Any, Iterable, Iterator, Optional
+
+INPUT_FILE_ENV = "ARCHON_INPUT_FILE"
+
+
+def iter_input_lines(path: Optional[str] = None) -> Iterator[bytes]:
+    """
+    Yield raw input lines without loading the whole input into memory.
+
+    Args:
+        path: Input file (defaults to $ARCHON_INPUT_FILE, then stdin)
+    """
+    path = path or os.getenv(INPUT_FILE_ENV)
+    if path:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                start = 0
+                while start < len(data):
+                    end = data.find(b"\n", start)
+                    if end < 0:
+                        end = len(data)
+                    yield data[start:end]
+                    start = end + 1
+        return
+
+    stream = getattr(sys.stdin, "buffer", None)
+    if stream is not None:
+        for line in stream:
+            yield line.rstrip(b"\r\n")
+    else:
+        for line in sys.stdin:
+            yield line.rstrip("\r\n").encode()
+
+
+def read_records(path: Optional[str] = None) -> Iterator[Any]:
+    """Yield decoded JSON records from the node input, skipping blank lines."""
+    for line in iter_input_lines(path):
+        if line.strip():
+            yield json.loads(line)
+
+
+def emit(record: Any) -> None:
+    """Write one output record and flush it immediately."""
+    sys.stdout.write(json.dumps(record, separators=(",", ":")) + "\n")
+    sys.stdout.flush()
+
+
+def write_records_file(records: Iterable[Any], directory: Optional[str] = None) -> str:
+    """
+    Write records to a temporary NDJSON file for use as `$ARCHON_INPUT_FILE`.
+
+    The caller owns the file and should delete it after the run.
+
+    Returns:
+        Path of the written file
+    """
+    fd, path = tempfile.mkstemp(prefix="archon-input-", suffix=".ndjson", dir=directory)
+    with os.fdopen(fd, "w") as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+    return path
+
+
+__all__ = [
+    "INPUT_FILE_ENV",
+    "emit",
+    "iter_input_lines",
+    "read_records",
+    "write_records_file",
+]
@@ -0,0 +1,191 @@
+"""
+Resident Python worker for Archon script nodes.
+
+A worker is a long-lived interpreter that runs script node files on request
+instead of starting a new interpreter per node. Requests and responses are
+newline-delimited JSON on the worker's stdin/stdout:
+
+    -> {"id": 1, "script": "/repo/.archon/scripts/echo-py.py", "argv": ["hi"],
+        "stdin": "", "cwd": "/repo", "env": {"ARTIFACTS_DIR": "..."}}
+    <- {"id": 1, "exit_code": 0, "stdout": "{...}\\n", "stderr": "",
+        "duration_ms": 0.4}
+
+Each run gets the same contract as `uv run script.py`: `sys.argv[0]` is the
+script path, `sys.argv[1:]` the arguments, stdin is the provided text and
+everything written to `sys.stdout`/`sys.stderr` is captured. Scripts execute
+as `__main__` in fresh globals; compiled code is cached per file and
+invalidated when the file changes, and imported modules stay warm across
+runs.
+
+Streaming runs (`"stream": true`) forward each complete stdout line as soon
+as it is written, before the final response:
+
+    <- {"id": 1, "record": "{\"file\": \"a.py\"}"}
+    <- {"id": 1, "exit_code": 0, "stdout": "", "stderr": "", "records": 1, ...}
+
+An `"input_file"` in the request is exposed to the script as
+`$ARCHON_INPUT_FILE` (see `pmoves_scripts.streaming`).
+
+This file only uses the standard library so it can be launched inside any
+`uv run --with ...` environment as `python worker.py`.
+"""
+
+import builtins
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from typing import Any, Dict, Optional, TextIO, Tuple
+
+_code_cache: Dict[str, Tuple[float, Any]] = {}
+
+# Largest streamed output record in characters, matching the MCP adapter's
+# STREAM_MAX_RECORD_BYTES; longer lines are refused instead of buffered
+MAX_RECORD_CHARS = 1024 * 1024
+
+# Directory containing the pmoves_scripts package, so scripts run here can
+# import pmoves_scripts.streaming
+_PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _RecordForwarder(io.TextIOBase):
+    """stdout replacement that forwards each complete line as a record."""
+
+    def __init__(self, protocol: TextIO, request_id: Any):
+        self._protocol = protocol
+        self._id = request_id
+        self._partial = ""
+        self.records = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._send(line)
+        if len(self._partial) > MAX_RECORD_CHARS:
+            self._partial = ""
+            raise ValueError(f"Output record exceeds {MAX_RECORD_CHARS} characters")
+        return len(text)
+
+    def _send(self, line: str) -> None:
+        self.records += 1
+        self._protocol.write(json.dumps({"id": self._id, "record": line}) + "\n")
+
+    def flush(self) -> None:
+        self._protocol.flush()
+
+    def finish(self) -> None:
+        if self._partial:
+            self._send(self._partial)
+            self._partial = ""
+
+
+def _load_code(path: str):
+    """Compile a script once and reuse it until its mtime changes."""
+    mtime = os.stat(path).st_mtime
+    cached = _code_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, "rb") as f:
+        code = compile(f.read(), path, "exec")
+    _code_cache[path] = (mtime, code)
+    return code
+
+
+def run_script(request: Dict[str, Any], protocol: Optional[TextIO] = None) -> Dict[str, Any]:
+    """
+    Run one script request in this interpreter and capture its output.
+
+    When the request asks for streaming and a protocol channel is given,
+    stdout lines are forwarded as records instead of being captured.
+    """
+    started = time.perf_counter()
+    path = os.path.abspath(request["script"])
+    stderr = io.StringIO()
+    if request.get("stream") and protocol is not None:
+        stdout = _RecordForwarder(protocol, request.get("id"))
+    else:
+        stdout = io.StringIO()
+    exit_code = 0
+
+    saved_argv, saved_path = sys.argv, list(sys.path)
+    saved_streams = sys.stdin, sys.stdout, sys.stderr
+    saved_cwd = os.getcwd()
+    saved_env = dict(os.environ)
+    try:
+        sys.argv = [path, *request.get("argv", [])]
+        sys.path.insert(0, os.path.dirname(path))
+        if _PACKAGE_ROOT not in sys.path:
+            sys.path.append(_PACKAGE_ROOT)
+        sys.stdin = io.StringIO(request.get("stdin") or "")
+        sys.stdout, sys.stderr = stdout, stderr
+        os.environ.update(request.get("env") or {})
+        if request.get("input_file"):
+            os.environ["ARCHON_INPUT_FILE"] = request["input_file"]
+        if request.get("cwd"):
+            os.chdir(request["cwd"])
+
+        code = _load_code(path)
+        exec(code, {"__name__": "__main__", "__file__": path, "__builtins__": builtins})
+    except SystemExit as e:
+        if e.code is None:
+            exit_code = 0
+        elif isinstance(e.code, int):
+            exit_code = e.code
+        else:
+            stderr.write(f"{e.code}\n")
+            exit_code = 1
+    except BaseException:
+        traceback.print_exc(file=stderr)
+        exit_code = 1
+    finally:
+        if isinstance(stdout, _RecordForwarder):
+            stdout.finish()
+        sys.stdout.flush()
+        sys.argv, sys.path[:] = saved_argv, saved_path
+        sys.stdin, sys.stdout, sys.stderr = saved_streams
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+
+    response = {
+        "id": request.get("id"),
+        "exit_code": exit_code,
+        "stdout": "",
+        "stderr": stderr.getvalue(),
+        "duration_ms": (time.perf_counter() - started) * 1000,
+    }
+    if isinstance(stdout, _RecordForwarder):
+        response["records"] = stdout.records
+    else:
+        response["stdout"] = stdout.getvalue()
+    return response
+
+
+def main() -> None:
+    """Serve requests from stdin until EOF."""
+    # Keep the protocol channel private: anything written to fd 1 outside of
+    # sys.stdout (C extensions, subprocesses) goes to stderr instead.
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w", buffering=1)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    protocol.write(json.dumps({"ready": True, "pid": os.getpid()}) + "\n")
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            response = {"id": None, "exit_code": 1, "stdout": "", "stderr": f"Bad request: {e}\n"}
+        else:
+            response = run_script(request, protocol)
+        protocol.write(json.dumps(response) + "\n")
+
+
+if __name__ == "__main__":
+    main()
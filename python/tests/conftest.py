@@ -0,0 +1,11 @@
+"""Make the pmoves_* packages importable without installing them."""
+
+import os
+import sys
+
+_PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_REPO_ROOT = os.path.dirname(_PYTHON_DIR)
+
+for path in (_REPO_ROOT, _PYTHON_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,159 @@
+"""ClaudeCodeMCPAdapter request policies against a stub transport."""
+
+import asyncio
+
+from pmoves_mcp import ClaudeCodeMCPAdapter
+from pmoves_mcp.transports import Transport, TransportError
+
+
+class StubTransport(Transport):
+    """
+    Fake Agent Zero answering each command after `delays[command]` seconds.
+
+    execute_batch requests are answered when `batch_status` is None and fail
+    with that HTTP status otherwise. Records the commands and batches sent
+    and how many requests are in flight.
+    """
+
+    def __init__(self, delays=None, batch_status=404):
+        self.delays = delays or {}
+        self.batch_status = batch_status
+        self.sent = []
+        self.batches = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.cancelled = 0
+
+    async def request(self, payload, timeout, trace=None):
+        if payload["action"] == "execute_batch":
+            commands = [params["command"] for params in payload["params"]["commands"]]
+            self.batches.append(commands)
+            if self.batch_status is not None:
+                raise TransportError(f"HTTP {self.batch_status}", status=self.batch_status)
+            return {"results": [{"success": True, "output": command} for command in commands]}
+
+        command = payload["params"]["command"]
+        self.sent.append(command)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(command, 0))
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        return {"success": True, "output": command}
+
+    async def close(self):
+        pass
+
+
+def _payload(command):
+    return {"instrument": "claude_code", "action": "execute_command", "params": {"command": command}}
+
+
+def test_cancelled_hedged_call_cancels_its_request():
+    async def scenario():
+        transport = StubTransport({"/agents:status": 1.0})
+        adapter = ClaudeCodeMCPAdapter(transport=transport)
+        call = asyncio.create_task(
+            adapter._send_hedged("/agents:status", _payload("/agents:status"), 5.0, 0.5, "ab" * 16)
+        )
+        await asyncio.sleep(0.05)
+        call.cancel()
+        await asyncio.gather(call, return_exceptions=True)
+        await asyncio.sleep(0.01)
+        return transport.cancelled, transport.in_flight
+
+    cancelled, in_flight = asyncio.run(scenario())
+    assert cancelled == 1
+    assert in_flight == 0
+
+
+def test_execute_many_returns_results_in_command_order():
+    async def scenario():
+        transport = StubTransport({"/health:check-all": 0.05})
+        adapter = ClaudeCodeMCPAdapter(transport=transport)
+        return await adapter.execute_many(["/health:check-all", "/agents:status", ("/search:hirag", "q")])
+
+    results = asyncio.run(scenario())
+    assert [r.output for r in results] == ["/health:check-all", "/agents:status", "/search:hirag"]
+    assert all(r.success for r in results)
+
+
+def test_execute_many_as_completed_yields_fastest_first():
+    async def scenario():
+        transport = StubTransport({"/health:check-all": 0.1})
+        adapter = ClaudeCodeMCPAdapter(transport=transport)
+        return [
+            index async for index, _ in adapter.execute_many_as_completed(["/health:check-all", "/agents:status"])
+        ]
+
+    assert asyncio.run(scenario()) == [1, 0]
+
+
+def test_execute_many_bounds_concurrency():
+    async def scenario():
+        transport = StubTransport({"/agents:status": 0.02})
+        adapter = ClaudeCodeMCPAdapter(transport=transport)
+        results = await adapter.execute_many(["/agents:status"] * 12, max_concurrency=3)
+        return results, transport
+
+    results, transport = asyncio.run(scenario())
+    assert all(r.success for r in results)
+    assert transport.peak_in_flight == 3
+
+
+def test_server_batching_is_opt_in():
+    async def scenario():
+        transport = StubTransport(batch_status=None)
+        adapter = ClaudeCodeMCPAdapter(transport=transport)
+        await adapter.execute_many(["/agents:status", "/agents:status"])
+        return adapter.server_batching, transport
+
+    server_batching, transport = asyncio.run(scenario())
+    assert server_batching is False
+    assert transport.batches == []
+    assert transport.sent == ["/agents:status", "/agents:status"]
+
+
+def test_failed_batch_probe_falls_back_to_single_requests():
+    async def scenario():
+        transport = StubTransport(batch_status=404)
+        adapter = ClaudeCodeMCPAdapter(transport=transport, server_batching=None)
+        results = await adapter.execute_many(["/agents:status", "/agents:mcp-query"])
+        await adapter.execute_many(["/agents:status", "/agents:mcp-query"])
+        return results, adapter.server_batching, transport
+
+    results, server_batching, transport = asyncio.run(scenario())
+    assert all(r.success for r in results)
+    assert server_batching is False
+    assert len(transport.batches) == 1  # Probed once, never again
+    assert sorted(transport.sent) == ["/agents:mcp-query", "/agents:mcp-query", "/agents:status", "/agents:status"]
+
+
+def test_confirmed_batch_failure_retries_only_idempotent_commands():
+    async def scenario():
+        transport = StubTransport(batch_status=503)
+        adapter = ClaudeCodeMCPAdapter(transport=transport, server_batching=True)
+        results = await adapter.execute_many(["/agents:status", "/agents:mcp-query"])
+        return results, transport
+
+    results, transport = asyncio.run(scenario())
+    assert results[0].success and results[0].output == "/agents:status"
+    assert not results[1].success and "503" in results[1].error
+    assert transport.sent == ["/agents:status"]
+
+
+def test_batches_group_commands_by_schedule_rule():
+    async def scenario():
+        transport = StubTransport(batch_status=None)
+        adapter = ClaudeCodeMCPAdapter(transport=transport, server_batching=True)
+        results = await adapter.execute_many(["/agents:status"] * 3 + ["/deploy:up"] * 2)
+        return results, transport
+
+    results, transport = asyncio.run(scenario())
+    assert all(r.success for r in results)
+    assert transport.batches == [["/agents:status"] * 3]
+    assert transport.sent == ["/deploy:up", "/deploy:up"]  # Capped at one, never batched
@@ -0,0 +1,37 @@
+"""Catalog digest loops survive failed publishes."""
+
+import asyncio
+
+from pmoves_aggregator import DELTA_SUBJECT, SNAPSHOT_SUBJECT, CatalogAggregator
+
+
+class _FlakyNATS:
+    """Connection stub whose first publish to each subject fails."""
+
+    def __init__(self):
+        self.published = []
+        self._failed = set()
+
+    async def publish(self, subject, payload):
+        if subject not in self._failed:
+            self._failed.add(subject)
+            raise ConnectionError("nats: connection reconnecting")
+        self.published.append(subject)
+
+
+def test_digest_loops_keep_running_after_a_failed_publish(capsys):
+    async def scenario():
+        aggregator = CatalogAggregator(nats_url="nats://unused:4222", snapshot_interval=0.02, delta_interval=0.01)
+        aggregator._nc = _FlakyNATS()
+        tasks = [asyncio.create_task(aggregator._delta_loop()), asyncio.create_task(aggregator._snapshot_loop())]
+        await asyncio.sleep(0.1)
+        alive = [not task.done() for task in tasks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return alive, aggregator._nc.published
+
+    alive, published = asyncio.run(scenario())
+    assert alive == [True, True]
+    assert published.count(SNAPSHOT_SUBJECT) >= 2
+    assert "Failed to publish catalog snapshot" in capsys.readouterr().out
@@ -0,0 +1,70 @@
+"""Shared dependency probes and dependency edges of HealthChecker."""
+
+import asyncio
+import time
+
+import pytest
+
+from pmoves_health import DependencyCheck, HealthChecker, HealthStatus, ProbeRegistry
+
+
+class TargetCheck(DependencyCheck):
+    """Check sharing probes by `target`, answering after `delay` seconds."""
+
+    def __init__(self, name, target, delay=0.0, healthy=True):
+        super().__init__(name)
+        self._target = target
+        self.delay = delay
+        self.healthy = healthy
+
+    async def check(self):
+        await asyncio.sleep(self.delay)
+        return self.healthy
+
+    def target(self):
+        return self._target
+
+
+def test_shared_probe_honours_the_checkers_timeout():
+    async def scenario():
+        checker = HealthChecker(service_name="svc", probes=ProbeRegistry(), check_timeout=0.05)
+        checker.add_check(TargetCheck("nats", ("nats", "nats://hung:4222"), delay=10.0))
+        started = time.monotonic()
+        result = await checker.get_result()
+        return result, time.monotonic() - started
+
+    result, elapsed = asyncio.run(scenario())
+    assert result.status is HealthStatus.UNHEALTHY
+    assert elapsed < 1.0
+
+
+def test_expired_probe_results_are_dropped():
+    async def scenario():
+        registry = ProbeRegistry(ttl=0.05)
+        for i in range(5):
+            await registry.probe(TargetCheck("http", ("http", f"http://service-{i}")))
+        await asyncio.sleep(0.06)
+        await registry.probe(TargetCheck("http", ("http", "http://still-probed")))
+        return set(registry._results)
+
+    assert asyncio.run(scenario()) == {("http", "http://still-probed")}
+
+
+def test_dependency_edges_need_unique_check_names():
+    checker = HealthChecker(service_name="svc")
+    checker.http("http://a:80/healthz")
+    checker.http("http://b:80/healthz")  # Both are called "service"
+    checker.add_check(TargetCheck("database", ("db", 1)))
+    with pytest.raises(ValueError):
+        checker.add_dependency("service", "database")
+    with pytest.raises(ValueError):
+        checker.add_check(TargetCheck("database", ("db", 2)), depends_on=["nats"])
+
+
+def test_duplicate_name_cannot_join_an_existing_edge():
+    checker = HealthChecker(service_name="svc")
+    checker.add_check(TargetCheck("database", ("db", 1)))
+    checker.add_check(TargetCheck("api", ("api", 1)), depends_on=["database"])
+    with pytest.raises(ValueError):
+        checker.add_check(TargetCheck("database", ("db", 2)))
+    assert [check.name for check in checker.checks] == ["database", "api"]
@@ -0,0 +1,121 @@
+"""NATSTransport request/reply against the embedded NATS server."""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+pytest.importorskip("nats")
+
+from pmoves_loadtest.embedded_nats import EmbeddedNATSServer
+from pmoves_mcp.transports import MCP_EXECUTE_SUBJECT, NATSTransport, TransportError, TransportTimeout
+
+
+async def _with_agent_zero(scenario, delays=None):
+    """
+    Run `scenario(transport, server)` against a fake Agent Zero responder.
+
+    The responder echoes the command back, after `delays[command]` seconds.
+    """
+    from nats.aio.client import Client as NATS
+
+    server = EmbeddedNATSServer(port=0)
+    await server.start()
+    agent = NATS()
+    await agent.connect(server.url)
+
+    async def respond(msg):
+        params = json.loads(msg.data)["params"]
+        await asyncio.sleep((delays or {}).get(params["command"], 0))
+        reply = {"success": True, "output": params["command"], "traceparent": (msg.headers or {}).get("traceparent")}
+        await msg.respond(json.dumps(reply).encode())
+
+    # Subscription callbacks run one at a time; answer each request in its own task
+    pending = set()
+
+    async def on_request(msg):
+        task = asyncio.create_task(respond(msg))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    await agent.subscribe(MCP_EXECUTE_SUBJECT, cb=on_request)
+    await agent.flush()
+    transport = NATSTransport(server.url)
+    try:
+        return await scenario(transport, server)
+    finally:
+        await transport.close()
+        await agent.close()
+        await server.stop()
+
+
+def _payload(command):
+    return {"instrument": "claude_code", "action": "execute_command", "params": {"command": command}}
+
+
+def test_request_returns_decoded_reply():
+    async def scenario(transport, server):
+        return await transport.request(_payload("/agents:status"), timeout=2.0)
+
+    reply = asyncio.run(_with_agent_zero(scenario))
+    assert reply["success"] is True
+    assert reply["output"] == "/agents:status"
+
+
+def test_request_times_out_per_request():
+    async def scenario(transport, server):
+        started = time.monotonic()
+        with pytest.raises(TransportTimeout) as error:
+            await transport.request(_payload("/slow"), timeout=0.2)
+        elapsed = time.monotonic() - started
+        # The connection survives a timeout and serves the next request
+        reply = await transport.request(_payload("/fast"), timeout=2.0)
+        return error.value, elapsed, reply
+
+    error, elapsed, reply = asyncio.run(_with_agent_zero(scenario, delays={"/slow": 1.0}))
+    assert error.retryable
+    assert elapsed < 0.8
+    assert reply["output"] == "/fast"
+
+
+def test_request_without_responders_fails_retryable():
+    async def scenario(transport, server):
+        transport.subject = "agent_zero.nobody.listens"
+        started = time.monotonic()
+        with pytest.raises(TransportError) as error:
+            await transport.request(_payload("/agents:status"), timeout=0.3)
+        return error.value, time.monotonic() - started
+
+    # nats-server answers "no responders"; servers without that support time out
+    error, elapsed = asyncio.run(_with_agent_zero(scenario))
+    assert error.retryable
+    assert elapsed < 1.0
+
+
+def test_concurrent_requests_share_one_connection():
+    commands = [f"/search:hirag-{i}" for i in range(50)]
+    # Later requests finish first, so replies arrive out of order
+    delays = {command: 0.2 - i * 0.004 for i, command in enumerate(commands)}
+
+    async def scenario(transport, server):
+        replies = await asyncio.gather(*(transport.request(_payload(c), timeout=2.0) for c in commands))
+        # The fake Agent Zero holds one connection; the transport adds exactly one more
+        return replies, server.stats.total_connections
+
+    replies, connections = asyncio.run(_with_agent_zero(scenario, delays))
+    assert [reply["output"] for reply in replies] == commands
+    assert connections == 2
+
+
+def test_request_sends_traceparent_header():
+    from pmoves_mcp.tracing import RequestTrace
+
+    async def scenario(transport, server):
+        trace = RequestTrace()
+        reply = await transport.request(_payload("/agents:status"), timeout=2.0, trace=trace)
+        return trace, reply
+
+    trace, reply = asyncio.run(_with_agent_zero(scenario))
+    assert reply["traceparent"] == trace.traceparent
+    assert {"connect", "ttfb", "decode"} <= set(trace.phases)
@@ -0,0 +1,52 @@
+"""DNSCache single-flight lookups and resolved service URLs."""
+
+import asyncio
+
+import pmoves_registry
+from pmoves_registry import DNSCache, get_service_url
+
+
+class _SlowDNSCache(DNSCache):
+    """DNSCache answering every name with one address after `delay` seconds."""
+
+    def __init__(self, delay=0.05):
+        super().__init__(nameservers=[])
+        self.delay = delay
+        self.queries = 0
+
+    async def _query(self, host):
+        self.queries += 1
+        await asyncio.sleep(self.delay)
+        return ("10.0.0.7",), 30.0
+
+
+def test_cancelled_caller_does_not_cancel_coalesced_lookup():
+    async def scenario():
+        cache = _SlowDNSCache()
+        first = asyncio.create_task(cache.resolve_one("hi-rag-gateway-v2"))
+        second = asyncio.create_task(cache.resolve_one("hi-rag-gateway-v2"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        address = await second
+        return first.cancelled(), address, cache.queries
+
+    first_cancelled, address, queries = asyncio.run(scenario())
+    assert first_cancelled
+    assert address == "10.0.0.7"
+    assert queries == 1
+
+
+def test_resolved_service_url_keeps_url_choice(monkeypatch):
+    cache = _SlowDNSCache(delay=0)
+    monkeypatch.setattr(pmoves_registry, "_dns_cache", cache)
+    monkeypatch.delenv("HIRAG_V2_URL", raising=False)
+
+    async def scenario():
+        return (
+            await get_service_url("hirag-v2", default_port=8086, resolve=True),
+            await get_service_url("hirag-v2", default_port=8086, resolve=True, use_base_url=False),
+        )
+
+    base_url, health_url = asyncio.run(scenario())
+    assert base_url == "http://10.0.0.7:8086"
+    assert health_url == "http://10.0.0.7:8086"
@@ -0,0 +1,128 @@
+"""ResultCache TTLs, LRU bounds and single-flight loading."""
+
+import asyncio
+
+from pmoves_mcp.result_cache import ResultCache, estimate_size
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_their_ttl():
+    clock = FakeClock()
+    cache = ResultCache(clock=clock)
+    cache.put(("/search:hirag", "q"), "answer", ttl=60.0)
+    assert cache.get(("/search:hirag", "q")) == (True, "answer")
+    clock.now += 61.0
+    assert cache.get(("/search:hirag", "q")) == (False, None)
+    assert cache.stats.expirations == 1
+    assert cache.stats.entries == 0 and cache.stats.bytes == 0
+
+
+def test_byte_limit_evicts_least_recently_used():
+    value = "x" * 100
+    size = estimate_size(value)
+    cache = ResultCache(max_bytes=size * 2)
+    cache.put("a", value, ttl=60.0)
+    cache.put("b", value, ttl=60.0)
+    cache.get("a")  # "b" is now least recently used
+    cache.put("c", value, ttl=60.0)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a")[0] and cache.get("c")[0]
+    assert cache.stats.evictions == 1
+    assert cache.stats.bytes == size * 2
+
+
+def test_values_larger_than_the_cache_are_not_stored():
+    cache = ResultCache(max_bytes=10)
+    cache.put("a", "x" * 100, ttl=60.0)
+    assert cache.get("a") == (False, None)
+    assert cache.stats.bytes == 0
+
+
+def test_mutating_commands_are_never_cached():
+    cache = ResultCache(ttls={"/deploy:up": 60.0, "/botz:run": 60.0})
+    assert cache.ttl_for("/deploy:up") is None
+    assert cache.ttl_for("/botz:run") is None
+    assert cache.ttl_for("/search:hirag") == 60.0
+
+
+def test_concurrent_misses_share_one_load():
+    async def scenario():
+        cache = ResultCache()
+        loads = 0
+
+        async def loader():
+            nonlocal loads
+            loads += 1
+            await asyncio.sleep(0.02)
+            return "answer"
+
+        results = await asyncio.gather(*(cache.get_or_load("k", 60.0, loader) for _ in range(5)))
+        return results, loads, cache.stats
+
+    results, loads, stats = asyncio.run(scenario())
+    assert results == ["answer"] * 5
+    assert loads == 1
+    assert stats.misses == 1 and stats.coalesced == 4
+
+
+def test_cancelled_loader_does_not_cancel_waiting_callers():
+    async def scenario():
+        cache = ResultCache()
+        loads = 0
+
+        async def loader():
+            nonlocal loads
+            loads += 1
+            await asyncio.sleep(0.05)
+            return f"answer-{loads}"
+
+        leader = asyncio.create_task(cache.get_or_load("k", 60.0, loader))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(cache.get_or_load("k", 60.0, loader))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        result = await follower
+        return leader.cancelled(), result, loads
+
+    leader_cancelled, result, loads = asyncio.run(scenario())
+    assert leader_cancelled
+    assert result == "answer-2"  # The follower loaded again instead of failing
+    assert loads == 2
+
+
+def test_failed_load_is_shared_and_not_stored():
+    async def scenario():
+        cache = ResultCache()
+
+        async def loader():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("agent zero unavailable")
+
+        results = await asyncio.gather(
+            *(cache.get_or_load("k", 60.0, loader) for _ in range(2)), return_exceptions=True
+        )
+        return results, cache.get("k")
+
+    results, cached = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert cached == (False, None)
+
+
+def test_should_store_rejects_unsuccessful_results():
+    async def scenario():
+        cache = ResultCache()
+
+        async def loader():
+            return {"success": False}
+
+        await cache.get_or_load("k", 60.0, loader, should_store=lambda r: r["success"])
+        return cache.get("k")
+
+    assert asyncio.run(scenario()) == (False, None)
@@ -0,0 +1,136 @@
+"""CommandScheduler lanes, caps, token buckets and batch admission."""
+
+import asyncio
+import time
+
+import pytest
+
+from pmoves_mcp.scheduling import CommandScheduler, ScheduleRule, TokenBucket
+
+
+async def _hold(scheduler, name, started, order, seconds=0.02):
+    async with scheduler.slot(name):
+        order.append(name)
+        started.append(time.monotonic())
+        await asyncio.sleep(seconds)
+
+
+def test_waiting_requests_are_admitted_in_lane_priority_order():
+    async def scenario():
+        scheduler = CommandScheduler(max_in_flight=1)
+        order, started = [], []
+        blocker = asyncio.create_task(_hold(scheduler, "/search:hirag", started, order))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(_hold(scheduler, name, started, order))
+            for name in ("/deploy:up", "/search:hirag", "/health:check-all", "/agents:status")
+        ]
+        await asyncio.gather(blocker, *waiters)
+        return order
+
+    order = asyncio.run(scenario())
+    assert order == ["/search:hirag", "/agents:status", "/health:check-all", "/search:hirag", "/deploy:up"]
+
+
+def test_rule_cap_is_shared_by_commands_under_a_prefix():
+    async def scenario():
+        scheduler = CommandScheduler(max_in_flight=10)
+        running = peak = 0
+
+        async def deploy(name):
+            nonlocal running, peak
+            async with scheduler.slot(name):
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(deploy(name) for name in ("/deploy:up", "/deploy:down", "/deploy:up")))
+        return peak, scheduler.in_flight
+
+    assert asyncio.run(scenario()) == (1, 0)
+
+
+def test_token_bucket_refills_at_its_rate():
+    bucket = TokenBucket(rate=10.0, burst=2)
+    now = bucket.updated
+    assert bucket.delay(now) == 0.0
+    bucket.take(2)
+    assert bucket.delay(now) == pytest.approx(0.1)
+    assert bucket.delay(now, 2) == pytest.approx(0.2)
+    assert bucket.delay(now + 0.1) == 0.0
+    assert bucket.delay(now + 10.0, 2) == 0.0
+    assert bucket.tokens == 2  # Capped at the burst
+
+
+def test_rate_limited_requests_wait_for_tokens():
+    async def scenario():
+        scheduler = CommandScheduler(rules={"/search:hirag": ScheduleRule("search", rate=50.0, burst=2)})
+        started = time.monotonic()
+
+        async def search():
+            async with scheduler.slot("/search:hirag"):
+                pass
+
+        await asyncio.gather(*(search() for _ in range(5)))
+        return time.monotonic() - started, scheduler.stats()["lanes"]["search"]["rate_limited"]
+
+    elapsed, rate_limited = asyncio.run(scenario())
+    assert 0.05 <= elapsed < 0.3  # Two from the burst, three at 50/s
+    assert rate_limited == 3
+
+
+def test_retry_timer_is_rearmed_for_an_earlier_token():
+    async def scenario():
+        scheduler = CommandScheduler(rules={
+            "/search:deepresearch": ScheduleRule("search", rate=0.5, burst=1),
+            "/search:hirag": ScheduleRule("search", rate=20.0, burst=1),
+        })
+        for name in ("/search:deepresearch", "/search:hirag"):
+            async with scheduler.slot(name):
+                pass
+        # The deep research waiter arms a ~2s timer; hirag's token is due in 50ms
+        slow = asyncio.create_task(scheduler.acquire("/search:deepresearch"))
+        await asyncio.sleep(0)
+        started = time.monotonic()
+        async with scheduler.slot("/search:hirag"):
+            waited = time.monotonic() - started
+        slow.cancel()
+        await asyncio.gather(slow, return_exceptions=True)
+        return waited
+
+    assert asyncio.run(scenario()) < 0.5
+
+
+def test_batch_takes_one_slot_and_token_per_command():
+    async def scenario():
+        scheduler = CommandScheduler(max_in_flight=8)
+        async with scheduler.slot("/search:deepresearch", 2):
+            held = scheduler.in_flight
+            blocked = asyncio.create_task(scheduler.acquire("/search:deepresearch"))
+            await asyncio.sleep(0.01)
+            capped = not blocked.done()
+        blocked.cancel()
+        await asyncio.gather(blocked, return_exceptions=True)
+        return held, capped, scheduler.in_flight
+
+    assert asyncio.run(scenario()) == (2, True, 0)
+
+
+def test_batch_larger_than_its_rule_allows_is_rejected():
+    async def scenario():
+        await CommandScheduler().acquire("/deploy:up", 2)
+
+    with pytest.raises(ValueError):
+        asyncio.run(scenario())
+
+
+def test_max_batch_and_batch_groups_follow_rules():
+    scheduler = CommandScheduler(max_in_flight=16)
+    assert scheduler.max_batch("/deploy:up") == 1
+    assert scheduler.max_batch("/search:deepresearch") == 2  # Cap and burst of 2
+    assert scheduler.max_batch("/agents:status") == 8
+    assert scheduler.max_batch("/unknown") == 16  # Only max_in_flight applies
+    assert scheduler.batch_group("/deploy:up") == scheduler.batch_group("/deploy:down") == "/deploy:"
+    assert scheduler.batch_group("/search:hirag") != scheduler.batch_group("/search:supaserch")
+    assert scheduler.batch_group("/unknown") == scheduler.batch_group("/other") == "lane:search"
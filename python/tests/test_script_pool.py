@@ -0,0 +1,63 @@
+"""ScriptWorkerPool runs never see another run's output."""
+
+import asyncio
+import sys
+
+from pmoves_scripts import ScriptWorkerPool
+
+
+def _script(tmp_path, name, source):
+    path = tmp_path / name
+    path.write_text(source)
+    return str(path)
+
+
+async def _with_pool(scenario):
+    pool = ScriptWorkerPool(size=1, python_command=[sys.executable])
+    try:
+        return await scenario(pool)
+    finally:
+        await pool.close()
+
+
+def test_cancelled_run_does_not_leak_into_next_run(tmp_path):
+    slow = _script(tmp_path, "slow.py", "import time\ntime.sleep(0.5)\nprint('SLOW-OUTPUT')\n")
+    fast = _script(tmp_path, "fast.py", "print('FAST-OUTPUT')\n")
+
+    async def scenario(pool):
+        try:
+            await asyncio.wait_for(pool.run(slow), 0.1)
+        except asyncio.TimeoutError:
+            pass
+        return await pool.run(fast, timeout=10)
+
+    result = asyncio.run(_with_pool(scenario))
+    assert result.exit_code == 0
+    assert result.stdout == "FAST-OUTPUT\n"
+
+
+def test_abandoned_stream_does_not_leak_into_next_run(tmp_path):
+    chatty = _script(tmp_path, "chatty.py", "import time\nfor i in range(5):\n    print(i, flush=True)\n    time.sleep(0.05)\n")
+    fast = _script(tmp_path, "fast.py", "print('FAST-OUTPUT')\n")
+
+    async def scenario(pool):
+        async for record in pool.stream(chatty):
+            break
+        return await pool.run(fast, timeout=10)
+
+    result = asyncio.run(_with_pool(scenario))
+    assert result.stdout == "FAST-OUTPUT\n"
+
+
+def test_unterminated_stream_output_is_bounded(tmp_path):
+    script = _script(tmp_path, "flood.py", "import sys\nprint('ok')\nfor _ in range(64):\n    sys.stdout.write('x' * 65536)\n")
+
+    async def scenario(pool):
+        stream = pool.stream(script, timeout=10)
+        records = [record async for record in stream]
+        return records, stream.result
+
+    records, result = asyncio.run(_with_pool(scenario))
+    assert records == ["ok"]
+    assert result.exit_code == 1
+    assert "Output record exceeds" in result.stderr
@@ -0,0 +1,213 @@
+"""Cross-worker shared state: seqlock regions, leader handoff and health sharing."""
+
+import asyncio
+import time
+
+import pytest
+
+import pmoves_health
+from pmoves_health import HealthChecker, HealthStatus
+from pmoves_shared import LeaderLock, SharedRegion
+
+
+@pytest.fixture(autouse=True)
+def shared_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("SHARED_STATE_DIR", str(tmp_path))
+    return tmp_path
+
+
+class _WriterDuringCopy(bytearray):
+    """Region memory whose payload is rewritten while a reader copies it once."""
+
+    def __init__(self, region, payload):
+        super().__init__(region._map[:])
+        self._region = region
+        self._payload = payload
+
+    def __getitem__(self, index):
+        copied = super().__getitem__(index)
+        if self._payload is not None and isinstance(index, slice):
+            payload, self._payload = self._payload, None
+            real, self._region._map = self._region._map, self
+            try:
+                self._region.write(payload)
+            finally:
+                self._region._map = real
+        return copied
+
+
+def test_region_round_trip_and_versions():
+    region = SharedRegion("roundtrip", size=64)
+    try:
+        assert region.read_versioned() == (0, None)
+        assert region.write(b"one") == 1
+        assert region.write(b"two") == 2
+        assert region.read_versioned() == (2, b"two")
+        assert region.clear() == 3
+        assert region.read() is None
+        with pytest.raises(ValueError):
+            region.write(b"x" * 65)
+    finally:
+        region.close()
+
+
+def test_reader_retries_when_a_write_lands_during_its_copy():
+    region = SharedRegion("seqlock", size=64)
+    try:
+        region.write(b"old-payload")
+        region._map.close()
+        region._map = _WriterDuringCopy(SharedRegion("seqlock", size=64), b"new")
+        # The first copy saw "old-payload" but seq moved on: the reader must retry
+        assert region.read_versioned() == (2, b"new")
+    finally:
+        region._map = bytearray()
+
+
+def test_reader_gives_up_on_a_write_that_never_finishes():
+    region = SharedRegion("torn", size=64)
+    try:
+        region.write(b"payload")
+        region._map[0:8] = (5).to_bytes(8, "little")  # Writer died mid-write
+        with pytest.raises(RuntimeError):
+            region.read_versioned()
+        assert region.write(b"recovered") == 3
+        assert region.read() == b"recovered"
+    finally:
+        region.close()
+
+
+def test_leader_lock_hands_over_on_release():
+    first, second = LeaderLock("handoff"), LeaderLock("handoff")
+    try:
+        assert first.try_acquire()
+        assert not second.try_acquire()
+        first.release()
+        assert second.try_acquire() and second.is_leader
+        assert not first.try_acquire()
+    finally:
+        first.release()
+        second.release()
+
+
+def _checker(calls, name="db", ttl=0.05):
+    checker = HealthChecker(service_name="svc", cache_ttl=ttl)
+
+    async def check():
+        calls.append(name)
+        return True
+
+    checker.add_custom_check(name, check)
+    return checker
+
+
+async def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+def test_followers_serve_the_leaders_result_and_take_over():
+    async def scenario():
+        leader_calls, follower_calls = [], []
+        leader, follower = _checker(leader_calls), _checker(follower_calls)
+        assert await leader.share_across_workers("svc")
+        assert not await follower.share_across_workers("svc")
+        await _wait_for(lambda: leader_calls)
+        result = await follower.get_result()
+        shared_before_handoff = (result.status, result.checks, list(follower_calls))
+        history = follower.slo_summary()["windows"]
+
+        await leader.stop_sharing()
+        await _wait_for(lambda: follower.is_leader)
+        await _wait_for(lambda: follower_calls)
+        await follower.stop_sharing()
+        return shared_before_handoff, history
+
+    (status, checks, follower_calls), history = asyncio.run(scenario())
+    assert status is HealthStatus.HEALTHY and checks == {"db": True}
+    assert follower_calls == []  # The follower never ran its own checks
+    assert all("db" in window for window in history.values())
+
+
+def test_followers_ignore_a_stale_result():
+    async def scenario():
+        calls = []
+        follower = _checker(calls, ttl=0.05)
+        leader = LeaderLock("svc-health")
+        assert leader.try_acquire()
+        region = SharedRegion("svc-health", size=pmoves_health.HEALTH_SHARED_REGION_SIZE)
+        stale = pmoves_health.HealthResult(HealthStatus.UNHEALTHY, "svc", "then", {"db": False})
+        region.write(pmoves_health._SHARED_PUBLISHED.pack(time.time() - 3600) + stale.body)
+        try:
+            await follower.share_across_workers("svc")
+            result = await follower.get_result()
+            await follower.stop_sharing()
+        finally:
+            region.close()
+            leader.release()
+        return result, calls
+
+    result, calls = asyncio.run(scenario())
+    assert result.status is HealthStatus.HEALTHY  # Checked locally instead
+    assert calls == ["db"]
+
+
+def test_oversized_result_is_shared_as_status_only(monkeypatch):
+    monkeypatch.setattr(pmoves_health, "HEALTH_SHARED_REGION_SIZE", 256)
+
+    async def scenario():
+        leader = HealthChecker(service_name="svc", cache_ttl=0.05)
+        for i in range(40):
+            async def check():
+                return True
+            leader.add_custom_check(f"dependency-with-a-long-name-{i}", check)
+        follower = HealthChecker(service_name="svc", cache_ttl=0.05)
+        await leader.share_across_workers("svc")
+        await follower.share_across_workers("svc")
+        await _wait_for(lambda: follower._region.version > 1)
+        result = await follower.get_result()
+        await follower.stop_sharing()
+        await leader.stop_sharing()
+        return result
+
+    result = asyncio.run(scenario())
+    assert result.status is HealthStatus.HEALTHY
+    assert result.checks == {}
+
+
+def test_catalog_that_does_not_fit_is_reported_once(capsys):
+    pytest.importorskip("nats")
+    from pmoves_announcer import ServiceAnnouncement, ServiceTier, SharedAnnouncementConsumer
+    from pmoves_loadtest.embedded_nats import EmbeddedNATSServer
+
+    def announcement(slug):
+        return ServiceAnnouncement(slug, slug, f"http://{slug}:80", f"http://{slug}:80/healthz", ServiceTier.API, 80)
+
+    async def scenario():
+        server = EmbeddedNATSServer(port=0)
+        await server.start()
+        leader = SharedAnnouncementConsumer("svc", nats_url=server.url, poll_interval=60, region_size=512)
+        follower = SharedAnnouncementConsumer("svc", nats_url=server.url, poll_interval=60, region_size=512)
+        try:
+            await leader.start()
+            await follower.start()
+            leader.index.apply([announcement("hirag-v2")])
+            await leader._step()
+            await follower._step()
+            fitted = sorted(follower.index.services)
+            leader.index.apply([announcement(f"service-{i}") for i in range(20)])
+            await leader._step()
+            await leader._step()
+            await follower._step()
+            return fitted, sorted(follower.index.services)
+        finally:
+            await follower.stop()
+            await leader.stop()
+            await server.stop()
+
+    fitted, after_overflow = asyncio.run(scenario())
+    assert fitted == ["hirag-v2"]
+    assert after_overflow == ["hirag-v2"]  # Followers keep the last catalog that fit
+    assert capsys.readouterr().out.count("Failed to share the svc catalog") == 1
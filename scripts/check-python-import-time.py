@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for the PMOVES Python packages.
+
+CLI entry points (`python -m pmoves_registry`, health probes, announcers) pay
+the package import cost on every invocation. This script imports each
+package in a fresh interpreter with `-X importtime` and fails when:
+
+- the cumulative import time exceeds the package budget, or
+- a heavy optional dependency (FastAPI, Starlette, Pydantic, httpx, nats)
+  is loaded by the bare import instead of on first use.
+
+Usage:
+    python scripts/check-python-import-time.py            # check all packages
+    python scripts/check-python-import-time.py --verbose  # print timings
+    python scripts/check-python-import-time.py --runs 5   # best of 5 runs
+
+Exit codes:
+    0  every package is within budget
+    1  at least one budget or heavy-module violation
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEARCH_PATH = [REPO_ROOT, os.path.join(REPO_ROOT, "python")]
+
+# Cumulative import budgets in milliseconds. Each is about 3x the time
+# measured on a developer machine (asyncio alone is ~35ms), so shared CI
+# runners do not flake; the heavy-module check below is the strict part.
+IMPORT_BUDGETS_MS: Dict[str, float] = {
+    "pmoves_common": 20.0,
+    "pmoves_announcer": 120.0,
+    "pmoves_health": 120.0,
+    "pmoves_registry": 120.0,
+    "pmoves_loadtest": 300.0,
+    "pmoves_aggregator": 120.0,
+    "pmoves_shared": 20.0,
+    "pmoves_mcp": 20.0,
+    "pmoves_scripts": 20.0,
+}
+
+# Modules that must only be imported when the feature using them runs
+HEAVY_MODULES = ["fastapi", "starlette", "pydantic", "httpx", "nats"]
+
+_PROBE = """
+import json, sys
+import {package}
+heavy = {heavy!r}
+print(json.dumps(sorted(m for m in heavy if m in sys.modules)))
+"""
+
+
+def measure(package: str, python: str = sys.executable) -> Tuple[Optional[float], List[str], str]:
+    """
+    Import a package in a fresh interpreter.
+
+    Returns:
+        (cumulative import time in ms or None, heavy modules loaded, error text)
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(SEARCH_PATH + [env.get("PYTHONPATH", "")]).rstrip(os.pathsep)
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", _PROBE.format(package=package, heavy=HEAVY_MODULES)],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if proc.returncode != 0:
+        return None, [], proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed"
+
+    cumulative_us = None
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == package:
+            cumulative_us = int(parts[1].strip())
+    heavy = json.loads(proc.stdout.strip().splitlines()[-1])
+    return (cumulative_us / 1000 if cumulative_us is not None else None), heavy, ""
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check PMOVES package import-time budgets")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per package (best time counts)")
+    parser.add_argument("--verbose", action="store_true", help="Print timings for every package")
+    args = parser.parse_args()
+
+    failures = 0
+    for package, budget in IMPORT_BUDGETS_MS.items():
+        best: Optional[float] = None
+        heavy: List[str] = []
+        error = ""
+        for _ in range(max(1, args.runs)):
+            elapsed, loaded, error = measure(package)
+            if error:
+                break
+            heavy = loaded
+            if elapsed is not None and (best is None or elapsed < best):
+                best = elapsed
+
+        if error:
+            print(f"✗ {package}: {error}")
+            failures += 1
+        elif heavy:
+            print(f"✗ {package}: imports heavy modules eagerly: {', '.join(heavy)}")
+            failures += 1
+        elif best is not None and best > budget:
+            print(f"✗ {package}: {best:.1f}ms exceeds budget of {budget:.0f}ms")
+            failures += 1
+        elif args.verbose:
+            timing = f"{best:.1f}ms" if best is not None else "already imported"
+            print(f"✓ {package}: {timing} (budget {budget:.0f}ms)")
+
+    if failures:
+        print(f"{failures} package(s) failed the import-time check")
+        return 1
+    if args.verbose:
+        print("All packages within import-time budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())